@@ -45,6 +45,7 @@ import argparse
 
 import conkit.command_line
 import conkit.io
+import conkit.misc.meff
 import conkit.plot
 import conkit.plot.tools
 
@@ -53,6 +54,10 @@ logger = None
 
 def main():
     parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--streaming', action='store_true', default=False,
+                        help='calculate Meff in blocks without loading the alignment (no coverage plot)')
+    parser.add_argument('--block-size', dest='block_size', type=int, default=4096,
+                        help='number of sequences per block when streaming [default: 4096]')
     parser.add_argument('msafile', help='Multiple Sequence Alignment file')
     parser.add_argument('msaformat', help='Multiple Sequence Alignment format')
     args = parser.parse_args()
@@ -60,6 +65,15 @@ def main():
     global logger
     logger = conkit.command_line.setup_logging(level='info')
 
+    if args.streaming:
+        with conkit.misc.meff.StreamingMeff(args.msafile, args.msaformat, block_size=args.block_size) as msa:
+            logger.info('Input MSA File:                            %s', args.msafile)
+            logger.info('Input MSA Format:                          %s', args.msaformat)
+            logger.info('Length of the Target Sequence:             %d', msa.ncols)
+            logger.info('Total Number of Sequences:                 %d', msa.nseq)
+            logger.info('Number of Effective Sequences:             %d', msa.meff)
+        return
+
     msa = conkit.io.read(args.msafile, args.msaformat)
 
     plot = args.msafile.rsplit('.', 1)[0] + '.png'
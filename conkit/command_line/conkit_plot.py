@@ -261,18 +261,14 @@ def main():
 
         con.sequence = seq
         con.set_sequence_register()
-        con.remove_neighbors(min_distance=args.dtn, inplace=True)
         ncontacts = int(seq.seq_len * args.dfactor)
-        con.sort('raw_score', reverse=True, inplace=True)
-        con_sliced = con[:ncontacts]
+        con_sliced = con.top_k(ncontacts, min_separation=args.dtn)
 
         if args.otherfile:
             other = conkit.io.read(args.otherfile, args.otherformat)[0]
             other.sequence = seq
             other.set_sequence_register()
-            other.remove_neighbors(min_distance=args.dtn, inplace=True)
-            other.sort('raw_score', reverse=True, inplace=True)
-            other_sliced = other[:ncontacts]
+            other_sliced = other.top_k(ncontacts, min_separation=args.dtn)
         else:
             other_sliced = None
 
@@ -334,10 +330,8 @@ def main():
 
         con.sequence = seq
         con.set_sequence_register()
-        con.remove_neighbors(min_distance=args.dtn, inplace=True)
-        con.sort('raw_score', reverse=True, inplace=True)
         ncontacts = int(seq.seq_len * args.dfactor)
-        con_sliced = con[:ncontacts]
+        con_sliced = con.top_k(ncontacts, min_separation=args.dtn)
 
         figure = conkit.plot.ContactMapChordFigure(con_sliced, use_conf=args.confidence, legend=True)
         figure_aspect_ratio = 1.0
@@ -370,10 +364,8 @@ def main():
 
         con.sequence = seq
         con.set_sequence_register()
-        con.remove_neighbors(min_distance=args.dtn, inplace=True)
-        con.sort('raw_score', reverse=True, inplace=True)
         ncontacts = int(seq.seq_len * args.dfactor)
-        con_sliced = con[:ncontacts]
+        con_sliced = con.top_k(ncontacts, min_separation=args.dtn)
 
         figure = conkit.plot.ContactDensityFigure(con_sliced, bw_method=args.bw_method, legend=True)
         figure_aspect_ratio = 0.3
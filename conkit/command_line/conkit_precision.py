@@ -59,9 +59,10 @@ def main():
     parser.add_argument(
         '-f',
         dest='dfactor',
-        default=1.0,
+        action='append',
         type=float,
-        help='number of contacts to include relative to sequence length [default: 1.0]')
+        help='number of contacts to include relative to sequence length, '
+        'repeat for several factors [default: 1.0]')
     parser.add_argument('pdbfile')
     parser.add_argument('pdbformat')
     parser.add_argument('seqfile')
@@ -84,17 +85,18 @@ def main():
     con.set_sequence_register()
 
     logger.info('Min sequence separation for contacting residues: %d', args.dtn)
-    logger.info('Contact list cutoff factor: %f * L', args.dfactor)
 
-    con.remove_neighbors(min_distance=args.dtn, inplace=True)
-    ncontacts = int(seq.seq_len * args.dfactor)
-    con.sort('raw_score', reverse=True, inplace=True)
-    con_sliced = con[:ncontacts]
+    dfactors = args.dfactor or [1.0]
+    # Match the contacts for the largest factor once and score all factors from its ranking
+    ncontacts = int(seq.seq_len * max(dfactors))
+    con_sliced = con.top_k(ncontacts, min_separation=args.dtn)
 
     con_matched = con_sliced.match(pdb)
-    precision = con_matched.precision
+    curve = con_matched.precision_curve(factors=dfactors)
 
-    logger.info('Precision score: %f', precision)
+    for dfactor, precision in zip(dfactors, curve.precision):
+        logger.info('Contact list cutoff factor: %f * L', dfactor)
+        logger.info('Precision score: %f', precision)
 
 
 if __name__ == "__main__":
@@ -63,6 +63,8 @@ def add_default_args(parser):
     """Define default arguments"""
     parser.add_argument('-prefix', default='conkit', help='Job ID')
     parser.add_argument('-wdir', default=os.getcwd(), help='Working directory')
+    parser.add_argument('--target-meff', type=float, default=None,
+                        help='Subsample the alignment to this number of effective sequences before running CCMpred')
     parser.add_argument('--demo', default=False, action="store_true", help=argparse.SUPPRESS)
 
 
@@ -181,6 +183,10 @@ def main(argl=None):
     # CCMpred requires alignments to be in the *jones* format - i.e. the format created
     # and used by David Jones in PSICOV
     msa_h = conkit.io.read(jon_fname, 'jones')
+    if args.target_meff is not None and msa_h.meff > args.target_meff:
+        msa_h = msa_h.subsample(args.target_meff)
+        jon_fname = os.path.join(args.wdir, args.prefix + '_subsampled.jones')
+        conkit.io.write(jon_fname, 'jones', msa_h)
     freq_plot_fname = os.path.join(args.wdir, args.prefix + 'freq.png')
     figure = conkit.plot.SequenceCoverageFigure(msa_h, legend=True)
     figure.ax.set_aspect(conkit.plot.tools.get_adjusted_aspect(figure.ax, 0.3))
@@ -208,10 +214,8 @@ def main(argl=None):
     dtn = 5
     dfactor = 1.
     cmap = conkit.io.read(matrix_fname, 'ccmpred').top_map
-    cmap.sequence = conkit.io.read(jon_fname, 'jones').top_sequence
-    cmap.remove_neighbors(min_distance=dtn, inplace=True)
-    cmap.sort('raw_score', reverse=True, inplace=True)
-    cmap = cmap[:cmap.sequence.seq_len]
+    cmap.sequence = msa_h.top_sequence
+    cmap = cmap.top_k(cmap.sequence.seq_len, min_separation=dtn)
 
     contact_map_fname = os.path.join(args.wdir, args.prefix + 'cmap.png')
     figure = conkit.plot.ContactMapFigure(cmap, legend=True)
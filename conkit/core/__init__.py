@@ -49,12 +49,24 @@ def ContactMap(*args, **kwargs):
     return ContactMap(*args, **kwargs)
 
 
+def ArrayContactMap(*args, **kwargs):
+    """:obj:`ArrayContactMap <conkit.core.ArrayContactMap.ArrayContactMap>` instance"""
+    from conkit.core.arraycontactmap import ArrayContactMap
+    return ArrayContactMap(*args, **kwargs)
+
+
 def ContactFile(*args, **kwargs):
     """:obj:`ContactFile <conkit.core.ContactFile.ContactFile>` instance"""
     from conkit.core.contactfile import ContactFile
     return ContactFile(*args, **kwargs)
 
 
+def Matcher(*args, **kwargs):
+    """:obj:`Matcher <conkit.core.Matcher.Matcher>` instance"""
+    from conkit.core.matcher import Matcher
+    return Matcher(*args, **kwargs)
+
+
 def Sequence(*args, **kwargs):
     """:obj:`Sequence <conkit.core.Sequence.Sequence>` instance"""
     from conkit.core.sequence import Sequence
@@ -0,0 +1,182 @@
+# coding=utf-8
+#
+# BSD 3-Clause License
+#
+# Copyright (c) 2016-18, University of Liverpool
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Pairwise sequence aligner keeping the most recently used alignments"""
+
+__author__ = "Felix Simkovic"
+__date__ = "18 Oct 2018"
+__version__ = "1.0"
+
+import collections
+
+try:
+    from Bio.Align import PairwiseAligner
+except ImportError:
+    PairwiseAligner = None
+
+
+class Aligner(object):
+    """Pairwise sequence aligner keeping the most recently used alignments
+
+    The default ``pairwise2`` backend enumerates all optimal alignments with :mod:`Bio.pairwise2`
+    and keeps the last one. The much faster ``pairwise`` backend computes a single optimal alignment
+    with Biopython's :obj:`~Bio.Align.PairwiseAligner`. Both score alignments identically, but the
+    ``pairwise`` backend may break ties between equally scoring alignments differently, which changes
+    the results of :meth:`~conkit.core.contactmap.ContactMap.match`.
+
+    Examples
+    --------
+    >>> from conkit.core.aligner import Aligner
+    >>> aligner = Aligner()
+    >>> aligner.align("GSMFTPK", "SMFTK")
+    ('GSMFTPK', '-SMFT-K')
+
+    Attributes
+    ----------
+    backend : str
+       The alignment backend
+    maxsize : int
+       The maximum number of alignments kept
+
+    """
+    BACKENDS = ('pairwise', 'pairwise2')
+    MODES = ('global', 'local')
+
+    def __init__(self, backend='pairwise2', maxsize=1024):
+        """Instantiate a new :obj:`~conkit.core.aligner.Aligner` object
+
+        Parameters
+        ----------
+        backend : str, optional
+           The alignment backend, one of ``pairwise`` or ``pairwise2`` [default: pairwise2]
+        maxsize : int, optional
+           The maximum number of alignments kept [default: 1024]
+
+        Raises
+        ------
+        :exc:`ValueError`
+           Unknown alignment backend
+        :exc:`ValueError`
+           The ``pairwise`` backend requires Biopython 1.72 or later
+
+        """
+        if backend not in Aligner.BACKENDS:
+            raise ValueError('Unknown alignment backend: {}'.format(backend))
+        elif backend == 'pairwise' and PairwiseAligner is None:
+            raise ValueError('The pairwise backend requires Biopython 1.72 or later')
+        self._backend = backend
+        self._cache = collections.OrderedDict()
+        self.maxsize = maxsize
+
+    def __repr__(self):
+        return '{}(backend="{}" nalignments={})'.format(self.__class__.__name__, self.backend, len(self._cache))
+
+    @property
+    def backend(self):
+        """The alignment backend"""
+        return self._backend
+
+    def align(self, seq1, seq2, mode='local', id_chars=2, nonid_chars=1, gap_open_pen=-0.5, gap_ext_pen=-0.1):
+        """Align two sequences, re-using the alignment if the same pair was recently aligned with the same parameters
+
+        Parameters
+        ----------
+        seq1 : str
+        seq2 : str
+        mode : str, optional
+           The alignment mode, one of ``global`` or ``local`` [default: local]
+        id_chars : int, optional
+        nonid_chars : int, optional
+        gap_open_pen : float, optional
+        gap_ext_pen : float, optional
+
+        Returns
+        -------
+        tuple
+           The two aligned sequences as :obj:`str`, which span the full sequences in either mode
+
+        Raises
+        ------
+        :exc:`ValueError`
+           Unknown alignment mode
+
+        """
+        if mode not in Aligner.MODES:
+            raise ValueError('Unknown alignment mode: {}'.format(mode))
+        key = (seq1, seq2, mode, id_chars, nonid_chars, gap_open_pen, gap_ext_pen)
+        try:
+            alignment = self._cache.pop(key)
+        except KeyError:
+            alignment = getattr(self, '_align_' + self.backend)(*key)
+        self._cache[key] = alignment
+        while len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+        return alignment
+
+    def clear(self):
+        """Discard all alignments kept"""
+        self._cache.clear()
+
+    @staticmethod
+    def _align_pairwise(seq1, seq2, mode, id_chars, nonid_chars, gap_open_pen, gap_ext_pen):
+        """Align two sequences with a single traceback of :obj:`~Bio.Align.PairwiseAligner`"""
+        aligner = PairwiseAligner()
+        aligner.mode = mode
+        aligner.match_score = id_chars
+        aligner.mismatch_score = nonid_chars
+        aligner.open_gap_score = gap_open_pen
+        aligner.extend_gap_score = gap_ext_pen
+        blocks1, blocks2 = next(iter(aligner.align(seq1, seq2))).aligned
+        if len(blocks1) == 0:
+            return seq1 + '-' * len(seq2), '-' * len(seq1) + seq2
+        # Lay out the full sequences like pairwise2, i.e. unaligned ends flush against the aligned region
+        prefix1, prefix2 = seq1[:blocks1[0][0]], seq2[:blocks2[0][0]]
+        width = max(len(prefix1), len(prefix2))
+        aligned1, aligned2 = [prefix1.rjust(width, '-')], [prefix2.rjust(width, '-')]
+        for i, ((start1, end1), (start2, end2)) in enumerate(zip(blocks1, blocks2)):
+            if i > 0:
+                insertion1, insertion2 = seq1[blocks1[i - 1][1]:start1], seq2[blocks2[i - 1][1]:start2]
+                aligned1.extend([insertion1, '-' * len(insertion2)])
+                aligned2.extend(['-' * len(insertion1), insertion2])
+            aligned1.append(seq1[start1:end1])
+            aligned2.append(seq2[start2:end2])
+        suffix1, suffix2 = seq1[blocks1[-1][1]:], seq2[blocks2[-1][1]:]
+        width = max(len(suffix1), len(suffix2))
+        aligned1.append(suffix1.ljust(width, '-'))
+        aligned2.append(suffix2.ljust(width, '-'))
+        return ''.join(aligned1), ''.join(aligned2)
+
+    @staticmethod
+    def _align_pairwise2(seq1, seq2, mode, id_chars, nonid_chars, gap_open_pen, gap_ext_pen):
+        """Align two sequences enumerating all optimal alignments with :mod:`Bio.pairwise2`"""
+        from Bio import pairwise2
+        alignment = getattr(pairwise2.align, mode + 'ms')(seq1, seq2, id_chars, nonid_chars, gap_open_pen, gap_ext_pen)
+        return alignment[-1][0], alignment[-1][1]
@@ -0,0 +1,773 @@
+# coding=utf-8
+#
+# BSD 3-Clause License
+#
+# Copyright (c) 2016-18, University of Liverpool
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""ArrayContactMap container used throughout ConKit"""
+
+from __future__ import division
+
+__author__ = "Felix Simkovic"
+__date__ = "18 Oct 2018"
+__version__ = "1.0"
+
+import copy
+import numpy as np
+import sys
+import weakref
+
+from conkit.core.contact import Contact
+from conkit.core.contactmap import ContactMap
+from conkit.core.mappings import ContactMatchState
+from conkit.misc import normalize
+
+CONTACT_DTYPE = np.dtype([
+    ('id1', np.int64),
+    ('id2', np.int64),
+    ('res1_seq', np.int64),
+    ('res2_seq', np.int64),
+    ('res1_altseq', np.int64),
+    ('res2_altseq', np.int64),
+    ('res1', 'S1'),
+    ('res2', 'S1'),
+    ('res1_chain', 'S4'),
+    ('res2_chain', 'S4'),
+    ('raw_score', np.float64),
+    ('scalar_score', np.float64),
+    ('weight', np.float64),
+    ('status', np.int8),
+    ('lower_bound', np.float64),
+    ('upper_bound', np.float64),
+])
+
+
+class ArrayContactMap(ContactMap):
+    """A contact map object storing all contact pairs in a single :mod:`numpy` structured array
+
+    The :obj:`~conkit.core.arraycontactmap.ArrayContactMap` is a drop-in replacement for the
+    :obj:`~conkit.core.contactmap.ContactMap` for very large predictions, e.g. all-pairs
+    matrices produced by CCMpred. Instead of one :obj:`~conkit.core.contact.Contact` instance
+    per pair, all contact attributes are kept in columns of a structured array.
+    :obj:`~conkit.core.contact.Contact` instances are only created when iterating over or
+    indexing the map, and changes made to them are written back to the array before any
+    array operation.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from conkit.core.arraycontactmap import ArrayContactMap
+    >>> contact_map = ArrayContactMap.from_arrays("example", [1, 5], [10, 30], [0.333, 0.667])
+    >>> print(contact_map)
+    ArrayContactMap(id="example", ncontacts=2)
+
+    Warning
+    -------
+    :attr:`~conkit.core.entity.Entity.child_list` and :attr:`~conkit.core.entity.Entity.child_dict`
+    are created on request only and are not stored.
+
+    """
+    __slots__ = ['_buffer', '_ncontacts', '_materialised', '_dirty', '_index', '_pending', '_base', '_rows']
+
+    def __init__(self, id):
+        """Initialise a new array-backed contact map"""
+        self._buffer = np.zeros(0, dtype=CONTACT_DTYPE)
+        self._ncontacts = 0
+        self._materialised = weakref.WeakValueDictionary()
+        self._dirty = {}
+        self._index = None
+        self._pending = {}
+        self._base = None
+        self._rows = None
+        super(ArrayContactMap, self).__init__(id)
+
+    def __contains__(self, id):
+        """True if there is a contact with the given id"""
+        return self._find(id) is not None
+
+    def __delitem__(self, id):
+        """Remove a contact with given id"""
+        if isinstance(id, int):
+            row = id + self._ncontacts if id < 0 else id
+            if not 0 <= row < self._ncontacts:
+                raise IndexError("list index out of range")
+        else:
+            row = self._find(id)
+            if row is None:
+                raise KeyError(id)
+        self._take(np.flatnonzero(np.arange(self._ncontacts) != row))
+
+    def __getitem__(self, id):
+        """Return the contact with the given id"""
+        if isinstance(id, slice):
+            self._sync()
+            contact_map = self.__class__(self.id)
+            contact_map._sequence = self._sequence
+            contact_map._buffer = self._data[id]
+            contact_map._ncontacts = contact_map._buffer.shape[0]
+            contact_map._shared = True
+            contact_map._base = self
+            contact_map._rows = np.arange(self._ncontacts)[id]
+            self._track_view(contact_map)
+            return contact_map
+        elif isinstance(id, int):
+            row = id + self._ncontacts if id < 0 else id
+            if not 0 <= row < self._ncontacts:
+                raise IndexError("list index out of range")
+            return self._materialise(row)
+        row = self._find(id)
+        if row is None:
+            raise KeyError(id)
+        return self._materialise(row)
+
+    def __getstate__(self):
+        self._sync()
+        return {
+            'id': self._id,
+            'parent': self.parent,
+            'sequence': self._sequence,
+            'data': self._data,
+        }
+
+    def __iter__(self):
+        """Iterate over contacts"""
+        for row in range(self._ncontacts):
+            yield self._materialise(row)
+
+    def __len__(self):
+        """Return the number of contacts"""
+        return self._ncontacts
+
+    def __reversed__(self):
+        """Reversed list of the contacts"""
+        for row in reversed(range(self._ncontacts)):
+            yield self._materialise(row)
+
+    def __setstate__(self, state):
+        self._id = state['id']
+        self.parent = state['parent']
+        self._sequence = state['sequence']
+        self._buffer = state['data']
+        self._ncontacts = state['data'].shape[0]
+        self._materialised = weakref.WeakValueDictionary()
+        self._dirty = {}
+        self._index = None
+        self._pending = {}
+        self._shared = True
+        self._views = None
+        self._base = None
+        self._rows = None
+
+    @property
+    def child_list(self):
+        """A list of :obj:`~conkit.core.contact.Contact` instances created on request"""
+        return list(self)
+
+    @child_list.setter
+    def child_list(self, child_list):
+        if child_list:
+            raise AttributeError("child_list of an ArrayContactMap cannot be set")
+
+    @property
+    def child_dict(self):
+        """A dictionary of :obj:`~conkit.core.contact.Contact` instances created on request"""
+        return dict((c.id, c) for c in self)
+
+    @child_dict.setter
+    def child_dict(self, child_dict):
+        if child_dict:
+            raise AttributeError("child_dict of an ArrayContactMap cannot be set")
+
+    @property
+    def data(self):
+        """The structured :mod:`numpy` array holding all contact attributes
+
+        Note
+        ----
+        Edits to :obj:`~conkit.core.contact.Contact` instances obtained from this map
+        are written to the returned array before it is returned. A sliced
+        :obj:`~conkit.core.arraycontactmap.ArrayContactMap` receives its own copy of the array first.
+
+        """
+        self._unshare()
+        self._sync()
+        return self._data
+
+    @property
+    def precision(self):
+        """The precision (Positive Predictive Value) score
+
+        See Also
+        --------
+        :attr:`~conkit.core.contactmap.ContactMap.precision`
+
+        """
+        if self.empty:
+            return 0.0
+
+        import warnings
+
+        self._sync()
+        statuses = self._data['status']
+        tp = (statuses == ContactMatchState.true_positive.value).sum()
+        fp = (statuses == ContactMatchState.false_positive.value).sum()
+        unk = (statuses == ContactMatchState.unknown.value).sum()
+
+        if tp + fp == 0:
+            warnings.warn("No true positive or false positive found in your contact map. Match two ContactMaps first.")
+            return 0.0
+        elif unk > 0:
+            warnings.warn("Some contacts between the ContactMaps are unmatched due to non-identical sequences. "
+                          "The precision value might be inaccurate.")
+
+        return tp / float(tp + fp)
+
+    @property
+    def recall(self):
+        """The Recall (Sensitivity) score
+
+        See Also
+        --------
+        :attr:`~conkit.core.contactmap.ContactMap.recall`
+
+        """
+        if self.empty:
+            return 0.0
+
+        import warnings
+
+        self._sync()
+        statuses = self._data['status']
+        tp = (statuses == ContactMatchState.true_positive.value).sum()
+        fn = (statuses == ContactMatchState.false_negative.value).sum()
+        unk = (statuses == ContactMatchState.unknown.value).sum()
+
+        if tp + fn == 0:
+            warnings.warn("No true positive or false negative contacts found in your contact map. "
+                          "Match two ContactMaps first.")
+            return 0.0
+        elif unk > 0:
+            warnings.warn("Some contacts between the ContactMaps are unmatched due to non-identical sequences. "
+                          "The recall value might be inaccurate.")
+
+        return tp / float(tp + fn)
+
+    @property
+    def top(self):
+        """The first :obj:`~conkit.core.contact.Contact` in the :obj:`~conkit.core.arraycontactmap.ArrayContactMap`"""
+        if self._ncontacts > 0:
+            return self._materialise(0)
+        else:
+            return None
+
+    @property
+    def _data(self):
+        """The used part of the internal buffer"""
+        return self._buffer[:self._ncontacts]
+
+    def add(self, contact):
+        """Add a :obj:`~conkit.core.contact.Contact` to the :obj:`~conkit.core.arraycontactmap.ArrayContactMap`
+
+        Parameters
+        ----------
+        contact : :obj:`~conkit.core.contact.Contact`
+
+        """
+        self._unshare()
+        key = ArrayContactMap._key(contact.id)
+        if self._find(contact.id) is not None:
+            raise ValueError("%s defined twice" % str(contact.id))
+        if self._ncontacts == self._buffer.shape[0]:
+            buffer = np.zeros(max(16, 2 * self._buffer.shape[0]), dtype=CONTACT_DTYPE)
+            buffer[:self._ncontacts] = self._data
+            self._buffer = buffer
+        row = self._ncontacts
+        self._ncontacts += 1
+        ArrayContactMap._write(self._buffer, row, contact)
+        contact.parent = self
+        self._materialised[row] = contact
+        if self._index is not None:
+            self._pending[key] = row
+            if len(self._pending) > max(1024, self._index[0].shape[0]):
+                self._index = None
+                self._pending = {}
+
+    def as_list(self, altloc=False):
+        """The :obj:`~conkit.core.arraycontactmap.ArrayContactMap` as a 2D-list containing contact-pair residue indexes
+
+        Parameters
+        ----------
+        altloc : bool
+           Use the :attr:`~conkit.core.contact.Contact.res_altloc` positions [default: False]
+
+        """
+        self._sync()
+        data = self._data
+        if altloc:
+            return np.column_stack((data['res1_altseq'], data['res2_altseq'])).tolist()
+        else:
+            return np.column_stack((data['res1_seq'], data['res2_seq'])).tolist()
+
+    def copy(self):
+        """Create a shallow copy of :obj:`~conkit.core.arraycontactmap.ArrayContactMap`"""
+        return self._taken(np.arange(self._ncontacts))
+
+    def deepcopy(self):
+        """Create a deep copy of :obj:`~conkit.core.arraycontactmap.ArrayContactMap`"""
+        deep = self._taken(np.arange(self._ncontacts))
+        deep._sequence = copy.deepcopy(self._sequence)
+        return deep
+
+    def reindex(self, index, altloc=False, inplace=False):
+        """Re-index the :obj:`~conkit.core.arraycontactmap.ArrayContactMap`
+
+        See Also
+        --------
+        :meth:`~conkit.core.contactmap.ContactMap.reindex`
+
+        """
+        if index < 0:
+            raise ValueError("Index must be positive!")
+        contact_map = self._inplace(inplace)
+        if contact_map.empty:
+            return contact_map
+        data = contact_map.data
+        if altloc:
+            offset = data['res1_altseq'].min() - index
+            data['res1_altseq'] -= offset
+            data['res2_altseq'] -= offset
+        else:
+            offset = data['res1_seq'].min() - index
+            data['res1_seq'] -= offset
+            data['res2_seq'] -= offset
+        data['id1'] = data['res1_seq']
+        data['id2'] = data['res2_seq']
+        contact_map._reload()
+        return contact_map
+
+    def remove_neighbors(self, min_distance=5, max_distance=sys.maxsize, inplace=False):
+        """Remove contacts between neighboring residues
+
+        See Also
+        --------
+        :meth:`~conkit.core.contactmap.ContactMap.remove_neighbors`
+
+        """
+        contact_map = self._inplace(inplace)
+        data = contact_map.data
+        separation = np.abs(data['res2_seq'] - data['res1_seq'])
+        contact_map.keep((min_distance <= separation) & (separation <= max_distance))
+        return contact_map
+
+    def drop(self, ids):
+        """Remove all contacts with an id in ``ids``
+
+        See Also
+        --------
+        :meth:`~conkit.core.entity.Entity.drop`
+
+        """
+        rows = []
+        for id in ids:
+            row = self._find(id)
+            if row is None:
+                raise KeyError(id)
+            rows.append(row)
+        mask = np.ones(self._ncontacts, dtype=np.bool_)
+        mask[rows] = False
+        self._take(np.flatnonzero(mask))
+
+    def keep(self, mask):
+        """Keep only the contacts flagged in ``mask``
+
+        See Also
+        --------
+        :meth:`~conkit.core.entity.Entity.keep`
+
+        """
+        mask = np.asarray(mask, dtype=np.bool_)
+        if mask.shape != (self._ncontacts, ):
+            raise ValueError("Mask length does not match the number of children")
+        self._take(np.flatnonzero(mask))
+
+    def rescale(self, inplace=False):
+        """Rescale the raw scores in :obj:`~conkit.core.arraycontactmap.ArrayContactMap`
+
+        See Also
+        --------
+        :meth:`~conkit.core.contactmap.ContactMap.rescale`
+
+        """
+        contact_map = self._inplace(inplace)
+        data = contact_map.data
+        norm_raw_scores = np.asarray(normalize(data['raw_score']))
+        if np.isnan(norm_raw_scores).all():
+            norm_raw_scores = np.where(norm_raw_scores == np.isnan, 0, 1)
+        data['raw_score'] = norm_raw_scores
+        contact_map._reload()
+        return contact_map
+
+    def set_scalar_score(self):
+        """Calculate and set the :attr:`~conkit.core.contact.Contact.scalar_score` for the
+        :obj:`~conkit.core.arraycontactmap.ArrayContactMap`
+
+        See Also
+        --------
+        :meth:`~conkit.core.contactmap.ContactMap.set_scalar_score`
+
+        """
+        data = self.data
+        data['scalar_score'] = data['raw_score'] / np.mean(data['raw_score'])
+        self._reload()
+
+    def to_contactmap(self):
+        """Convert the :obj:`~conkit.core.arraycontactmap.ArrayContactMap` into a :obj:`~conkit.core.contactmap.ContactMap`
+
+        Returns
+        -------
+        :obj:`~conkit.core.contactmap.ContactMap`
+
+        """
+        self._sync()
+        contact_map = ContactMap(self.id)
+        if self._sequence is not None:
+            contact_map.sequence = self._sequence
+        for row in range(self._ncontacts):
+            contact_map.add(ArrayContactMap._read(self._data, row))
+        return contact_map
+
+    def top_k(self, k, key='raw_score', min_separation=None):
+        """Select the ``k`` contacts with the highest ``key`` values
+
+        See Also
+        --------
+        :meth:`~conkit.core.contactmap.ContactMap.top_k`
+
+        """
+        if k < 0:
+            raise ValueError("k must be positive!")
+        self._sync()
+        data = self._data
+        if key in CONTACT_DTYPE.names:
+            scores = data[key]
+        elif data.shape[0] > 0 and not hasattr(self._materialise(0), key):
+            raise ValueError('Attribute not defined')
+        else:
+            scores = np.array([getattr(self._materialise(row), key) for row in range(self._ncontacts)])
+        if min_separation is None:
+            candidates = np.arange(self._ncontacts)
+        else:
+            candidates = np.flatnonzero(np.abs(data['res2_seq'] - data['res1_seq']) >= min_separation)
+        scores = np.asarray(scores[candidates], dtype=np.float64)
+        return self._taken(candidates[ContactMap._select_top(scores, k)])
+
+    def _child_changed(self, child, **previous):
+        """Remember a materialised :obj:`~conkit.core.contact.Contact` that has been edited"""
+        self._dirty[id(child)] = child
+
+    def _find(self, id):
+        """Find the row of a contact by its id"""
+        try:
+            key = ArrayContactMap._key(id)
+        except (TypeError, ValueError):
+            return None
+        if key in self._pending:
+            return self._pending[key]
+        if self._index is None:
+            self._sync()
+            data = self._data
+            keys = ArrayContactMap._key((data['id1'], data['id2']))
+            order = np.argsort(keys, kind='mergesort')
+            self._index = (keys[order], order)
+            self._pending = {}
+        keys, order = self._index
+        i = np.searchsorted(keys, key)
+        if i < keys.shape[0] and keys[i] == key:
+            return int(order[i])
+        return None
+
+    def _get_columns(self, fields):
+        """The ``fields`` of all contacts as one :obj:`numpy.ndarray` per field"""
+        if any(field not in CONTACT_DTYPE.names for field in fields):
+            return super(ArrayContactMap, self)._get_columns(fields)
+        self._sync()
+        data = self._data
+        return tuple(data[field].astype('U') if data[field].dtype.kind == 'S' else data[field].copy() for field in fields)
+
+    def _get_keys(self):
+        """The contact ids packed into single integer keys"""
+        self._sync()
+        return ArrayContactMap._key((self._data['id1'], self._data['id2']))
+
+    def _get_sorted_keys(self):
+        """The packed contact keys in ascending order"""
+        return np.unique(self._get_keys())
+
+    def _materialise(self, row):
+        """Create the :obj:`~conkit.core.contact.Contact` instance for a row"""
+        if self._base is not None:
+            return self._base._materialise(int(self._rows[row]))
+        contact = self._materialised.get(row)
+        if contact is None:
+            contact = ArrayContactMap._read(self._data, row)
+            contact.parent = self
+            self._materialised[row] = contact
+        return contact
+
+    def _range(self, min_distance, max_distance):
+        """A copy with contacts ``min_distance`` <= ``x`` <= ``max_distance`` residues apart"""
+        self._sync()
+        separation = np.abs(self._data['res2_seq'] - self._data['res1_seq'])
+        return self._taken(np.flatnonzero((min_distance <= separation) & (separation <= max_distance)))
+
+    def _reload(self):
+        """Refresh materialised contacts after modifying the array directly"""
+        for row, contact in list(self._materialised.items()):
+            fresh = ArrayContactMap._read(self._data, row)
+            for attr in ['_id'] + Contact.__slots__:
+                setattr(contact, attr, getattr(fresh, attr))
+        self._index = None
+        self._pending = {}
+
+    def _set_field(self, field, values):
+        """Set the ``field`` of all contacts to the corresponding ``values``"""
+        if field not in CONTACT_DTYPE.names:
+            return super(ArrayContactMap, self)._set_field(field, values)
+        self._unshare()
+        self._sync()
+        self._data[field] = values
+        self._reload()
+
+    def _sort(self, kword, reverse):
+        """Sort the :obj:`~conkit.core.arraycontactmap.ArrayContactMap`"""
+        self._sync()
+        data = self._data
+        if kword in CONTACT_DTYPE.names:
+            keys = data[kword]
+        elif kword == 'id':
+            keys = data[['id1', 'id2']]
+        elif data.shape[0] > 0 and not hasattr(self._materialise(0), kword):
+            raise ValueError('Attribute not defined')
+        else:
+            keys = np.array([getattr(self._materialise(row), kword) for row in range(self._ncontacts)])
+        if reverse:
+            order = keys.shape[0] - 1 - np.argsort(keys[::-1], kind='mergesort')[::-1]
+        else:
+            order = np.argsort(keys, kind='mergesort')
+        self._take(order)
+
+    def _subset(self, rows):
+        """Create a new :obj:`~conkit.core.arraycontactmap.ArrayContactMap` with the contacts at ``rows``"""
+        return self._taken(rows)
+
+    def _sync(self):
+        """Write the changes made to materialised contacts back into the array
+
+        Only the contacts reported by :meth:`~conkit.core.entity.Node._changed` are written. The map
+        holds no other reference to materialised contacts, which are released once they are no longer
+        used elsewhere. The contacts of a slice belong to the map it was sliced from.
+
+        """
+        if self._base is not None:
+            self._base._sync()
+            return
+        if not self._dirty:
+            return
+        copied = self._shared
+        if copied:
+            self._buffer = self._data.copy()
+            self._shared = False
+        rows = dict((id(contact), row) for row, contact in list(self._materialised.items()))
+        for key, contact in self._dirty.items():
+            row = rows[key]
+            if (self._buffer['id1'][row], self._buffer['id2'][row]) != contact.id:
+                self._index = None
+                self._pending = {}
+            ArrayContactMap._write(self._buffer, row, contact)
+        self._dirty = {}
+        if copied:
+            self._release_views()
+
+    def _take(self, rows):
+        """Keep only the contacts at ``rows`` in the given order"""
+        self._unshare()
+        self._sync()
+        rows = np.asarray(rows, dtype=np.int64)
+        inverse = np.full(self._ncontacts, -1, dtype=np.int64)
+        inverse[rows] = np.arange(rows.shape[0])
+        materialised = weakref.WeakValueDictionary()
+        for row, contact in list(self._materialised.items()):
+            if inverse[row] < 0:
+                contact.parent = None
+            else:
+                materialised[int(inverse[row])] = contact
+        self._buffer = self._data[rows]
+        self._ncontacts = rows.shape[0]
+        self._materialised = materialised
+        self._shared = False
+        self._index = None
+        self._pending = {}
+
+    def _unshare(self):
+        """Copy the array shared with the :obj:`~conkit.core.arraycontactmap.ArrayContactMap` it was sliced from
+
+        The slices taken from this :obj:`~conkit.core.arraycontactmap.ArrayContactMap` receive their own
+        copies first, so the contacts already handed out remain in this map.
+
+        """
+        self._release_views()
+        if self._base is not None:
+            self._base._sync()
+            self._buffer = self._base._data[self._rows]
+            self._shared = False
+            self._base = None
+            self._rows = None
+        elif self._shared:
+            self._buffer = self._data.copy()
+            self._shared = False
+
+    def _taken(self, rows):
+        """Create a new :obj:`~conkit.core.arraycontactmap.ArrayContactMap` with the contacts at ``rows``"""
+        self._sync()
+        contact_map = self.__class__(self.id)
+        contact_map._sequence = self._sequence
+        contact_map._buffer = self._data[np.asarray(rows, dtype=np.int64)]
+        contact_map._ncontacts = contact_map._buffer.shape[0]
+        return contact_map
+
+    @classmethod
+    def from_arrays(cls, id, res1_seq, res2_seq, raw_score, **kwargs):
+        """Create a new :obj:`~conkit.core.arraycontactmap.ArrayContactMap` from per-contact arrays
+
+        Parameters
+        ----------
+        id : str
+           A unique identifier
+        res1_seq : list, tuple, :obj:`~numpy.ndarray`
+           The residue sequence numbers of residue 1
+        res2_seq : list, tuple, :obj:`~numpy.ndarray`
+           The residue sequence numbers of residue 2
+        raw_score : list, tuple, :obj:`~numpy.ndarray`
+           The prediction scores of the contact pairs
+        **kwargs
+           Any other column in :const:`~conkit.core.arraycontactmap.CONTACT_DTYPE`
+
+        Returns
+        -------
+        :obj:`~conkit.core.arraycontactmap.ArrayContactMap`
+
+        Raises
+        ------
+        :exc:`ValueError`
+           Unknown column
+        :exc:`ValueError`
+           Contact pairs defined twice
+
+        """
+        res1_seq = np.asarray(res1_seq, dtype=np.int64)
+        data = np.zeros(res1_seq.shape[0], dtype=CONTACT_DTYPE)
+        data['res1_seq'] = res1_seq
+        data['res2_seq'] = res2_seq
+        data['raw_score'] = raw_score
+        data['id1'] = data['res1_seq']
+        data['id2'] = data['res2_seq']
+        data['res1'] = data['res2'] = b'X'
+        data['weight'] = 1.0
+        data['lower_bound'] = 0.0
+        data['upper_bound'] = 8.0
+        for k, v in kwargs.items():
+            if k not in CONTACT_DTYPE.names:
+                raise ValueError("Unknown column: {}".format(k))
+            data[k] = v
+        keys = ArrayContactMap._key((data['id1'], data['id2']))
+        if np.unique(keys).shape[0] != keys.shape[0]:
+            raise ValueError("Contact pairs defined twice")
+        contact_map = cls(id)
+        contact_map._buffer = data
+        contact_map._ncontacts = data.shape[0]
+        return contact_map
+
+    @classmethod
+    def _from_pairs(cls, id, res1_seq, res2_seq, raw_score, top_k):
+        """Create a new instance from per-contact arrays, keeping the ``top_k`` contacts in decreasing score order"""
+        if top_k is not None and top_k < 0:
+            raise ValueError("k must be positive!")
+        rows = ContactMap._select_top(raw_score, raw_score.shape[0] if top_k is None else top_k)
+        return cls.from_arrays(id, res1_seq[rows], res2_seq[rows], raw_score[rows])
+
+    @classmethod
+    def from_contactmap(cls, contact_map):
+        """Create a new :obj:`~conkit.core.arraycontactmap.ArrayContactMap` from a
+        :obj:`~conkit.core.contactmap.ContactMap`
+
+        Parameters
+        ----------
+        contact_map : :obj:`~conkit.core.contactmap.ContactMap`
+
+        Returns
+        -------
+        :obj:`~conkit.core.arraycontactmap.ArrayContactMap`
+
+        """
+        data = np.zeros(len(contact_map), dtype=CONTACT_DTYPE)
+        for row, contact in enumerate(contact_map):
+            ArrayContactMap._write(data, row, contact)
+        array_map = cls(contact_map.id)
+        array_map._sequence = contact_map.sequence
+        array_map._buffer = data
+        array_map._ncontacts = data.shape[0]
+        return array_map
+
+    @staticmethod
+    def _read(data, row):
+        """Create a :obj:`~conkit.core.contact.Contact` from a row"""
+        record = data[row]
+        contact = Contact(
+            int(record['res1_seq']),
+            int(record['res2_seq']),
+            float(record['raw_score']),
+            distance_bound=(record['lower_bound'], record['upper_bound']))
+        contact.id = (int(record['id1']), int(record['id2']))
+        contact.res1 = record['res1'].decode()
+        contact.res2 = record['res2'].decode()
+        contact.res1_chain = record['res1_chain'].decode()
+        contact.res2_chain = record['res2_chain'].decode()
+        contact.res1_altseq = int(record['res1_altseq'])
+        contact.res2_altseq = int(record['res2_altseq'])
+        contact.scalar_score = float(record['scalar_score'])
+        contact.weight = float(record['weight'])
+        contact.status = int(record['status'])
+        return contact
+
+    @staticmethod
+    def _write(data, row, contact):
+        """Write a :obj:`~conkit.core.contact.Contact` into a row"""
+        data[row] = (contact.id[0], contact.id[1], contact.res1_seq, contact.res2_seq, contact.res1_altseq,
+                     contact.res2_altseq, contact.res1, contact.res2, contact.res1_chain, contact.res2_chain,
+                     contact.raw_score, contact.scalar_score, contact.weight, contact.status, contact.lower_bound,
+                     contact.upper_bound)
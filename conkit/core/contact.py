@@ -39,12 +39,19 @@ __date__ = "03 Aug 2016"
 __version__ = "1.0"
 
 from enum import Enum, unique
-from conkit.core.entity import Entity
+from conkit.core.entity import Node
 from conkit.core.mappings import AminoAcidOneToThree, AminoAcidThreeToOne, ContactMatchState
 from conkit.misc import deprecate
 
+# Contact states are stored as plain integers to keep each contact small
+_UNKNOWN = ContactMatchState.unknown.value
+_TRUE_POSITIVE = ContactMatchState.true_positive.value
+_TRUE_NEGATIVE = ContactMatchState.true_negative.value
+_FALSE_POSITIVE = ContactMatchState.false_positive.value
+_FALSE_NEGATIVE = ContactMatchState.false_negative.value
 
-class Contact(Entity):
+
+class Contact(Node):
     """A contact pair template to store all associated information
 
     Examples
@@ -101,8 +108,8 @@ class Contact(Entity):
 
     """
     __slots__ = [
-        '_distance_bound', 'raw_score', '_res1', '_res2', 'res1_chain', 'res2_chain', '_res1_seq', '_res2_seq',
-        '_res1_altseq', '_res2_altseq', 'scalar_score', '_status', 'weight'
+        '_distance_bound', '_raw_score', '_res1', '_res2', '_res1_chain', '_res2_chain', '_res1_seq', '_res2_seq',
+        '_res1_altseq', '_res2_altseq', '_scalar_score', '_status', '_weight'
     ]
 
     def __init__(self, res1_seq, res2_seq, raw_score, distance_bound=(0, 8)):
@@ -121,30 +128,30 @@ class Contact(Entity):
            The residue sequence number of residue 2
 
         """
-        self.raw_score = raw_score
-        self.res1_chain = ''
-        self.res2_chain = ''
-        self.scalar_score = 0.0
-        self.weight = 1.0
+        if not (isinstance(res1_seq, int) and isinstance(res2_seq, int)):
+            raise TypeError('Data type int required for res_seq')
+
+        self._raw_score = raw_score
+        self._res1_chain = ''
+        self._res2_chain = ''
+        self._scalar_score = 0.0
+        self._weight = 1.0
 
-        self._distance_bound = [0.0, 8.0]
         self._res1 = 'X'
         self._res2 = 'X'
-        self._res1_seq = 0
-        self._res2_seq = 0
+        self._res1_seq = res1_seq
+        self._res2_seq = res2_seq
         self._res1_altseq = 0
         self._res2_altseq = 0
-        self._status = ContactMatchState.unknown
+        self._status = _UNKNOWN
 
         self.distance_bound = distance_bound
-        self.res1_seq = res1_seq
-        self.res2_seq = res2_seq
 
         super(Contact, self).__init__((res1_seq, res2_seq))
 
     def __repr__(self):
-        text = "{name}(id={id} res1={_res1} res1_chain={res1_chain} res1_seq={_res1_seq} " \
-               "res2={_res2} res2_chain={res2_chain} res2_seq={_res2_seq} raw_score={raw_score})"
+        text = "{name}(id={id} res1={_res1} res1_chain={_res1_chain} res1_seq={_res1_seq} " \
+               "res2={_res2} res2_chain={_res2_chain} res2_seq={_res2_seq} raw_score={_raw_score})"
         return text.format(
             name=self.__class__.__name__, id=self._id, **{k: getattr(self, k)
                                                           for k in self.__class__.__slots__})
@@ -152,7 +159,7 @@ class Contact(Entity):
     @property
     def distance_bound(self):
         """The lower and upper distance boundary values of a contact pair in Ångstrom [Default: 0-8Å]."""
-        return tuple(self._distance_bound)
+        return self._distance_bound
 
     @distance_bound.setter
     def distance_bound(self, distance_bound):
@@ -165,24 +172,25 @@ class Contact(Entity):
 
         """
         if isinstance(distance_bound, (list, tuple)):
-            self._distance_bound = list(map(float, distance_bound))
+            self._distance_bound = tuple(map(float, distance_bound))
+            self._changed()
         else:
             raise TypeError("Data of type list or tuple required")
 
     @property
     @deprecate('0.11', msg='Use true_positive instead')
     def is_match(self):
-        return self._status == ContactMatchState.true_positive
+        return self._status == _TRUE_POSITIVE
 
     @property
     @deprecate('0.11', msg='Use false_positive instead')
     def is_mismatch(self):
-        return self._status == ContactMatchState.false_positive
+        return self._status == _FALSE_POSITIVE
 
     @property
     @deprecate('0.11', msg='Use status_unknown instead')
     def is_unknown(self):
-        return self._status == ContactMatchState.unknown
+        return self._status == _UNKNOWN
 
     @property
     def lower_bound(self):
@@ -207,7 +215,8 @@ class Contact(Entity):
 
         """
         if 0 < value < self.upper_bound:
-            self._distance_bound[0] = float(value)
+            self._distance_bound = (float(value), self._distance_bound[1])
+            self._changed()
         else:
             raise ValueError('Lower bound must be positive and smaller than upper bound')
 
@@ -234,10 +243,28 @@ class Contact(Entity):
 
         """
         if 0 < value > self.lower_bound:
-            self._distance_bound[1] = float(value)
+            self._distance_bound = (self._distance_bound[0], float(value))
+            self._changed()
         else:
             raise ValueError('Upper bound must be positive and larger than lower bound')
 
+    @property
+    def raw_score(self):
+        """The prediction score for the contact pair"""
+        return self._raw_score
+
+    @raw_score.setter
+    def raw_score(self, raw_score):
+        """Set the prediction score
+
+        Parameters
+        ----------
+        raw_score : float
+
+        """
+        self._raw_score = raw_score
+        self._changed()
+
     @property
     def res1(self):
         """The amino acid of residue 1 [default: X]"""
@@ -254,6 +281,7 @@ class Contact(Entity):
 
         """
         self._res1 = Contact._set_residue(amino_acid)
+        self._changed()
 
     @property
     def res2(self):
@@ -271,6 +299,41 @@ class Contact(Entity):
 
         """
         self._res2 = Contact._set_residue(amino_acid)
+        self._changed()
+
+    @property
+    def res1_chain(self):
+        """The chain for residue 1"""
+        return self._res1_chain
+
+    @res1_chain.setter
+    def res1_chain(self, res1_chain):
+        """Define the chain for residue 1
+
+        Parameters
+        ----------
+        res1_chain : str
+
+        """
+        self._res1_chain = res1_chain
+        self._changed()
+
+    @property
+    def res2_chain(self):
+        """The chain for residue 2"""
+        return self._res2_chain
+
+    @res2_chain.setter
+    def res2_chain(self, res2_chain):
+        """Define the chain for residue 2
+
+        Parameters
+        ----------
+        res2_chain : str
+
+        """
+        self._res2_chain = res2_chain
+        self._changed()
 
     @property
     def res1_altseq(self):
@@ -288,6 +351,7 @@ class Contact(Entity):
         """
         if isinstance(index, int):
             self._res1_altseq = index
+            self._changed()
         else:
             raise TypeError('Data type int required for res_seq')
 
@@ -307,6 +371,7 @@ class Contact(Entity):
         """
         if isinstance(index, int):
             self._res2_altseq = index
+            self._changed()
         else:
             raise TypeError('Data type int required for res_seq')
 
@@ -331,6 +396,7 @@ class Contact(Entity):
         """
         if isinstance(index, int):
             self._res1_seq = index
+            self._changed()
         else:
             raise TypeError('Data type int required for res_seq')
 
@@ -355,13 +421,31 @@ class Contact(Entity):
         """
         if isinstance(index, int):
             self._res2_seq = index
+            self._changed()
         else:
             raise TypeError('Data type int required for res_seq')
 
+    @property
+    def scalar_score(self):
+        """The :attr:`~conkit.core.contact.Contact.raw_score` scaled according to its average"""
+        return self._scalar_score
+
+    @scalar_score.setter
+    def scalar_score(self, scalar_score):
+        """Set the scaled score
+
+        Parameters
+        ----------
+        scalar_score : float
+
+        """
+        self._scalar_score = scalar_score
+        self._changed()
+
     @property
     def status(self):
         """An indication of the residue status"""
-        return self._status.value
+        return self._status
 
     @status.setter
     def status(self, status):
@@ -382,77 +466,103 @@ class Contact(Entity):
            Not a valid :obj:`~conkit.core.mappings.ContactMatchState`
 
         """
-        self._status = ContactMatchState(status)
+        self._status = ContactMatchState(status).value
+        self._changed()
 
     @property
     def true_positive(self):
-        return self._status == ContactMatchState.true_positive
+        return self._status == _TRUE_POSITIVE
 
     @true_positive.setter
     def true_positive(self, is_tp):
         if is_tp:
-            self._status = ContactMatchState.true_positive
+            self._status = _TRUE_POSITIVE
+            self._changed()
         else:
             self.status_unknown = True
 
     @property
     def true_negative(self):
-        return self._status == ContactMatchState.true_negative
+        return self._status == _TRUE_NEGATIVE
 
     @true_negative.setter
     def true_negative(self, is_tn):
         if is_tn:
-            self._status = ContactMatchState.true_negative
+            self._status = _TRUE_NEGATIVE
+            self._changed()
         else:
             self.status_unknown = True
 
     @property
     def false_positive(self):
-        return self._status == ContactMatchState.false_positive
+        return self._status == _FALSE_POSITIVE
 
     @false_positive.setter
     def false_positive(self, is_fp):
         if is_fp:
-            self._status = ContactMatchState.false_positive
+            self._status = _FALSE_POSITIVE
+            self._changed()
         else:
             self.status_unknown = True
 
     @property
     def false_negative(self):
-        return self._status == ContactMatchState.false_negative
+        return self._status == _FALSE_NEGATIVE
 
     @false_negative.setter
     def false_negative(self, is_fn):
         if is_fn:
-            self._status = ContactMatchState.false_negative
+            self._status = _FALSE_NEGATIVE
+            self._changed()
         else:
             self.status_unknown = True
 
     @property
     def status_unknown(self):
-        return self._status == ContactMatchState.unknown
+        return self._status == _UNKNOWN
 
     @status_unknown.setter
     def status_unknown(self, is_unknown):
         if is_unknown:
-            self._status = ContactMatchState.unknown
+            self._status = _UNKNOWN
+            self._changed()
         else:
             raise ValueError("Choose one of true_positive, false_positive, true_negative, false_negative instead!")
 
+    @property
+    def weight(self):
+        """A separate internal weight factor for the contact pair"""
+        return self._weight
+
+    @weight.setter
+    def weight(self, weight):
+        """Set the internal weight factor
+
+        Parameters
+        ----------
+        weight : float
+
+        """
+        self._weight = weight
+        self._changed()
+
     @deprecate('0.11', msg='Use true_positive instead')
     def define_match(self):
         """Define a contact as matching contact"""
-        self._status = ContactMatchState.true_positive
+        self._status = _TRUE_POSITIVE
+        self._changed()
 
     @deprecate('0.11', msg='Use false_positive instead')
     def define_mismatch(self):
         """Define a contact as mismatching contact"""
-        self._status = ContactMatchState.false_positive
+        self._status = _FALSE_POSITIVE
+        self._changed()
 
     @deprecate('0.11', msg='Use status_unknown instead')
     def define_unknown(self):
         """Define a contact with unknown status"""
-        self._status = ContactMatchState.unknown
+        self._status = _UNKNOWN
+        self._changed()
 
     def _to_dict(self):
         """Convert the object into a dictionary"""
@@ -38,6 +38,7 @@ __date__ = "03 Aug 2016"
 __version__ = "1.0"
 
 import collections
+import itertools
 import numpy as np
 import sys
 
@@ -50,6 +51,8 @@ from conkit.core.mappings import AminoAcidMapping, ContactMatchState
 from conkit.core.sequence import Sequence
 from conkit.misc import fAND, fOR, deprecate, normalize
 
+PrecisionCurve = collections.namedtuple('PrecisionCurve', ['ncontacts', 'precision', 'recall', 'f1', 'mcc'])
+
 
 class ContactMap(Entity):
     """A contact map object representing a single prediction
@@ -87,11 +90,12 @@ class ContactMap(Entity):
        The first :obj:`~conkit.core.contact.Contact` entry
 
     """
-    __slots__ = ['_sequence']
+    __slots__ = ['_sequence', '_separation']
 
     def __init__(self, id):
         """Initialise a new contact map"""
         self._sequence = None
+        self._separation = None
         super(ContactMap, self).__init__(id)
 
     def __repr__(self):
@@ -155,14 +159,14 @@ class ContactMap(Entity):
         Returns
         -------
         :obj:`~conkit.core.contactmap.ContactMap`
-           A copy of the :obj:`~conkit.core.contactmap.ContactMap` with short-range contacts only
+           A view of the :obj:`~conkit.core.contactmap.ContactMap` with short-range contacts only
 
         See Also
         --------
         medium_range, long_range
 
         """
-        return self.remove_neighbors(min_distance=6, max_distance=11)
+        return self._range(6, 11)
 
     @property
     @deprecate('0.11', msg='Use medium_range instead.')
@@ -179,14 +183,14 @@ class ContactMap(Entity):
         Returns
         -------
         :obj:`~conkit.core.contactmap.ContactMap`
-           A copy of the :obj:`~conkit.core.contactmap.ContactMap` with medium-range contacts only
+           A view of the :obj:`~conkit.core.contactmap.ContactMap` with medium-range contacts only
 
         See Also
         --------
         short_range, long_range
 
         """
-        return self.remove_neighbors(min_distance=12, max_distance=23)
+        return self._range(12, 23)
 
     @property
     @deprecate('0.11', msg='Use long_range instead.')
@@ -203,14 +207,14 @@ class ContactMap(Entity):
         Returns
         -------
         :obj:`~conkit.core.contactmap.ContactMap`
-           A copy of the :obj:`~conkit.core.contactmap.ContactMap` with long-range contacts only
+           A view of the :obj:`~conkit.core.contactmap.ContactMap` with long-range contacts only
 
         See Also
         --------
         short_range, medium_range
 
         """
-        return self.remove_neighbors(min_distance=24)
+        return self._range(24, sys.maxsize)
 
     @property
     def precision(self):
@@ -382,9 +386,7 @@ class ContactMap(Entity):
         throwables = np.full(X.shape[0], False, dtype=np.bool)
         c_singletons(X, 2, throwables)
         singletons = self.deepcopy()
-        for i, contact in enumerate(self):
-            if throwables[i]:
-                singletons.remove(contact.id)
+        singletons.keep(~throwables)
         return singletons
 
     @property
@@ -437,13 +439,63 @@ class ContactMap(Entity):
     def _construct_repr_sequence(self, res_seqs):
         """Construct the representative sequence"""
         representative_sequence = ''
-        for i in np.arange(1, self.sequence.seq_len + 1):
+        res_seqs = set(res_seqs)
+        for i in range(1, self.sequence.seq_len + 1):
             if i in res_seqs:
                 representative_sequence += self.sequence.seq[i - 1]
             else:
                 representative_sequence += '-'
         return Sequence(self.sequence.id + '_repr', representative_sequence)
 
+    def _get_columns(self, fields):
+        """The ``fields`` of all contacts as one :obj:`numpy.ndarray` per field"""
+        if any(not hasattr(c, field) for c in self for field in fields):
+            raise ValueError('Attribute not defined')
+        return tuple(np.array([getattr(c, field) for c in self]) for field in fields)
+
+    def _get_field(self, field):
+        """The residue numbers and ``field`` values of all contacts as :obj:`numpy.ndarray` instances"""
+        res1_seq, res2_seq, values = self._get_columns(('res1_seq', 'res2_seq', field))
+        return res1_seq.astype(np.int64), res2_seq.astype(np.int64), values.astype(np.float64)
+
+    def _get_keys(self):
+        """The contact ids packed into single integer keys"""
+        ids = np.array([c.id for c in self], dtype=np.int64).reshape(-1, 2)
+        return ContactMap._key((ids[:, 0], ids[:, 1]))
+
+    def _get_sorted_keys(self):
+        """The packed contact keys in ascending order"""
+        ids = np.fromiter(itertools.chain.from_iterable(self.child_dict), dtype=np.int64, count=2 * len(self.child_dict))
+        return np.sort(ContactMap._key((ids[0::2], ids[1::2])))
+
+    def _get_separation(self):
+        """The sequence separation of each contact, cached until the contacts change"""
+        if self._separation is None or self._shared:
+            separation = np.array([abs(c.res2_seq - c.res1_seq) for c in self], dtype=np.int64)
+            if self._shared:
+                return separation
+            self._separation = separation
+        return self._separation
+
+    def _invalidate(self):
+        """Discard the cached sequence separations"""
+        self._separation = None
+
+    def _range(self, min_distance, max_distance):
+        """A view with contacts ``min_distance`` <= ``x`` <= ``max_distance`` residues apart"""
+        separation = self._get_separation()
+        indexes = np.flatnonzero((min_distance <= separation) & (separation <= max_distance))
+        return self._view([self.child_list[i] for i in indexes])
+
+    def _set_field(self, field, values):
+        """Set the ``field`` of all contacts to the corresponding ``values``"""
+        for contact, value in zip(self, values.tolist()):
+            setattr(contact, field, value)
+
+    def _subset(self, rows):
+        """A view of the contacts at ``rows``"""
+        return self._view([self.child_list[i] for i in rows])
+
     def as_list(self, altloc=False):
         """The :obj:`~conkit.core.contactmap.ContactMap` as a 2D-list containing contact-pair residue indexes
 
@@ -473,6 +525,7 @@ class ContactMap(Entity):
            Use the :attr:`~conkit.core.contact.Contact.res_altloc` positions [default: False]
 
         """
+        self._unshare()
         for c in self:
             if altloc:
                 res1_index = c.res1_altseq
@@ -535,11 +588,84 @@ class ContactMap(Entity):
            [doi: 10.1093/bib/bbw106].
 
         """
-        union = len(self) + np.sum([1 for contact in other if contact.id not in self])
-        if union == 0:
-            return 1.0
-        intersection = np.sum([1 for contact in self if contact.id in other])
-        return float(intersection) / union
+        return ContactMap._get_jaccard(self._get_sorted_keys(), other._get_sorted_keys())
+
+    @staticmethod
+    def get_jaccard_matrix(contact_maps):
+        """Calculate the Jaccard index between all pairs of :obj:`~conkit.core.contactmap.ContactMap` instances
+
+        Parameters
+        ----------
+        contact_maps : list, tuple
+           A list of ConKit :obj:`~conkit.core.contactmap.ContactMap` instances
+
+        Returns
+        -------
+        :obj:`numpy.ndarray`
+           The symmetric matrix of Jaccard indexes
+
+        See Also
+        --------
+        get_jaccard_index
+
+        """
+        keys = [contact_map._get_sorted_keys() for contact_map in contact_maps]
+        matrix = np.ones((len(keys), len(keys)), dtype=np.float64)
+        for i in range(len(keys)):
+            for j in range(i + 1, len(keys)):
+                matrix[i, j] = matrix[j, i] = ContactMap._get_jaccard(keys[i], keys[j])
+        return matrix
+
+    def intersection(self, other):
+        """Select the contacts whose :attr:`~conkit.core.contact.Contact.id` is also in ``other``
+
+        Parameters
+        ----------
+        other : :obj:`~conkit.core.contactmap.ContactMap`
+           A ConKit :obj:`~conkit.core.contactmap.ContactMap`
+
+        Returns
+        -------
+        :obj:`~conkit.core.contactmap.ContactMap`
+           A view of the :obj:`~conkit.core.contactmap.ContactMap` with the selected contacts
+
+        """
+        return self._subset(np.flatnonzero(np.in1d(self._get_keys(), other._get_keys())))
+
+    def difference(self, other):
+        """Select the contacts whose :attr:`~conkit.core.contact.Contact.id` is not in ``other``
+
+        Parameters
+        ----------
+        other : :obj:`~conkit.core.contactmap.ContactMap`
+           A ConKit :obj:`~conkit.core.contactmap.ContactMap`
+
+        Returns
+        -------
+        :obj:`~conkit.core.contactmap.ContactMap`
+           A view of the :obj:`~conkit.core.contactmap.ContactMap` with the selected contacts
+
+        """
+        return self._subset(np.flatnonzero(~np.in1d(self._get_keys(), other._get_keys())))
+
+    def union(self, other):
+        """Combine the contacts with those in ``other`` whose :attr:`~conkit.core.contact.Contact.id` is not in `self`
+
+        Parameters
+        ----------
+        other : :obj:`~conkit.core.contactmap.ContactMap`
+           A ConKit :obj:`~conkit.core.contactmap.ContactMap`
+
+        Returns
+        -------
+        :obj:`~conkit.core.contactmap.ContactMap`
+           A copy of the :obj:`~conkit.core.contactmap.ContactMap` followed by copies of the contacts only in ``other``
+
+        """
+        contact_map = self.deepcopy()
+        for contact in other.difference(self):
+            contact_map.add(contact.copy())
+        return contact_map
 
     @deprecate('0.11', msg='Use get_contact_density instead.')
     def calculate_kernel_density(self, *args, **kwargs):
@@ -618,6 +744,7 @@ class ContactMap(Entity):
            *Elife* **4**, e09248.
 
         """
+        self._unshare()
         raw_scores = np.array([c.raw_score for c in self])
         sca_scores = raw_scores / np.mean(raw_scores)
         for contact, sca_score in zip(self, sca_scores):
@@ -647,9 +774,8 @@ class ContactMap(Entity):
         register = set(register)
         comparison_operator = fAND if strict else fOR
         contact_map = self.deepcopy()
-        for contactid in self.as_list(altloc=altloc):
-            if not comparison_operator(contactid[0] in register, contactid[1] in register):
-                contact_map.remove(tuple(contactid))
+        contact_map.keep([comparison_operator(res1 in register, res2 in register)
+                          for res1, res2 in self.as_list(altloc=altloc)])
         return contact_map
 
     def match(self,
@@ -699,98 +825,98 @@ class ContactMap(Entity):
            Error creating reliable keymap matching the sequence in :obj:`~conkit.core.contactmap.ContactMap`
 
         """
+        from conkit.core.matcher import Matcher
         contact_map1 = self._inplace(inplace)
         if match_other:
             contact_map2 = other._inplace(inplace)
-        else:
+        elif add_false_negatives:
             contact_map2 = other._inplace(False)
+        else:
+            contact_map2 = None
+        return Matcher(other)._match(contact_map1, contact_map2, add_false_negatives, remove_unmatched, renumber)
 
-        # ================================================================
-        # 1. Align all sequences
-        # ================================================================
-
-        config = dict(id_chars=2, nonid_chars=1, gap_open_pen=-0.5, gap_ext_pen=-0.1, inplace=False)
-
-        contact_map1_full_sequence, contact_map2_full_sequence = contact_map1.sequence.align_local(
-            contact_map2.sequence, **config)
-
-        config['inplace'] = True
-        config['gap_ext_pen'] = -0.2
-        _, contact_map1_repr_sequence = contact_map1_full_sequence.align_local(contact_map1.repr_sequence, **config)
-        _, contact_map2_repr_sequence = contact_map2_full_sequence.align_local(contact_map2.repr_sequence_altloc,
-                                                                               **config)
+    def precision_curve(self, factors=None, counts=None, key=None):
+        """Calculate precision, recall, F1 and MCC scores for the top contacts at many cutoffs in a single pass
 
-        config['gap_open_pen'] = -1.0
-        config['gap_ext_pen'] = -0.5
-        contact_map1_repr_sequence, contact_map2_repr_sequence = contact_map1_repr_sequence.align_local(
-            contact_map2_repr_sequence, **config)
+        The scores at each cutoff are identical to those of the first ``ncontacts`` predicted contacts,
+        but are derived from cumulative sums of true and false positives.
 
-        # ================================================================
-        # 2. Identify TPs in other, map them, and match them to self
-        # ================================================================
+        Parameters
+        ----------
+        factors : list, tuple, :obj:`numpy.ndarray`, optional
+           The number of contacts relative to the sequence length
+        counts : list, tuple, :obj:`numpy.ndarray`, optional
+           The number of contacts
+        key : str, optional
+           The numeric :obj:`~conkit.core.contact.Contact` attribute to rank by in descending order
+           [default: the current order]
 
-        encoded_repr = np.asarray([contact_map1_repr_sequence.seq_ascii, contact_map2_repr_sequence.seq_ascii])
+        Returns
+        -------
+        :obj:`~conkit.core.contactmap.PrecisionCurve`
+           The number of contacts and the precision, recall, F1 and MCC scores as :obj:`numpy.ndarray` instances
 
-        contact_map1_keymap = ContactMap._create_keymap(contact_map1)
-        contact_map2_keymap = ContactMap._create_keymap(contact_map2, altloc=True)
+        Raises
+        ------
+        :exc:`ValueError`
+           Provide either factors or counts
+        :exc:`ValueError`
+           The number of contacts cannot be negative
 
-        msg = "Error creating reliable keymap matching the sequence in ContactMap: "
-        if len(contact_map1_keymap) != (encoded_repr[0] != ord('-')).sum():
-            raise ValueError(msg + contact_map1.id)
-        elif len(contact_map2_keymap) != (encoded_repr[1] != ord('-')).sum():
-            raise ValueError(msg + contact_map2.id)
+        Note
+        ----
+        False negatives, i.e. contacts added by :meth:`~conkit.core.contactmap.ContactMap.match` with
+        ``add_false_negatives``, are not ranked but count towards the positives for the recall. The negatives
+        for the MCC are all residue pairs of the :attr:`~conkit.core.contactmap.ContactMap.sequence`, so the MCC
+        is :obj:`numpy.nan` without one.
 
-        contact_map1_keymap = ContactMap._insert_states(encoded_repr[0], contact_map1_keymap)
-        contact_map2_keymap = ContactMap._insert_states(encoded_repr[1], contact_map2_keymap)
+        See Also
+        --------
+        precision, recall
 
-        contact_map1_keymap = ContactMap._reindex_by_keymap(contact_map1_keymap)
-        contact_map2_keymap = ContactMap._reindex_by_keymap(contact_map2_keymap)
+        """
+        import warnings
 
-        contact_map2 = ContactMap._adjust(contact_map2, contact_map2_keymap)
+        if (factors is None) == (counts is None):
+            raise ValueError("Provide either factors or counts")
+        elif counts is None:
+            counts = np.asarray(factors, dtype=np.float64) * self.sequence.seq_len
+        counts = np.asarray(counts).astype(np.int64)
+        if np.any(counts < 0):
+            raise ValueError("The number of contacts cannot be negative")
+
+        statuses = self._get_columns(('status', ))[0].astype(np.int64)
+        if key is not None:
+            scores = self._get_columns((key, ))[0].astype(np.float64)
+            statuses = statuses[scores.shape[0] - 1 - np.argsort(scores[::-1], kind='mergesort')[::-1]]
+        ranked = statuses[statuses != ContactMatchState.false_negative.value]
+        tp = np.concatenate(([0], np.cumsum(ranked == ContactMatchState.true_positive.value)))
+        fp = np.concatenate(([0], np.cumsum(ranked == ContactMatchState.false_positive.value)))
+
+        if ranked.shape[0] > 0 and tp[-1] + fp[-1] == 0:
+            warnings.warn("No true positive or false positive found in your contact map. Match two ContactMaps first.")
+        elif np.any(ranked == ContactMatchState.unknown.value):
+            warnings.warn("Some contacts between the ContactMaps are unmatched due to non-identical sequences. "
+                          "The precision value might be inaccurate.")
 
-        residues_map2 = np.flatnonzero(np.asarray(contact_map2_full_sequence.seq_ascii) != ord('-')) + 1
+        ncontacts = np.minimum(counts, ranked.shape[0])
+        tp, fp = tp[ncontacts].astype(np.float64), fp[ncontacts].astype(np.float64)
+        positive = [ContactMatchState.true_positive.value, ContactMatchState.false_negative.value]
+        positives = float(np.sum(np.in1d(statuses, positive)))
+        fn = positives - tp
 
-        for contact in contact_map1:
-            _id = (contact.res1_seq, contact.res2_seq)
-            _id_alt = tuple(r.res_seq for r in contact_map2_keymap for i in _id if i == r.res_altseq)
+        def divide(a, b):
+            return np.divide(a, b, out=np.zeros_like(a), where=b > 0)
 
-            if any(i == Gap.IDENTIFIER for i in _id_alt) and any(j not in residues_map2 for j in _id):
-                contact_map1[_id].status = ContactMatchState.unknown
-            elif all(i in residues_map2 for i in _id):
-                if _id_alt in contact_map2:
-                    contact_map1[_id].status = ContactMatchState.true_positive
-                else:
-                    contact_map1[_id].status = ContactMatchState.false_positive
-            else:
-                raise RuntimeError("Error matching two contact maps - this should never happen")
-
-        # ================================================================
-        # 3. Add false negatives
-        # ================================================================
-        if add_false_negatives:
-            for contactid in contact_map2.as_list():
-                contactid = tuple(contactid)
-                if contactid not in contact_map1:
-                    contact = contact_map2[contactid].copy()
-                    contact.false_negative = True
-                    contact_map1.add(contact)
-
-        # ================================================================
-        # 4. Remove unmatched contacts
-        # ================================================================
-        if remove_unmatched:
-            for contactid in contact_map1.as_list():
-                contactid = tuple(contactid)
-                if contact_map1[contactid].status_unknown:
-                    contact_map1.remove(contactid)
-
-        # ================================================================
-        # 5. Renumber the contact map 1 based on contact map 2
-        # ================================================================
-        if renumber:
-            contact_map1 = ContactMap._renumber(contact_map1, contact_map1_keymap, contact_map2_keymap)
-
-        return contact_map1
+        precision = divide(tp, tp + fp)
+        recall = divide(tp, np.full_like(tp, positives))
+        f1 = divide(2 * precision * recall, precision + recall)
+        if self.sequence is None:
+            mcc = np.full_like(tp, np.nan)
+        else:
+            tn = self.sequence.seq_len * (self.sequence.seq_len - 1) / 2 - tp - fp - fn
+            mcc = divide(tp * tn - fp * fn, np.sqrt((tp + fp) * (tp + fn) * (tn + fp) * (tn + fn)))
+        return PrecisionCurve(counts, precision, recall, f1, mcc)
 
     def reindex(self, index, altloc=False, inplace=False):
         """Re-index the :obj:`~conkit.core.contactmap.ContactMap`
@@ -852,9 +978,7 @@ class ContactMap(Entity):
 
         """
         contact_map = self._inplace(inplace)
-        for contactid in contact_map.as_list():
-            if contact_map[tuple(contactid)].false_negative:
-                contact_map.remove(tuple(contactid))
+        contact_map.keep([not contact.false_negative for contact in contact_map])
         return contact_map
 
     def remove_neighbors(self, min_distance=5, max_distance=sys.maxsize, inplace=False):
@@ -880,11 +1004,8 @@ class ContactMap(Entity):
 
         """
         contact_map = self._inplace(inplace)
-        for contactid in contact_map.as_list():
-            if min_distance <= abs(contactid[1] - contactid[0]) <= max_distance:
-                continue
-            else:
-                contact_map.remove(tuple(contactid))
+        separation = contact_map._get_separation()
+        contact_map.keep((min_distance <= separation) & (separation <= max_distance))
         return contact_map
 
     def rescale(self, inplace=False):
@@ -946,15 +1067,210 @@ class ContactMap(Entity):
         content = ["%d\t%d\t%.5f" % (c.res1_seq, c.res2_seq, c.raw_score) for c in self]
         return '\n'.join(content)
 
+    def to_dense(self, field='raw_score', length=None, symmetric=True):
+        """Convert the :obj:`~conkit.core.contactmap.ContactMap` into a dense matrix
+
+        Parameters
+        ----------
+        field : str, optional
+           The numeric :obj:`~conkit.core.contact.Contact` attribute to fill the matrix with [default: raw_score]
+        length : int, optional
+           The number of matrix rows and columns [default: the highest residue number]
+        symmetric : bool, optional
+           Fill both triangles of the matrix [default: True]
+
+        Returns
+        -------
+        :obj:`numpy.ndarray`
+           A ``length`` x ``length`` matrix with the value of contact ``(i, j)`` in row ``i - 1`` and column ``j - 1``
+
+        Raises
+        ------
+        :exc:`ValueError`
+           ``field`` not in :obj:`~conkit.core.contactmap.ContactMap`
+
+        """
+        res1_seq, res2_seq, values = self._get_field(field)
+        if length is None:
+            length = int(max(res1_seq.max(), res2_seq.max())) if res1_seq.shape[0] > 0 else 0
+        mat = np.zeros((length, length), dtype=np.float64)
+        mat[res1_seq - 1, res2_seq - 1] = values
+        if symmetric:
+            mat[res2_seq - 1, res1_seq - 1] = values
+        return mat
+
+    def to_sparse(self, field='raw_score', length=None, symmetric=True, format='coo'):
+        """Convert the :obj:`~conkit.core.contactmap.ContactMap` into a sparse :mod:`scipy.sparse` matrix
+
+        Parameters
+        ----------
+        field : str, optional
+           The numeric :obj:`~conkit.core.contact.Contact` attribute to fill the matrix with [default: raw_score]
+        length : int, optional
+           The number of matrix rows and columns [default: the highest residue number]
+        symmetric : bool, optional
+           Fill both triangles of the matrix [default: True]
+        format : str, optional
+           The :mod:`scipy.sparse` format, e.g. ``coo`` or ``csr`` [default: coo]
+
+        Returns
+        -------
+        :obj:`scipy.sparse.spmatrix`
+
+        Raises
+        ------
+        :exc:`ValueError`
+           ``field`` not in :obj:`~conkit.core.contactmap.ContactMap`
+
+        See Also
+        --------
+        to_dense
+
+        """
+        from scipy import sparse
+        res1_seq, res2_seq, values = self._get_field(field)
+        if length is None:
+            length = int(max(res1_seq.max(), res2_seq.max())) if res1_seq.shape[0] > 0 else 0
+        if symmetric:
+            mirrored = res1_seq != res2_seq
+            res1_seq, res2_seq = (np.concatenate((res1_seq, res2_seq[mirrored])),
+                                  np.concatenate((res2_seq, res1_seq[mirrored])))
+            values = np.concatenate((values, values[mirrored]))
+        return sparse.coo_matrix((values, (res1_seq - 1, res2_seq - 1)), shape=(length, length)).asformat(format)
+
+    def top_k(self, k, key='raw_score', min_separation=None):
+        """Select the ``k`` contacts with the highest ``key`` values
+
+        The selection is identical to sorting by ``key`` in descending order and slicing
+        the first ``k`` contacts, but the scores are only partially ordered.
+
+        Parameters
+        ----------
+        k : int
+           The number of contacts to select
+        key : str, optional
+           The numeric :obj:`~conkit.core.contact.Contact` attribute to rank by [default: raw_score]
+        min_separation : int, optional
+           The minimum number of residues between contacts [default: None]
+
+        Returns
+        -------
+        :obj:`~conkit.core.contactmap.ContactMap`
+           A view of the :obj:`~conkit.core.contactmap.ContactMap` with the selected contacts
+
+        Raises
+        ------
+        :exc:`ValueError`
+           ``k`` is negative
+        :exc:`ValueError`
+           ``key`` not in :obj:`~conkit.core.contactmap.ContactMap`
+
+        """
+        if k < 0:
+            raise ValueError("k must be positive!")
+        child_list = self.child_list
+        if any(not hasattr(c, key) for c in child_list):
+            raise ValueError('Attribute not defined')
+        if min_separation is None:
+            candidates = np.arange(len(child_list))
+        else:
+            candidates = np.flatnonzero(self._get_separation() >= min_separation)
+        scores = np.array([getattr(child_list[i], key) for i in candidates], dtype=np.float64)
+        indexes = candidates[ContactMap._select_top(scores, k)]
+        return self._view([child_list[i] for i in indexes])
+
+    @classmethod
+    def from_dense(cls, id, mat, min_separation=None, top_k=None):
+        """Create a new :obj:`~conkit.core.contactmap.ContactMap` from the upper triangle of a dense matrix
+
+        Parameters
+        ----------
+        id : str
+           A unique identifier
+        mat : :obj:`numpy.ndarray`
+           A square matrix with the score of contact ``(i, j)`` in row ``i - 1`` and column ``j - 1``
+        min_separation : int, optional
+           The minimum number of residues between contacts [default: None]
+        top_k : int, optional
+           The number of highest scoring contacts to keep [default: None]
+
+        Returns
+        -------
+        :obj:`~conkit.core.contactmap.ContactMap`
+           The contacts ordered by decreasing score
+
+        Raises
+        ------
+        :exc:`ValueError`
+           The matrix is not square
+
+        """
+        mat = np.asarray(mat, dtype=np.float64)
+        if mat.ndim != 2 or mat.shape[0] != mat.shape[1]:
+            raise ValueError("Matrix needs to be square")
+        res1_seq, res2_seq = np.triu_indices(mat.shape[0], k=max(min_separation or 0, 0))
+        return cls._from_pairs(id, res1_seq + 1, res2_seq + 1, mat[res1_seq, res2_seq], top_k)
+
+    @classmethod
+    def from_sparse(cls, id, mat, min_separation=None, top_k=None):
+        """Create a new :obj:`~conkit.core.contactmap.ContactMap` from the upper triangle of a sparse matrix
+
+        Only the stored entries of ``mat`` become contacts.
+
+        Parameters
+        ----------
+        id : str
+           A unique identifier
+        mat : :obj:`scipy.sparse.spmatrix`
+           A square matrix with the score of contact ``(i, j)`` in row ``i - 1`` and column ``j - 1``
+        min_separation : int, optional
+           The minimum number of residues between contacts [default: None]
+        top_k : int, optional
+           The number of highest scoring contacts to keep [default: None]
+
+        Returns
+        -------
+        :obj:`~conkit.core.contactmap.ContactMap`
+           The contacts ordered by decreasing score
+
+        Raises
+        ------
+        :exc:`ValueError`
+           The matrix is not square
+
+        """
+        if mat.shape[0] != mat.shape[1]:
+            raise ValueError("Matrix needs to be square")
+        mat = mat.tocsr()
+        mat.sum_duplicates()
+        mat = mat.tocoo()
+        upper = mat.col - mat.row >= max(min_separation or 0, 0)
+        res1_seq = mat.row[upper].astype(np.int64) + 1
+        res2_seq = mat.col[upper].astype(np.int64) + 1
+        return cls._from_pairs(id, res1_seq, res2_seq, mat.data[upper].astype(np.float64), top_k)
+
+    @classmethod
+    def _from_pairs(cls, id, res1_seq, res2_seq, raw_score, top_k):
+        """Create a new instance from per-contact arrays, keeping the ``top_k`` contacts in decreasing score order"""
+        from conkit.core.contact import Contact
+        if top_k is not None and top_k < 0:
+            raise ValueError("k must be positive!")
+        rows = ContactMap._select_top(raw_score, raw_score.shape[0] if top_k is None else top_k)
+        contact_map = cls(id)
+        for res1, res2, score in zip(res1_seq[rows].tolist(), res2_seq[rows].tolist(), raw_score[rows].tolist()):
+            contact_map.add(Contact(res1, res2, score))
+        return contact_map
+
     @staticmethod
     def _adjust(contact_map, keymap):
         """Adjust res_altseq entries to insertions and deletions"""
         encoder = dict((x.res_seq, x.res_altseq) for x in keymap if isinstance(x, Residue))
-        for contact in contact_map:
-            if contact.res1_seq in encoder:
-                contact.res1_altseq = encoder[contact.res1_seq]
-            if contact.res2_seq in encoder:
-                contact.res2_altseq = encoder[contact.res2_seq]
+        columns = contact_map._get_columns(('res1_seq', 'res2_seq', 'res1_altseq', 'res2_altseq'))
+        for field, res_seq, res_altseq in zip(('res1_altseq', 'res2_altseq'), columns[:2], columns[2:]):
+            unique, inverse = np.unique(res_seq, return_inverse=True)
+            known = np.array([x in encoder for x in unique.tolist()], dtype=bool)
+            encoded = np.array([encoder.get(x, 0) for x in unique.tolist()], dtype=np.int64)
+            contact_map._set_field(field, np.where(known[inverse], encoded[inverse], res_altseq))
         return contact_map
 
     @staticmethod
@@ -972,18 +1288,15 @@ class ContactMap(Entity):
            A list of residue mappings
 
         """
-        contact_map_keymap = collections.OrderedDict()
-        for contact in contact_map:
-            pos1 = Residue(contact.res1_seq, contact.res1_altseq, contact.res1, contact.res1_chain)
-            pos2 = Residue(contact.res2_seq, contact.res2_altseq, contact.res2, contact.res2_chain)
-            if altloc:
-                res1_index, res2_index = contact.res1_altseq, contact.res2_altseq
-            else:
-                res1_index, res2_index = contact.res1_seq, contact.res2_seq
-            contact_map_keymap[res1_index] = pos1
-            contact_map_keymap[res2_index] = pos2
-        contact_map_keymap_sorted = sorted(list(contact_map_keymap.items()), key=lambda x: int(x[0]))
-        return list(zip(*contact_map_keymap_sorted))[1]
+        fields = ('res1_seq', 'res2_seq', 'res1_altseq', 'res2_altseq', 'res1', 'res2', 'res1_chain', 'res2_chain')
+        columns = contact_map._get_columns(fields)
+        # Interleave both residues of each contact so that the last occurrence of a residue is kept
+        res_seq, res_altseq, res_name, res_chain = [np.column_stack(columns[i:i + 2]).ravel() for i in range(0, 8, 2)]
+        index = res_altseq if altloc else res_seq
+        _, last = np.unique(index[::-1], return_index=True)
+        rows = index.shape[0] - 1 - last
+        return tuple(
+            Residue(int(res_seq[i]), int(res_altseq[i]), str(res_name[i]), str(res_chain[i])) for i in rows.tolist())
 
     @staticmethod
     def _find_single(contact_map, index):
@@ -992,6 +1305,17 @@ class ContactMap(Entity):
             if c.id[0] == index or c.id[1] == index:
                 yield c
 
+    @staticmethod
+    def _get_jaccard(keys1, keys2):
+        """The Jaccard index of two sorted arrays of unique contact keys"""
+        if keys1.shape[0] == 0 and keys2.shape[0] == 0:
+            return 1.0
+        elif keys1.shape[0] == 0 or keys2.shape[0] == 0:
+            return 0.0
+        index = np.minimum(np.searchsorted(keys2, keys1), keys2.shape[0] - 1)
+        intersection = np.count_nonzero(keys2[index] == keys1)
+        return float(intersection) / (keys1.shape[0] + keys2.shape[0] - intersection)
+
     @staticmethod
     def _insert_states(sequence, keymap):
         """Create a sequence matching keymap including deletions and insertions"""
@@ -1004,6 +1328,12 @@ class ContactMap(Entity):
                 keymap_.append(next(it))
         return keymap_
 
+    @staticmethod
+    def _key(id):
+        """Pack a contact id into a single integer key"""
+        id1, id2 = id
+        return (np.asarray(id1, dtype=np.int64) << 32) | (np.asarray(id2, dtype=np.int64) & 0xffffffff)
+
     @staticmethod
     def _reindex_by_keymap(keymap):
         """Reindex a key map"""
@@ -1029,3 +1359,18 @@ class ContactMap(Entity):
                     raise ValueError('Should never get here')
 
         return contact_map
+
+    @staticmethod
+    def _select_top(scores, k):
+        """Indexes of the ``k`` highest ``scores`` in descending order, ties in their original order"""
+        n = scores.shape[0]
+        if k == 0 or n == 0:
+            return np.zeros(0, dtype=np.int64)
+        elif k < n:
+            threshold = np.partition(scores, n - k)[n - k]
+            above = np.flatnonzero(scores > threshold)
+            tied = np.flatnonzero(scores == threshold)[:k - above.shape[0]]
+            indexes = np.sort(np.concatenate((above, tied)))
+        else:
+            indexes = np.arange(n)
+        return indexes[np.argsort(-scores[indexes], kind='mergesort')]
@@ -40,91 +40,42 @@ __version__ = "1.0"
 
 import copy
 import operator
+import weakref
 
 
-class Entity(object):
-    """Base class for all entities used in this interface.
+class Node(object):
+    """Base class for all nodes in the hierarchy
 
-    It handles the storage of data. It also provides a high-efficiency
-    methods to allow fast lookup and iterations of each entity. It also
-    provides a hierarchical structure to remember parent and child
-    entities.
-
-    Warning
-    -------
-    It is strongly advised against the use of the :obj:`~conkit.core.entity.Entity` class directly.
-    Instead, use one or more of the the remaining data models.
+    A :obj:`~conkit.core.entity.Node` has an identifier and a reference to its parent,
+    but no children. It is used directly for leaves of the hierarchy, such as
+    :obj:`~conkit.core.contact.Contact` and :obj:`~conkit.core.sequence.Sequence`,
+    which do not need to pay for empty child containers.
 
     Attributes
     ----------
     id : str, list, tuple
-       The ID of the selected entity
+       The ID of the selected node
     full_id : tuple
        A traceback id including all parent classes
     parent : :obj:`~conkit.core.entity.Entity`
        An attribute to store the reference to the parent :obj:`~conkit.core.entity.Entity`
-    child_list : list
-       A list storing the child entities
-    child_dict : dict
-       A dictionary storing the child entities
 
     """
-    __slots__ = ['parent', '_id', 'child_list', 'child_dict']
+    __slots__ = ['parent', '_id', '__weakref__']
 
     def __init__(self, id):
-        """Initialise a generic :obj:`~conkit.core.entity.Entity`
+        """Initialise a generic :obj:`~conkit.core.entity.Node`
 
         Parameters
         ----------
         id : str, list, tuple
-           The ID of the selected entity
+           The ID of the selected node
 
         """
         self._id = None
         self.parent = None
-        self.child_list = []
-        self.child_dict = {}
         self.id = id
 
-    def __contains__(self, id):
-        """True if there is a child element with the given id"""
-        return id in self.child_dict
-
-    def __delitem__(self, id):
-        """Remove a child with given id"""
-        child = self[id]
-        child.parent = None
-        self.child_dict.pop(id)
-        self.child_list.remove(child)
-
-    def __getitem__(self, id):
-        """Return the child with the given id"""
-        if isinstance(id, slice):
-            indexes_to_keep = set(range(*id.indices(len(self))))
-            copy_to_return = self.copy()
-            for i, child in enumerate(self):
-                if i not in indexes_to_keep:
-                    copy_to_return.remove(child.id)
-            return copy_to_return
-        elif isinstance(id, int):
-            return self.child_list[id]
-        else:
-            return self.child_dict[id]
-
-    def __iter__(self):
-        """Iterate over children"""
-        for child in self.child_list:
-            yield child
-
-    def __len__(self):
-        """Return the number of children"""
-        return len(self.child_list)
-
-    def __reversed__(self):
-        """Reversed list of the children"""
-        for child in reversed(self.child_list):
-            yield child
-
     @property
     def full_id(self):
         """A traceback id including all parent classes
@@ -150,17 +101,17 @@ class Entity(object):
 
     @property
     def id(self):
-        """The ID of the selected entity"""
+        """The ID of the selected node"""
         return self._id
 
     @id.setter
     def id(self, id):
-        """Set the ID of the selected entity
+        """Set the ID of the selected node
 
         Parameters
         ----------
         id : str, list, tuple
-           The unique ID for an :obj:`~conkit.core.entity.Entity`
+           The unique ID for a :obj:`~conkit.core.entity.Node`
 
         Warning
         -------
@@ -177,6 +128,170 @@ class Entity(object):
         elif isinstance(id, list):
             id = tuple(id)
         self._id = id
+        self._changed()
+
+    def _inplace(self, inplace):
+        """Modify the current version using a copy
+
+        Parameters
+        ----------
+        inplace : bool
+
+        """
+        if inplace:
+            return self
+        else:
+            return self.deepcopy()
+
+    def copy(self):
+        """Create a shallow copy of :obj:`~conkit.core.entity.Node`"""
+        shallow = copy.copy(self)
+        shallow.parent = None
+        return shallow
+
+    def deepcopy(self):
+        """Create a deep copy of :obj:`~conkit.core.entity.Node`"""
+        deep = copy.deepcopy(self, {id(self.parent): None})
+        deep.parent = None
+        return deep
+
+    def _changed(self, **previous):
+        """Notify the parent that this :obj:`~conkit.core.entity.Node` has changed
+
+        Parameters
+        ----------
+        **previous
+           The values of the changed attributes before the change, if the parent needs them
+
+        """
+        parent = getattr(self, 'parent', None)
+        if parent is not None:
+            parent._child_changed(self, **previous)
+
+    @staticmethod
+    def listify(s):
+        """Convert unknown input to a list
+
+        Parameters
+        ----------
+        s : str, int, float, list, tuple
+
+        Returns
+        -------
+        list
+           The input as list
+
+        """
+        if isinstance(s, list):
+            return s
+        elif isinstance(s, tuple):
+            return list(s)
+        else:
+            return [s]
+
+
+class Entity(Node):
+    """Base class for all entities used in this interface.
+
+    It handles the storage of data. It also provides a high-efficiency
+    methods to allow fast lookup and iterations of each entity. It also
+    provides a hierarchical structure to remember parent and child
+    entities.
+
+    Warning
+    -------
+    It is strongly advised against the use of the :obj:`~conkit.core.entity.Entity` class directly.
+    Instead, use one or more of the the remaining data models.
+
+    Attributes
+    ----------
+    id : str, list, tuple
+       The ID of the selected entity
+    full_id : tuple
+       A traceback id including all parent classes
+    parent : :obj:`~conkit.core.entity.Entity`
+       An attribute to store the reference to the parent :obj:`~conkit.core.entity.Entity`
+    child_list : list
+       A list storing the child entities
+    child_dict : dict
+       A dictionary storing the child entities
+
+    Note
+    ----
+    Slicing an :obj:`~conkit.core.entity.Entity` returns a view, which shares its children
+    with the original :obj:`~conkit.core.entity.Entity`. Attribute edits of a shared child
+    are seen through both. As soon as the view or the original is modified with a method,
+    i.e. a child is added or removed, or children are sorted or modified in place, the view
+    receives its own copies of the children. The original keeps its children.
+
+    """
+    __slots__ = ['child_list', 'child_dict', '_shared', '_views']
+
+    def __init__(self, id):
+        """Initialise a generic :obj:`~conkit.core.entity.Entity`
+
+        Parameters
+        ----------
+        id : str, list, tuple
+           The ID of the selected entity
+
+        """
+        self.child_list = []
+        self.child_dict = {}
+        self._shared = False
+        self._views = None
+        super(Entity, self).__init__(id)
+
+    def __contains__(self, id):
+        """True if there is a child element with the given id"""
+        return id in self.child_dict
+
+    def __delitem__(self, id):
+        """Remove a child with given id"""
+        self._unshare()
+        child = self[id]
+        if child.parent is self:
+            child.parent = None
+        self.child_dict.pop(id)
+        self.child_list.remove(child)
+        self._invalidate()
+
+    def __getitem__(self, id):
+        """Return the child with the given id"""
+        if isinstance(id, slice):
+            return self._view(self.child_list[id])
+        elif isinstance(id, int):
+            return self.child_list[id]
+        else:
+            return self.child_dict[id]
+
+    def __getstate__(self):
+        # The views are only tracked by the original, not by its copies
+        state = {}
+        for cls in self.__class__.__mro__:
+            for slot in getattr(cls, '__slots__', []):
+                if slot not in ('__weakref__', '_views') and hasattr(self, slot):
+                    state[slot] = getattr(self, slot)
+        return state
+
+    def __iter__(self):
+        """Iterate over children"""
+        for child in self.child_list:
+            yield child
+
+    def __len__(self):
+        """Return the number of children"""
+        return len(self.child_list)
+
+    def __reversed__(self):
+        """Reversed list of the children"""
+        for child in reversed(self.child_list):
+            yield child
+
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            setattr(self, slot, value)
+        self._views = None
 
     @property
     def top(self):
@@ -195,6 +310,7 @@ class Entity(object):
 
         """
         if inplace:
+            self._unshare()
             return self
         else:
             return self.deepcopy()
@@ -204,6 +320,7 @@ class Entity(object):
         if any(not hasattr(e, kword) for e in self.child_list):
             raise ValueError('Attribute not defined')
         self.child_list.sort(key=operator.attrgetter(kword), reverse=reverse)
+        self._invalidate()
 
     def add(self, entity):
         """Add a child to the :obj:`~conkit.core.entity.Entity`
@@ -213,19 +330,19 @@ class Entity(object):
         entity : :obj:`~conkit.core.entity.Entity`
 
         """
+        self._unshare()
         if entity.id in self:
             raise ValueError("%s defined twice" % str(entity.id))
         entity.parent = self
         self.child_list.append(entity)
         self.child_dict[entity.id] = entity
+        self._invalidate()
 
     def copy(self):
         """Create a shallow copy of :obj:`~conkit.core.entity.Entity`"""
         shallow = copy.copy(self)
-
-        shallow.child_list = []
-        shallow.child_dict = {}
         shallow.parent = None
+        shallow._clear()
 
         for child in self:
             shallow.add(child.copy())
@@ -233,16 +350,75 @@ class Entity(object):
 
     def deepcopy(self):
         """Create a deep copy of :obj:`~conkit.core.entity.Entity`"""
-        deep = copy.deepcopy(self)
-
-        deep.child_list = []
-        deep.child_dict = {}
+        # Children are copied below, the parent is not part of the copy
+        memo = {id(self.parent): None, id(self.child_list): [], id(self.child_dict): {}}
+        deep = copy.deepcopy(self, memo)
         deep.parent = None
+        deep._clear()
 
         for child in self:
             deep.add(child.copy())
         return deep
 
+    def drop(self, ids):
+        """Remove all children with an id in ``ids``
+
+        Parameters
+        ----------
+        ids : list, tuple, set
+           The ids of the children to remove
+
+        Raises
+        ------
+        :exc:`KeyError`
+           One or more ids are not defined
+
+        See Also
+        --------
+        keep, remove
+
+        """
+        ids = set(tuple(id) if isinstance(id, list) else id for id in ids)
+        missing = [id for id in ids if id not in self]
+        if missing:
+            raise KeyError(missing[0])
+        self.keep([child.id not in ids for child in self.child_list])
+
+    def keep(self, mask):
+        """Keep only the children flagged in ``mask``
+
+        The :attr:`~conkit.core.entity.Entity.child_list` and
+        :attr:`~conkit.core.entity.Entity.child_dict` are rebuilt in a single pass,
+        which is much faster than removing children one by one.
+
+        Parameters
+        ----------
+        mask : list, tuple, :obj:`~numpy.ndarray`
+           A boolean flag for each child in the order of the :attr:`~conkit.core.entity.Entity.child_list`
+
+        Raises
+        ------
+        :exc:`ValueError`
+           The mask does not have one flag per child
+
+        See Also
+        --------
+        drop, remove
+
+        """
+        if len(mask) != len(self.child_list):
+            raise ValueError("Mask length does not match the number of children")
+        self._unshare()
+        child_list = []
+        for child, flag in zip(self.child_list, mask):
+            if flag:
+                child_list.append(child)
+            elif child.parent is self:
+                child.parent = None
+        self.child_list = child_list
+        self.child_dict = dict((child.id, child) for child in child_list)
+        self._invalidate()
+
     def remove(self, id):
         """Remove a child
 
@@ -259,23 +435,58 @@ class Entity(object):
         """
         del self[id]
 
-    @staticmethod
-    def listify(s):
-        """Convert unknown input to a list
+    def _child_changed(self, child, **previous):
+        """Called by a child whenever it has changed"""
+        self._invalidate()
 
-        Parameters
-        ----------
-        s : str, int, float, list, tuple
-
-        Returns
-        -------
-        list
-           The input as list
+    def _clear(self):
+        """Empty the child containers without detaching the children"""
+        self.child_list = []
+        self.child_dict = {}
+        self._shared = False
+        self._views = None
+        self._invalidate()
+
+    def _invalidate(self):
+        """Discard data derived from the children, called whenever they change"""
+        pass
+
+    def _release_views(self):
+        """Give the views taken from the :obj:`~conkit.core.entity.Entity` their own copies of the children"""
+        if self._views:
+            views = list(self._views)
+            self._views = None
+            for view in views:
+                view._unshare()
+
+    def _track_view(self, view):
+        """Remember a view sharing the children of the :obj:`~conkit.core.entity.Entity`"""
+        if self._views is None:
+            self._views = weakref.WeakSet()
+        self._views.add(view)
+
+    def _unshare(self):
+        """Prepare the :obj:`~conkit.core.entity.Entity` for a modification of its children
+
+        The views taken from the :obj:`~conkit.core.entity.Entity` receive their own copies of
+        the children first. A view replaces the children it shares with the original by copies.
 
         """
-        if isinstance(s, list):
-            return s
-        elif isinstance(s, tuple):
-            return list(s)
-        else:
-            return [s]
+        self._release_views()
+        if self._shared:
+            children = self.child_list
+            self._clear()
+            for child in children:
+                self.add(child.copy())
+
+    def _view(self, children):
+        """Create a view of the :obj:`~conkit.core.entity.Entity` sharing ``children``"""
+        view = copy.copy(self)
+        view.parent = None
+        view._clear()
+        view.child_list = list(children)
+        view.child_dict = dict((child.id, child) for child in view.child_list)
+        view._shared = True
+        view._invalidate()
+        self._track_view(view)
+        return view
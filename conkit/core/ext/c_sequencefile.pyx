@@ -1,48 +1,138 @@
 #cython: boundscheck=False, cdivision=True, wraparound=False
 
 cimport cython
+import multiprocessing
 import numpy as np
 cimport numpy as np
+import os
 
-from cython.parallel import prange
+from cython.parallel import prange, threadid
 
 np.import_array()
 
 
-def c_get_frequency(np.ndarray[np.int64_t, ndim=2] X, Py_ssize_t symbol, np.ndarray[np.int64_t, ndim=1] frequencies):
-    cdef Py_ssize_t i, j
-    for j in prange(X.shape[1], nogil=True): 
+cdef Py_ssize_t TILE = 64
+cdef Py_ssize_t BLOCK = 256
+
+
+cdef inline Py_ssize_t c_mismatches(const np.uint64_t* a, const np.uint64_t* b, Py_ssize_t nwords, Py_ssize_t limit) nogil:
+    """Count the mismatching bytes of two packed rows, stopping as soon as ``limit`` is reached"""
+    cdef Py_ssize_t k, dist = 0
+    cdef np.uint64_t x
+    for k in xrange(nwords):
+        x = a[k] ^ b[k]
+        # Set the high bit of every non-zero byte and sum those bits into the top byte
+        x = (((x & 0x7F7F7F7F7F7F7F7FULL) + 0x7F7F7F7F7F7F7F7FULL) | x) & 0x8080808080808080ULL
+        dist += <Py_ssize_t> (((x >> 7) * 0x0101010101010101ULL) >> 56)
+        if dist >= limit:
+            break
+    return dist
+
+
+def c_num_threads():
+    """The number of threads for the kernels, honouring ``OMP_NUM_THREADS`` if set"""
+    try:
+        return max(int(os.environ['OMP_NUM_THREADS']), 1)
+    except (KeyError, ValueError):
+        return multiprocessing.cpu_count()
+
+
+def c_pack(X):
+    """Pack the rows of an ASCII matrix into zero-padded 64-bit words, eight columns per word"""
+    nwords = max(-(-X.shape[1] // 8), 1)
+    packed = np.zeros((X.shape[0], nwords * 8), dtype=np.uint8)
+    packed[:, :X.shape[1]] = X
+    return packed.view(np.uint64)
+
+
+def c_get_neighbors(const np.uint64_t[:, ::1] X, const np.int64_t[::1] multiplicity, Py_ssize_t limit,
+                    np.int64_t[:, ::1] counts):
+    cdef Py_ssize_t ti, tj, i, j, tid, ntiles
+    cdef int nthreads = counts.shape[0]
+    ntiles = (X.shape[0] + TILE - 1) // TILE
+    for ti in prange(ntiles, nogil=True, schedule='dynamic', num_threads=nthreads):
+        tid = threadid()
+        for tj in xrange(ti, ntiles):
+            for i in xrange(ti * TILE, min((ti + 1) * TILE, X.shape[0])):
+                for j in xrange(max(i + 1, tj * TILE), min((tj + 1) * TILE, X.shape[0])):
+                    if c_mismatches(&X[i, 0], &X[j, 0], X.shape[1], limit) < limit:
+                        counts[tid, i] += multiplicity[j]
+                        counts[tid, j] += multiplicity[i]
+
+
+def c_get_cross_neighbors(const np.uint64_t[:, ::1] X, const np.uint64_t[:, ::1] Y,
+                          const np.int64_t[::1] multiplicity_x, const np.int64_t[::1] multiplicity_y,
+                          Py_ssize_t limit, np.int64_t[:, ::1] counts_x, np.int64_t[:, ::1] counts_y):
+    cdef Py_ssize_t ti, tj, i, j, tid, ntiles_x, ntiles_y
+    cdef int nthreads = counts_x.shape[0]
+    ntiles_x = (X.shape[0] + TILE - 1) // TILE
+    ntiles_y = (Y.shape[0] + TILE - 1) // TILE
+    for ti in prange(ntiles_x, nogil=True, schedule='dynamic', num_threads=nthreads):
+        tid = threadid()
+        for tj in xrange(ntiles_y):
+            for i in xrange(ti * TILE, min((ti + 1) * TILE, X.shape[0])):
+                for j in xrange(tj * TILE, min((tj + 1) * TILE, Y.shape[0])):
+                    if c_mismatches(&X[i, 0], &Y[j, 0], X.shape[1], limit) < limit:
+                        counts_x[tid, i] += multiplicity_y[j]
+                        counts_y[tid, j] += multiplicity_x[i]
+
+
+def c_get_profile(const np.uint8_t[:, :] X, const double[::1] weights, double[:, ::1] profile):
+    cdef Py_ssize_t block, i, j
+    for block in prange((X.shape[1] + TILE - 1) // TILE, nogil=True):
         for i in xrange(X.shape[0]):
-            frequencies[j] += X[i, j] == symbol
+            for j in xrange(block * TILE, min((block + 1) * TILE, X.shape[1])):
+                profile[X[i, j] - 1, j] += weights[i]
 
 
-def c_get_weights(np.ndarray[np.int64_t, ndim=2] X, double identity, np.ndarray[double, ndim=1] hamming):
-    cdef Py_ssize_t i, j, k
-    cdef double threshold, dist
-    threshold = (1.0 - identity) * X.shape[1]
-    for i in prange(X.shape[0], nogil=True):
-        for j in xrange(X.shape[0]):
-            dist = 0.0
-            for k in xrange(X.shape[1]):
-                dist += X[i, k] != X[j, k]
-            hamming[i] += dist < threshold
-        hamming[i] = 1.0 / hamming[i]
+def c_get_pair_frequencies(const np.uint8_t[:, ::1] E, Py_ssize_t i0, Py_ssize_t j0, const double[::1] weights,
+                           double[:, :, :, ::1] pairs):
+    cdef Py_ssize_t i, j, n
+    for i in prange(pairs.shape[0], nogil=True, schedule='dynamic'):
+        for j in xrange(i + 1 if i0 == j0 else 0, pairs.shape[1]):
+            for n in xrange(E.shape[1]):
+                pairs[i, j, E[i0 + i, n], E[j0 + j, n]] += weights[n]
 
 
-def c_filter(np.ndarray[np.int64_t, ndim=2] X, double min_id, double max_id, np.ndarray[np.uint8_t, ndim=1, cast=True] throwables):
-    cdef Py_ssize_t i, j, k
-    cdef double dist
-    for i in xrange(X.shape[0]):
-        for j in xrange(i + 1, X.shape[0]):
-            if not throwables[j]:
-                dist = 0
-                for k in xrange(X.shape[1]):
-                    dist += X[i, k] != X[j, k]
-                ident = 1.0 - dist / X.shape[1]
-                throwables[j] = (ident < min_id) or (ident > max_id)
+def c_filter(const np.uint64_t[:, ::1] X, Py_ssize_t dlo, Py_ssize_t dhi, Py_ssize_t limit, np.uint8_t[::1] throwables,
+             int nthreads):
+    cdef Py_ssize_t block, start, stop, j, r, a, b, d, nreps = 0, nsurvivors
+    cdef np.intp_t[::1] reps = np.empty(X.shape[0], dtype=np.intp)
+    cdef np.intp_t[::1] survivors = np.empty(BLOCK, dtype=np.intp)
+    cdef np.uint8_t[:, ::1] conflicts = np.zeros((BLOCK, BLOCK), dtype=np.uint8)
+    with nogil:
+        for block in xrange((X.shape[0] + BLOCK - 1) // BLOCK):
+            start = block * BLOCK
+            stop = min(start + BLOCK, X.shape[0])
+            # Compare the block against all representatives kept so far
+            for j in prange(start, stop, schedule='dynamic', num_threads=nthreads):
+                for r in xrange(nreps):
+                    d = c_mismatches(&X[j, 0], &X[reps[r], 0], X.shape[1], limit)
+                    if d < dlo or d > dhi:
+                        throwables[j] = True
+                        break
+            nsurvivors = 0
+            for j in xrange(start, stop):
+                if not throwables[j]:
+                    survivors[nsurvivors] = j
+                    nsurvivors = nsurvivors + 1
+            # Compare the survivors among each other, then admit them in order
+            for a in prange(nsurvivors, schedule='dynamic', num_threads=nthreads):
+                for b in xrange(a):
+                    d = c_mismatches(&X[survivors[a], 0], &X[survivors[b], 0], X.shape[1], limit)
+                    conflicts[a, b] = d < dlo or d > dhi
+            for a in xrange(nsurvivors):
+                j = survivors[a]
+                for b in xrange(a):
+                    if conflicts[a, b] and not throwables[survivors[b]]:
+                        throwables[j] = True
+                        break
+                if not throwables[j]:
+                    reps[nreps] = j
+                    nreps = nreps + 1
 
 
-def c_filter_symbol(np.ndarray[np.int64_t, ndim=2] X, double min_prop, double max_prop, Py_ssize_t symbol, np.ndarray[np.uint8_t, ndim=1, cast=True] throwables):
+def c_filter_symbol(const np.uint8_t[:, :] X, double min_prop, double max_prop, Py_ssize_t symbol, np.ndarray[np.uint8_t, ndim=1, cast=True] throwables):
     cdef Py_ssize_t i, k
     cdef double prop
     for i in xrange(X.shape[0]):
@@ -1,5 +1,8 @@
 from enum import Enum, unique
 
+import numpy as np
+import string
+
 
 class AminoAcidMapping(Enum):
     """Amino acid mapping to encode an alignment"""
@@ -105,3 +108,12 @@ class SequenceAlignmentState(Enum):
     unknown = 0
     unaligned = 1
     aligned = 2
+
+
+# Lookup tables for the table-driven validation and encoding of sequences
+AMINO_ACID_CHARACTERS = bytes(bytearray(''.join(aa.name + aa.name.lower() for aa in AminoAcidOneToThree) + '-', 'ascii'))
+INSERT_CHARACTERS = bytes(bytearray(string.ascii_lowercase, 'ascii'))
+AMINO_ACID_ENCODING = np.full(256, AminoAcidMapping.X.value, dtype=np.uint8)
+AMINO_ACID_ENCODING[[ord(aa.name) for aa in AminoAcidMapping]] = [aa.value for aa in AminoAcidMapping]
+AMINO_ACID_DECODING = np.full(len(AminoAcidMapping) + 1, AminoAcidMapping.X.name, dtype='S1')
+AMINO_ACID_DECODING[[aa.value for aa in AminoAcidMapping]] = [aa.name for aa in AminoAcidMapping]
@@ -0,0 +1,218 @@
+# coding=utf-8
+#
+# BSD 3-Clause License
+#
+# Copyright (c) 2016-18, University of Liverpool
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Matcher to compare many contact maps against a single reference"""
+
+from __future__ import division
+
+__author__ = "Felix Simkovic"
+__date__ = "18 Oct 2018"
+__version__ = "1.0"
+
+import numpy as np
+
+from conkit.core.contactmap import ContactMap
+from conkit.core.mappings import ContactMatchState
+from conkit.core.sequence import Sequence
+from conkit.core.struct import Gap, Residue
+
+
+class Matcher(object):
+    """Match any number of :obj:`~conkit.core.contactmap.ContactMap` instances against one reference
+
+    The residue keymap of the reference is computed once and the sequence alignments are kept
+    by the :obj:`~conkit.core.aligner.Aligner`, so that matching many predictions sharing a sequence,
+    e.g. all models of a single target, is left with only the per-contact cost of
+    :meth:`~conkit.core.contactmap.ContactMap.match`.
+
+    Examples
+    --------
+    >>> from conkit.core.matcher import Matcher
+    >>> matcher = Matcher(reference)
+    >>> matched = [matcher.match(prediction) for prediction in predictions]
+
+    Notes
+    -----
+    The reference must not be modified while the :obj:`~conkit.core.matcher.Matcher` is in use.
+
+    """
+
+    def __init__(self, reference, aligner=None):
+        """Instantiate a new :obj:`~conkit.core.matcher.Matcher` object
+
+        Parameters
+        ----------
+        reference : :obj:`~conkit.core.contactmap.ContactMap`
+           The reference :obj:`~conkit.core.contactmap.ContactMap`, typically derived from a structure
+        aligner : :obj:`~conkit.core.aligner.Aligner`, optional
+           The aligner to use [default: :attr:`Sequence.aligner <conkit.core.sequence.Sequence.aligner>`]
+
+        """
+        self._reference = reference
+        self._keymap = tuple((r.res_seq, r.res_altseq, r.res_name, r.res_chain)
+                             for r in ContactMap._create_keymap(reference, altloc=True))
+        self._repr_sequence = reference.repr_sequence_altloc.seq
+        self._keys = reference._get_keys()
+        self._aligner = Sequence.aligner if aligner is None else aligner
+
+    def __repr__(self):
+        return '{}(reference="{}")'.format(self.__class__.__name__, self._reference.id)
+
+    @property
+    def reference(self):
+        """The reference :obj:`~conkit.core.contactmap.ContactMap`"""
+        return self._reference
+
+    def match(self, contact_map, add_false_negatives=False, remove_unmatched=False, renumber=False, inplace=False):
+        """Match a :obj:`~conkit.core.contactmap.ContactMap` against the reference
+
+        Parameters
+        ----------
+        contact_map : :obj:`~conkit.core.contactmap.ContactMap`
+           A ConKit :obj:`~conkit.core.contactmap.ContactMap`
+        add_false_negatives : bool, optional
+           Add false negatives, which are contacts in the reference but not in ``contact_map`` [default: False]
+        remove_unmatched : bool, optional
+           Remove all unmatched contacts [default: False]
+        renumber : bool, optional
+           Renumber the :attr:`~conkit.core.contact.Contact.res_seq` entries [default: False]
+        inplace : bool, optional
+           Replace the saved order of contacts [default: False]
+
+        Returns
+        -------
+        :obj:`~conkit.core.contactmap.ContactMap`
+            :obj:`~conkit.core.contactmap.ContactMap` instance, regardless of inplace
+
+        Raises
+        ------
+        :exc:`ValueError`
+           Error creating reliable keymap matching the sequence in :obj:`~conkit.core.contactmap.ContactMap`
+
+        See Also
+        --------
+        :meth:`~conkit.core.contactmap.ContactMap.match`
+
+        """
+        contact_map = contact_map._inplace(inplace)
+        # Only the false negatives need the reference adjusted to the alignment, which must not leak
+        other = self._reference.deepcopy() if add_false_negatives else None
+        return self._match(contact_map, other, add_false_negatives, remove_unmatched, renumber)
+
+    def _align(self, seq1, seq2, gap_open_pen, gap_ext_pen):
+        """Align two sequences locally"""
+        return self._aligner.align(seq1, seq2, mode='local', id_chars=2, nonid_chars=1, gap_open_pen=gap_open_pen,
+                                   gap_ext_pen=gap_ext_pen)
+
+    def _match(self, contact_map1, contact_map2, add_false_negatives, remove_unmatched, renumber):
+        """Match ``contact_map1`` against the reference, adjusting ``contact_map2`` if it is not :obj:`None`"""
+
+        # ================================================================
+        # 1. Align all sequences
+        # ================================================================
+
+        sequences = (contact_map1.sequence.seq, self._reference.sequence.seq)
+        full_sequence1, full_sequence2 = self._align(sequences[0], sequences[1], -0.5, -0.1)
+        _, repr_sequence1 = self._align(full_sequence1, contact_map1.repr_sequence.seq, -0.5, -0.2)
+        full_sequence2, repr_sequence2 = self._align(full_sequence2, self._repr_sequence, -0.5, -0.2)
+        repr_sequence1, repr_sequence2 = self._align(repr_sequence1, repr_sequence2, -1.0, -0.5)
+
+        # ================================================================
+        # 2. Identify TPs in other, map them, and match them to self
+        # ================================================================
+
+        encoded_repr = np.asarray([bytearray(repr_sequence1, 'ascii'), bytearray(repr_sequence2, 'ascii')])
+
+        contact_map1_keymap = ContactMap._create_keymap(contact_map1)
+        contact_map2_keymap = [Residue(*residue) for residue in self._keymap]
+
+        msg = "Error creating reliable keymap matching the sequence in ContactMap: "
+        if len(contact_map1_keymap) != (encoded_repr[0] != ord('-')).sum():
+            raise ValueError(msg + contact_map1.id)
+        elif len(contact_map2_keymap) != (encoded_repr[1] != ord('-')).sum():
+            raise ValueError(msg + self._reference.id)
+
+        contact_map1_keymap = ContactMap._insert_states(encoded_repr[0], contact_map1_keymap)
+        contact_map2_keymap = ContactMap._insert_states(encoded_repr[1], contact_map2_keymap)
+
+        contact_map1_keymap = ContactMap._reindex_by_keymap(contact_map1_keymap)
+        contact_map2_keymap = ContactMap._reindex_by_keymap(contact_map2_keymap)
+
+        if contact_map2 is not None:
+            contact_map2 = ContactMap._adjust(contact_map2, contact_map2_keymap)
+
+        residues_map2 = np.flatnonzero(np.asarray(bytearray(full_sequence2, 'ascii')) != ord('-')) + 1
+
+        # Look up the residue numbers in other by position in the keymap, which starts at 1
+        res_seq_map2 = np.array([Gap.IDENTIFIER] + [r.res_seq for r in contact_map2_keymap], dtype=np.int64)
+        res1_seq, res2_seq, _ = contact_map1._get_field('res1_seq')
+        mapped1 = (res1_seq >= 1) & (res1_seq < res_seq_map2.shape[0])
+        mapped2 = (res2_seq >= 1) & (res2_seq < res_seq_map2.shape[0])
+        res1_alt = np.where(mapped1, res_seq_map2[np.where(mapped1, res1_seq, 0)], 0)
+        res2_alt = np.where(mapped2, res_seq_map2[np.where(mapped2, res2_seq, 0)], 0)
+
+        gapped = (mapped1 & (res1_alt == Gap.IDENTIFIER)) | (mapped2 & (res2_alt == Gap.IDENTIFIER))
+        aligned = np.in1d(res1_seq, residues_map2) & np.in1d(res2_seq, residues_map2)
+        unknown = gapped & ~aligned
+        if np.any(~unknown & ~aligned):
+            raise RuntimeError("Error matching two contact maps - this should never happen")
+
+        # The mapped pair is ordered by position, which swaps contacts with res1_seq > res2_seq
+        swapped = res1_seq > res2_seq
+        keys = ContactMap._key((np.where(swapped, res2_alt, res1_alt), np.where(swapped, res1_alt, res2_alt)))
+        matched = mapped1 & mapped2 & np.in1d(keys, self._keys)
+        status = np.where(matched, ContactMatchState.true_positive.value, ContactMatchState.false_positive.value)
+        contact_map1._set_field('status', np.where(unknown, ContactMatchState.unknown.value, status))
+
+        # ================================================================
+        # 3. Add false negatives
+        # ================================================================
+        if add_false_negatives:
+            missing = ~np.in1d(self._keys, contact_map1._get_keys())
+            for contact in [c for c, flag in zip(contact_map2, missing) if flag]:
+                contact = contact.copy()
+                contact.false_negative = True
+                contact_map1.add(contact)
+            unknown = np.concatenate((unknown, np.zeros(missing.sum(), dtype=bool)))
+
+        # ================================================================
+        # 4. Remove unmatched contacts
+        # ================================================================
+        if remove_unmatched:
+            contact_map1.keep(~unknown)
+
+        # ================================================================
+        # 5. Renumber the contact map 1 based on contact map 2
+        # ================================================================
+        if renumber:
+            contact_map1 = ContactMap._renumber(contact_map1, contact_map1_keymap, contact_map2_keymap)
+
+        return contact_map1
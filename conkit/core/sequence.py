@@ -38,12 +38,14 @@ __author__ = "Felix Simkovic"
 __date__ = "03 Aug 2016"
 __version__ = "1.0"
 
-from Bio import pairwise2
-from conkit.core.entity import Entity
-from conkit.core.mappings import AminoAcidMapping, AminoAcidOneToThree
+import numpy as np
 
+from conkit.core.aligner import Aligner
+from conkit.core.entity import Node
+from conkit.core.mappings import AMINO_ACID_CHARACTERS, AMINO_ACID_ENCODING
 
-class Sequence(Entity):
+
+class Sequence(Node):
     """A sequence template to store all associated information
 
     Examples
@@ -55,8 +57,12 @@ class Sequence(Entity):
 
     Attributes
     ----------
+    aligner : :obj:`~conkit.core.aligner.Aligner`
+       The aligner shared by all :obj:`~conkit.core.sequence.Sequence` instances
     id : str
        A unique identifier
+    multiplicity : int
+       The number of identical sequences represented by this :obj:`~conkit.core.sequence.Sequence`
     remark : list
        The :obj:`~conkit.core.sequence.Sequence`-specific remarks
     seq : str
@@ -65,7 +71,8 @@ class Sequence(Entity):
        The protein sequence length
 
     """
-    __slots__ = ['_remark', '_seq']
+    __slots__ = ['_multiplicity', '_remark', '_seq']
+    aligner = Aligner()
 
     def __init__(self, id, seq):
         """Initialise a generic sequence
@@ -78,7 +85,8 @@ class Sequence(Entity):
            The protein sequence
 
         """
-        self._remark = []
+        self._multiplicity = 1
+        self._remark = None
         self._seq = None
         self.seq = seq
         super(Sequence, self).__init__(id)
@@ -100,9 +108,35 @@ class Sequence(Entity):
             seq_string = self.seq
         return '{}(id="{}" seq="{}" seq_len={})'.format(self.__class__.__name__, self.id, seq_string, self.seq_len)
 
+    @property
+    def multiplicity(self):
+        """The number of identical sequences represented by this :obj:`~conkit.core.sequence.Sequence`"""
+        return self._multiplicity
+
+    @multiplicity.setter
+    def multiplicity(self, multiplicity):
+        """Set the multiplicity
+
+        Parameters
+        ----------
+        multiplicity : int
+
+        Raises
+        ------
+        :exc:`ValueError`
+           Multiplicity needs to be a positive integer
+
+        """
+        if int(multiplicity) != multiplicity or multiplicity < 1:
+            raise ValueError("Multiplicity needs to be a positive integer")
+        self._multiplicity = int(multiplicity)
+        self._changed()
+
     @property
     def remark(self):
         """The :obj:`~conkit.core.sequence.Sequence`-specific remarks"""
+        if self._remark is None:
+            self._remark = []
         return self._remark
 
     @remark.setter
@@ -115,7 +149,7 @@ class Sequence(Entity):
            The remark will be added to the list of remarks
 
         """
-        self._remark += Entity.listify(remark)
+        self.remark.extend(Node.listify(remark))
 
     @property
     def seq(self):
@@ -132,14 +166,19 @@ class Sequence(Entity):
 
         Raises
         ------
-        :exc:`ValueError`
+        :exc:`KeyError`
            One or more amino acids in the sequence are not recognised
 
         """
-        if all(AminoAcidOneToThree[c].value for c in seq.upper() if c != '-'):
-            self._seq = seq
-        else:
-            raise ValueError('Unrecognized amino acids in sequence')
+        try:
+            unknown = bytearray(seq, 'ascii').translate(None, AMINO_ACID_CHARACTERS)
+        except UnicodeError as e:
+            raise KeyError(seq[e.start].upper())
+        if unknown:
+            raise KeyError(chr(unknown[0]).upper())
+        seq_len = None if self._seq is None else len(self._seq)
+        self._seq = seq
+        self._changed(seq_len=seq_len)
 
     @property
     def seq_ascii(self):
@@ -149,7 +188,7 @@ class Sequence(Entity):
     @property
     def seq_encoded(self):
         """The protein sequence encoded by numbers"""
-        return [getattr(AminoAcidMapping, c, AminoAcidMapping.X).value for c in self.seq]
+        return AMINO_ACID_ENCODING[np.frombuffer(self.seq_ascii, dtype=np.uint8)].tolist()
 
     @property
     def seq_len(self):
@@ -178,10 +217,9 @@ class Sequence(Entity):
         sequence1 = self._inplace(inplace)
         sequence2 = other._inplace(inplace)
 
-        alignment = pairwise2.align.globalms(sequence1.seq, sequence2.seq, id_chars, nonid_chars, gap_open_pen,
-                                             gap_ext_pen)
-        sequence1.seq = alignment[-1][0]
-        sequence2.seq = alignment[-1][1]
+        alignment = self.aligner.align(sequence1.seq, sequence2.seq, mode='global', id_chars=id_chars,
+                                       nonid_chars=nonid_chars, gap_open_pen=gap_open_pen, gap_ext_pen=gap_ext_pen)
+        sequence1.seq, sequence2.seq = alignment
 
         return sequence1, sequence2
 
@@ -207,10 +245,8 @@ class Sequence(Entity):
         sequence1 = self._inplace(inplace)
         sequence2 = other._inplace(inplace)
 
-        alignment = pairwise2.align.localms(sequence1.seq, sequence2.seq, id_chars, nonid_chars, gap_open_pen,
-                                            gap_ext_pen)
-
-        sequence1.seq = alignment[-1][0]
-        sequence2.seq = alignment[-1][1]
+        alignment = self.aligner.align(sequence1.seq, sequence2.seq, mode='local', id_chars=id_chars,
+                                       nonid_chars=nonid_chars, gap_open_pen=gap_open_pen, gap_ext_pen=gap_ext_pen)
+        sequence1.seq, sequence2.seq = alignment
 
         return sequence1, sequence2
@@ -37,14 +37,18 @@ __author__ = "Felix Simkovic"
 __date__ = "03 Aug 2016"
 __version__ = "1.0"
 
+import hashlib
 import numpy as np
+import os
 import sys
 
+from collections import Counter
+
 if sys.version_info.major < 3:
     from itertools import izip as zip
 
 from conkit.core.entity import Entity
-from conkit.core.mappings import AminoAcidMapping, SequenceAlignmentState
+from conkit.core.mappings import AMINO_ACID_DECODING, AMINO_ACID_ENCODING, AminoAcidMapping, SequenceAlignmentState
 from conkit.misc import deprecate
 
 
@@ -57,6 +61,10 @@ class SequenceFile(Entity):
 
     Attributes
     ----------
+    cache_dir : str
+       A directory to store alignment statistics across sessions, falls back to ``$CONKIT_CACHE_DIR`` if unset
+    fingerprint : str
+       A digest of the sequences and their multiplicities
     id : str
        A unique identifier
     is_alignment : bool
@@ -83,7 +91,7 @@ class SequenceFile(Entity):
     SequenceFile(id="example" nseq=2)
 
     """
-    __slots__ = ['_remark', '_status']
+    __slots__ = ['cache_dir', '_remark', '_status', '_matrix', '_lengths', '_memo']
 
     def __init__(self, id):
         """Initialise a new :obj:`~conkit.core.sequencefile.SequenceFile`
@@ -94,8 +102,12 @@ class SequenceFile(Entity):
            A unique identifier for the sequence file
 
         """
+        self.cache_dir = None
         self._remark = []
         self._status = SequenceAlignmentState.unknown
+        self._matrix = None
+        self._lengths = Counter()
+        self._memo = {}
         super(SequenceFile, self).__init__(id)
 
     def __repr__(self):
@@ -104,13 +116,22 @@ class SequenceFile(Entity):
     @property
     def ascii_matrix(self):
         """The alignment encoded in a 2-D ASCII matrix"""
+        if not self.empty and self.is_alignment:
+            return self._get_ascii_matrix().tolist()
         return [list(seq.seq_ascii) for seq in self]
 
     @property
     def encoded_matrix(self):
         """The alignment encoded for contact prediction"""
+        if not self.empty and self.is_alignment:
+            return self._get_encoded_matrix().tolist()
         return [list(seq.seq_encoded) for seq in self]
 
+    @property
+    def fingerprint(self):
+        """A digest of the sequences and their multiplicities"""
+        return self._memoize('fingerprint', self._get_fingerprint, persist=False)
+
     @property
     def is_alignment(self):
         """A boolean status for the alignment
@@ -121,12 +142,13 @@ class SequenceFile(Entity):
            A boolean status for the alignment
 
         """
-        seq_length = self.top_sequence.seq_len
-        self._status = SequenceAlignmentState.aligned
-        for sequence in self:
-            if sequence.seq_len != seq_length:
-                self._status = SequenceAlignmentState.unaligned
-                break
+        if self._shared:
+            # The shared sequences of a view report their edits to the original only
+            return len(set(sequence.seq_len for sequence in self)) == 1
+        if len(self._lengths) == 1:
+            self._status = SequenceAlignmentState.aligned
+        else:
+            self._status = SequenceAlignmentState.unaligned
         return self._status == SequenceAlignmentState.aligned
 
     @property
@@ -223,6 +245,239 @@ class SequenceFile(Entity):
         """
         return self.top
 
+    def __delitem__(self, id):
+        """Remove a :obj:`~conkit.core.sequence.Sequence` with given id"""
+        sequence = self[id]
+        super(SequenceFile, self).__delitem__(id)
+        self._count_lengths(removed=[sequence.seq_len])
+
+    def _child_changed(self, child, seq_len=None, **previous):
+        """Move an edited :obj:`~conkit.core.sequence.Sequence` from its previous ``seq_len`` to its new one"""
+        if seq_len is not None:
+            self._count_lengths(added=[child.seq_len], removed=[seq_len])
+        self._invalidate()
+
+    def _clear(self):
+        """Empty the child containers without detaching the children"""
+        super(SequenceFile, self)._clear()
+        self._lengths = Counter()
+
+    def _count_lengths(self, added=(), removed=()):
+        """Update the counts of the sequence lengths by the ``added`` and ``removed`` sequence lengths"""
+        self._lengths.update(added)
+        self._lengths.subtract(removed)
+        for seq_len in set(removed):
+            if self._lengths[seq_len] <= 0:
+                del self._lengths[seq_len]
+
+    def _compute_profile(self, weighted, identity):
+        """Compute the 21 x L profile of the alignment"""
+        from conkit.core.ext.c_sequencefile import c_get_profile
+        X = self._get_encoded_matrix()
+        if weighted:
+            weights = np.asarray(self.get_weights(identity=identity), dtype=np.float64)
+        else:
+            weights = self._get_multiplicities().astype(np.float64)
+        profile = np.zeros((len(AminoAcidMapping), X.shape[1]), dtype=np.float64)
+        c_get_profile(X, weights, profile)
+        return profile
+
+    def _compute_weights(self, identity):
+        """Compute the exact sequence weights as :obj:`numpy.float64` array"""
+        from conkit.core.ext.c_sequencefile import c_get_neighbors, c_num_threads, c_pack
+        X = self._get_ascii_matrix()
+        # Pairs with fewer mismatches than the limit are neighbors, including each sequence with itself
+        limit = max(int(np.ceil((1.0 - identity) * X.shape[1])), 0)
+        multiplicity = self._get_multiplicities()
+        counts = np.zeros((c_num_threads(), X.shape[0]), dtype=np.int64)
+        c_get_neighbors(c_pack(X), multiplicity, limit, counts)
+        with np.errstate(divide='ignore'):
+            return multiplicity / (counts.sum(axis=0) + multiplicity * (limit > 0))
+
+    @staticmethod
+    def _find_near_duplicates(X, identity, seed, nbands):
+        """Map each row of an ASCII matrix to the first earlier representative with at least ``identity``
+
+        Every band hashes the rows on a random sample of columns, chosen such that two rows with the
+        minimum identity agree on all of them with a probability of at least one half. Rows sharing a
+        bucket in any band are compared exactly.
+
+        """
+        ncols = X.shape[1]
+        identities = 1.0 - np.arange(ncols + 1) / ncols
+        max_mismatches = np.flatnonzero(identities >= identity)[-1]
+        nsample = int(np.ceil(np.log(0.5) / np.log(identity))) if identity > 0 else 1
+        random_state = np.random.RandomState(seed)
+        bands = [np.ascontiguousarray(X[:, random_state.choice(ncols, min(max(nsample, 1), ncols), replace=False)])
+                 for _ in range(nbands)]
+        buckets = [{} for _ in range(nbands)]
+        representatives = np.arange(X.shape[0])
+        for i in range(X.shape[0]):
+            keys = [band[i].tobytes() for band in bands]
+            candidates = set()
+            for bucket, key in zip(buckets, keys):
+                candidates.update(bucket.get(key, ()))
+            for j in sorted(candidates):
+                if np.count_nonzero(X[i] != X[j]) <= max_mismatches:
+                    representatives[i] = j
+                    break
+            else:
+                for bucket, key in zip(buckets, keys):
+                    bucket.setdefault(key, []).append(i)
+        return representatives
+
+    def _get_ascii_matrix(self):
+        """The alignment as read-only 2-D :obj:`numpy.uint8` ASCII matrix, cached until a sequence changes"""
+        if self._matrix is None or self._shared:
+            if self.empty:
+                matrix = np.zeros((0, 0), dtype=np.uint8)
+            else:
+                matrix = np.frombuffer(bytearray(''.join(s.seq for s in self), 'ascii'), dtype=np.uint8)
+                matrix = matrix.reshape(len(self), self.top.seq_len)
+            matrix.flags.writeable = False
+            if self._shared:
+                return matrix
+            self._matrix = matrix
+        return self._matrix
+
+    def _get_encoded_matrix(self):
+        """The alignment as 2-D :obj:`numpy.uint8` matrix encoded by :obj:`~conkit.core.mappings.AminoAcidMapping`"""
+        return AMINO_ACID_ENCODING[self._get_ascii_matrix()]
+
+    def _get_fingerprint(self):
+        """Compute a SHA-1 digest of the alignment matrix, its shape and the multiplicities"""
+        X = self._get_ascii_matrix() if self.is_alignment else None
+        digest = hashlib.sha1(np.array(X.shape if X is not None else (-1, len(self)), dtype=np.int64).tobytes())
+        if X is not None:
+            digest.update(np.ascontiguousarray(X).tobytes())
+        else:
+            digest.update('\n'.join(s.seq for s in self).encode('ascii'))
+        digest.update(self._get_multiplicities().tobytes())
+        return digest.hexdigest()
+
+    def _get_multiplicities(self):
+        """The multiplicities of the sequences as :obj:`numpy.int64` array"""
+        return np.fromiter((s.multiplicity for s in self), dtype=np.int64, count=len(self))
+
+    def _invalidate(self):
+        """Discard the cached alignment matrix and memoized statistics"""
+        self._matrix = None
+        self._memo = {}
+
+    def _memoize(self, key, compute, persist=True):
+        """Return the result of ``compute`` memoized under ``key`` until a sequence changes
+
+        Results that ``persist`` are additionally stored as ``.npy`` file named by the
+        :attr:`~conkit.core.sequencefile.SequenceFile.fingerprint` in
+        :attr:`~conkit.core.sequencefile.SequenceFile.cache_dir` or ``$CONKIT_CACHE_DIR``, if set,
+        so that they can be looked up by the next session reading the same alignment.
+
+        """
+        if self._shared:
+            return compute()
+        if key in self._memo:
+            return self._memo[key]
+        cache_dir = (self.cache_dir or os.environ.get('CONKIT_CACHE_DIR')) if persist else None
+        f_cache = os.path.join(cache_dir, '{}_{}.npy'.format(self.fingerprint, key)) if cache_dir else None
+        if f_cache and os.path.isfile(f_cache):
+            result = np.load(f_cache)
+        else:
+            result = compute()
+            if f_cache:
+                if not os.path.isdir(cache_dir):
+                    os.makedirs(cache_dir)
+                # Write to a unique file first so that concurrent sessions never read partial results
+                f_tmp = '{}.{}.npy'.format(f_cache[:-4], os.getpid())
+                np.save(f_tmp, result)
+                os.rename(f_tmp, f_cache)
+        if isinstance(result, np.ndarray):
+            result.flags.writeable = False
+        self._memo[key] = result
+        return result
+
+    def _sample_weights(self, identity, rel_error, seed, batch_size=64, min_sample=256):
+        """Estimate the sequence weights from a growing random reference sample
+
+        Every reference sequence is compared to all others, so its weight is exact. `Meff` and its 95%
+        confidence interval are estimated from these exact weights alone. The weights of the remaining
+        sequences are extrapolated from their neighbors in the reference sample and scaled so that all
+        weights add up to the estimated `Meff`.
+
+        Returns
+        -------
+        tuple
+           The weights, the estimated `Meff`, and its lower and upper 95% confidence limits
+
+        """
+        from conkit.core.ext.c_sequencefile import c_get_cross_neighbors, c_num_threads, c_pack
+        X = self._get_ascii_matrix()
+        limit = max(int(np.ceil((1.0 - identity) * X.shape[1])), 0)
+        X = c_pack(X)
+        nseq = X.shape[0]
+        nthreads = c_num_threads()
+        multiplicity = self._get_multiplicities()
+
+        neighbors = np.zeros(nseq, dtype=np.int64)
+        exact = np.zeros(nseq, dtype=np.int64)
+        order = np.random.RandomState(seed).permutation(nseq)
+        for start in range(0, nseq, batch_size):
+            reference = order[start:start + batch_size]
+            counts_x = np.zeros((nthreads, nseq), dtype=np.int64)
+            counts_y = np.zeros((nthreads, reference.shape[0]), dtype=np.int64)
+            c_get_cross_neighbors(X, X[reference], multiplicity, multiplicity[reference], limit, counts_x, counts_y)
+            neighbors += counts_x.sum(axis=0)
+            exact[reference] = counts_y.sum(axis=0)
+
+            nref = start + reference.shape[0]
+            if nref < min_sample or nref == nseq:
+                continue
+            with np.errstate(divide='ignore', invalid='ignore'):
+                sample = multiplicity[order[:nref]] / exact[order[:nref]]
+                meff = nseq * sample.mean()
+                halfwidth = 1.959963984540054 * nseq * sample.std(ddof=1) * np.sqrt((1.0 - nref / nseq) / nref)
+            if halfwidth <= rel_error * meff:
+                # Extrapolate the remaining weights from their reference neighbors and scale them to add up
+                # to the estimated Meff together with the exact weights of the reference sample
+                sampled = np.zeros(nseq, dtype=bool)
+                sampled[order[:nref]] = True
+                others = (multiplicity.sum() - multiplicity) / float(multiplicity[order[:nref]].sum())
+                weights = multiplicity / (multiplicity * (limit > 0) + others * neighbors)
+                weights[~sampled] *= (meff - sample.sum()) / weights[~sampled].sum()
+                weights[order[:nref]] = sample
+                return weights, meff, meff - halfwidth, meff + halfwidth
+
+        with np.errstate(divide='ignore'):
+            weights = multiplicity / exact
+        return weights, weights.sum(), weights.sum(), weights.sum()
+
+    def _set_matrix(self, X):
+        """Write the rows of an ASCII matrix back to the sequences and keep it as cached alignment matrix
+
+        The rows are taken from an alignment that has already been validated, so the sequences are
+        replaced without checking their characters again.
+
+        """
+        X = np.ascontiguousarray(X, dtype=np.uint8)
+        data = X.tobytes().decode('ascii')
+        ncols = X.shape[1]
+        for i, sequence in enumerate(self):
+            sequence._seq = data[i * ncols:(i + 1) * ncols]
+        self._invalidate()
+        X.flags.writeable = False
+        self._matrix = X
+        self._lengths = Counter({ncols: len(self)}) if len(self) > 0 else Counter()
+
+    def add(self, sequence):
+        """Add a :obj:`~conkit.core.sequence.Sequence` to the :obj:`~conkit.core.sequencefile.SequenceFile`
+
+        Parameters
+        ----------
+        sequence : :obj:`~conkit.core.sequence.Sequence`
+
+        """
+        super(SequenceFile, self).add(sequence)
+        self._count_lengths(added=[sequence.seq_len])
+
     @deprecate('0.11', msg='Use calculate_meff_with_identity instead.')
     def calculate_meff(self, identity=0.8):
         """Calculate the number of effective sequences"""
@@ -253,7 +508,95 @@ class SequenceFile(Entity):
         """
         return int(sum(self.get_weights(identity=identity)))
 
-    def get_weights(self, identity=0.8):
+    def deduplicate(self, identity=None, inplace=False, seed=None, nbands=20):
+        """Collapse duplicate sequences into their first occurrence
+
+        Exact duplicates are found by hashing the packed sequences. If ``identity`` is given,
+        sequences with at least this identity to an earlier representative are collapsed, too.
+        These near-duplicates are found by locality-sensitive hashing on random samples of columns
+        and verified exactly, so they are only missed with a small probability.
+
+        Each representative takes over the multiplicity of all sequences collapsed into it, which
+        :func:`~conkit.core.sequencefile.SequenceFile.get_weights` accounts for, so that removing exact
+        duplicates leaves `Meff` unchanged.
+
+        Parameters
+        ----------
+        identity : float, optional
+           The minimum sequence identity of near-duplicates [default: None]
+        inplace : bool, optional
+           Replace the saved order of sequences [default: False]
+        seed : int, optional
+           The seed for the random column samples
+        nbands : int, optional
+           The number of column samples [default: 20]
+
+        Returns
+        -------
+        :obj:`~conkit.core.sequencefile.SequenceFile`
+           The reference to the :obj:`~conkit.core.sequencefile.SequenceFile`, regardless of inplace
+
+        Raises
+        ------
+        :exc:`ValueError`
+           :obj:`~conkit.core.sequencefile.SequenceFile` is not an alignment
+        :exc:`ValueError`
+           Sequence Identity needs to be between 0 and 1
+
+        """
+        if identity is not None and (identity < 0 or identity > 1):
+            raise ValueError("Sequence Identity needs to be between 0 and 1")
+        if not self.is_alignment:
+            raise ValueError('This is not an alignment')
+
+        from conkit.core.ext.c_sequencefile import c_pack
+        X = self._get_ascii_matrix()
+        hashes = {}
+        representatives = np.array([hashes.setdefault(row.tobytes(), i) for i, row in enumerate(c_pack(X))],
+                                   dtype=np.int64)
+        if identity is not None and identity < 1 and X.shape[1] > 0:
+            unique = np.flatnonzero(representatives == np.arange(X.shape[0]))
+            representatives[unique] = unique[self._find_near_duplicates(X[unique], identity, seed, nbands)]
+            representatives = representatives[representatives]
+
+        keep = representatives == np.arange(X.shape[0])
+        multiplicity = np.bincount(representatives, weights=self._get_multiplicities(), minlength=X.shape[0])
+        deduplicated = self._inplace(inplace)
+        for i in np.flatnonzero(keep):
+            deduplicated.child_list[i].multiplicity = int(multiplicity[i])
+        deduplicated.keep(keep)
+        return deduplicated
+
+    def estimate_meff(self, identity=0.8, rel_error=0.02, seed=None):
+        """Estimate the number of effective sequences with a 95% confidence interval
+
+        See Also
+        --------
+        get_weights
+
+        Parameters
+        ----------
+        identity : float, optional
+           The sequence identity to use for similarity decision [default: 0.8]
+        rel_error : float, optional
+           The targeted half-width of the confidence interval relative to the estimate [default: 0.02]
+        seed : int, optional
+           The seed for the random reference sample
+
+        Returns
+        -------
+        tuple
+           The estimated number of effective sequences, and the lower and upper confidence limits
+
+        """
+        if identity < 0 or identity > 1:
+            raise ValueError("Sequence Identity needs to be between 0 and 1")
+        if not self.is_alignment:
+            raise ValueError('This is not an alignment')
+        _, meff, lower, upper = self._sample_weights(identity, rel_error, seed)
+        return meff, lower, upper
+
+    def get_weights(self, identity=0.8, method='exact', rel_error=0.02, seed=None):
         """Calculate the sequence weights
 
         This function calculates the sequence weights in the
@@ -265,10 +608,21 @@ class SequenceFile(Entity):
 
            M_{eff}=\\sum_{i}\\frac{1}{\\sum_{j}S_{i,j}}
 
+        The ``sampled`` method estimates :math:`\\sum_{j}S_{i,j}` for every sequence from a random
+        reference sample, which grows until the 95% confidence interval of :math:`M_{eff}` is within
+        ``rel_error`` of the estimate. Its runtime thus scales with the number of sequences times the
+        size of the reference sample rather than quadratically.
+
         Parameters
         ----------
         identity : float, optional
            The sequence identity to use for similarity decision [default: 0.8]
+        method : str, optional
+           The calculation method, either ``exact`` or ``sampled`` [default: exact]
+        rel_error : float, optional
+           The targeted relative error of the ``sampled`` method [default: 0.02]
+        seed : int, optional
+           The seed for the random reference sample of the ``sampled`` method
 
         Returns
         -------
@@ -281,19 +635,22 @@ class SequenceFile(Entity):
            :obj:`~conkit.core.sequencefile.SequenceFile` is not an alignment
         :exc:`ValueError`
            Sequence Identity needs to be between 0 and 1
+        :exc:`ValueError`
+           Unknown method
 
         """
         if identity < 0 or identity > 1:
             raise ValueError("Sequence Identity needs to be between 0 and 1")
+        if method not in ('exact', 'sampled'):
+            raise ValueError('Unknown method: {}'.format(method))
 
-        if self.is_alignment:
-            from conkit.core.ext.c_sequencefile import c_get_weights
-            X = np.array(self.ascii_matrix, dtype=np.int64)
-            hamming = np.zeros(X.shape[0], dtype=np.float64)
-            c_get_weights(X, identity, hamming)
-            return hamming.tolist()
-        else:
+        if not self.is_alignment:
             raise ValueError('This is not an alignment')
+        elif method == 'sampled':
+            return self._sample_weights(identity, rel_error, seed)[0].tolist()
+        else:
+            return self._memoize('weights_{!r}'.format(float(identity)),
+                                 lambda: self._compute_weights(identity)).tolist()
 
     def get_frequency(self, symbol):
         """Calculate the frequency of an amino acid (symbol) in each Multiple Sequence Alignment column
@@ -310,19 +667,158 @@ class SequenceFile(Entity):
 
         """
         if self.is_alignment:
-            from conkit.core.ext.c_sequencefile import c_get_frequency
-            X = np.array(self.encoded_matrix, dtype=np.int64)
             symbol = getattr(AminoAcidMapping, symbol, AminoAcidMapping["X"]).value
-            frequencies = np.zeros(X.shape[1], dtype=np.int64)
-            c_get_frequency(X, symbol, frequencies)
-            return frequencies.tolist()
+            return self.get_profile(weighted=False)[symbol - 1].astype(np.int64).tolist()
+        else:
+            raise ValueError('This is not an alignment')
+
+    def get_profile(self, weighted=True, identity=0.8):
+        """Calculate the frequency of every amino acid in each Multiple Sequence Alignment column
+
+        The rows of the profile follow the values of :obj:`~conkit.core.mappings.AminoAcidMapping`,
+        i.e. row ``AminoAcidMapping[symbol].value - 1`` holds the counts of ``symbol``, whereby the
+        last row collects gaps and unknown residues.
+
+        Parameters
+        ----------
+        weighted : bool, optional
+           Count each sequence by its weight rather than by its multiplicity [default: True]
+        identity : float, optional
+           The sequence identity to use for the sequence weights [default: 0.8]
+
+        Returns
+        -------
+        :obj:`numpy.ndarray`
+           A 21 x L matrix of the per alignment-column amino acid counts
+
+        Raises
+        ------
+        :exc:`ValueError`
+           :obj:`~conkit.core.sequencefile.SequenceFile` is not an alignment
+
+        See Also
+        --------
+        get_frequency, get_weights
+
+        """
+        if self.is_alignment:
+            key = 'profile_{!r}'.format(float(identity)) if weighted else 'profile'
+            return self._memoize(key, lambda: self._compute_profile(weighted, identity)).copy()
         else:
             raise ValueError('This is not an alignment')
 
+    def predict_contacts(self, method='mi', identity=0.8, pseudocount=0.05, apc=True, block_size=64):
+        """Predict contacts from the co-variation of alignment columns
+
+        Pair frequencies of the weighted sequences are accumulated for one block of column pairs at
+        a time, so the memory needed is independent of the alignment length. The ``mi`` method scores
+        column pairs by their mutual information [#]_ and the ``cov`` method by the Frobenius norm of
+        their covariance matrix.
+
+        .. [#] Dunn, S.D., Wahl, L.M. & Gloor, G.B. (2008). Mutual information without the influence
+           of phylogeny or entropy dramatically improves residue contact prediction. Bioinformatics 24, 333-340.
+
+        Parameters
+        ----------
+        method : str, optional
+           The scoring method, either ``mi`` or ``cov`` [default: mi]
+        identity : float, optional
+           The sequence identity to use for the sequence weights [default: 0.8]
+        pseudocount : float, optional
+           The weight of uniform pseudocounts mixed into the frequencies [default: 0.05]
+        apc : bool, optional
+           Apply the average product correction [default: True]
+        block_size : int, optional
+           The number of columns per block [default: 64]
+
+        Returns
+        -------
+        :obj:`~conkit.core.arraycontactmap.ArrayContactMap`
+           The scores of all column pairs in residue order, associated with a copy of the top sequence
+
+        Raises
+        ------
+        :exc:`ValueError`
+           :obj:`~conkit.core.sequencefile.SequenceFile` is not an alignment
+        :exc:`ValueError`
+           Unknown method
+
+        """
+        if method not in ('mi', 'cov'):
+            raise ValueError('Unknown method: {}'.format(method))
+        if not self.is_alignment:
+            raise ValueError('This is not an alignment')
+
+        from conkit.core.arraycontactmap import ArrayContactMap
+        from conkit.core.ext.c_sequencefile import c_get_pair_frequencies, c_get_profile
+        E = self._get_encoded_matrix()
+        nstates = len(AminoAcidMapping)
+        weights = np.asarray(self.get_weights(identity=identity), dtype=np.float64)
+        meff = weights.sum()
+
+        singles = np.zeros((nstates, E.shape[1]), dtype=np.float64)
+        c_get_profile(E, weights, singles)
+        singles = (1.0 - pseudocount) * singles.T / meff + pseudocount / nstates
+        E = np.ascontiguousarray(E.T - 1)
+
+        ncols = E.shape[0]
+        scores = np.zeros((ncols, ncols), dtype=np.float64)
+        for i in range(0, ncols, block_size):
+            for j in range(i, ncols, block_size):
+                pairs = np.zeros((min(block_size, ncols - i), min(block_size, ncols - j), nstates, nstates))
+                c_get_pair_frequencies(E, i, j, weights, pairs)
+                pairs = (1.0 - pseudocount) * pairs / meff + pseudocount / nstates**2
+                expected = singles[i:i + block_size, np.newaxis, :, np.newaxis] \
+                    * singles[np.newaxis, j:j + block_size, np.newaxis, :]
+                if method == 'mi':
+                    with np.errstate(divide='ignore', invalid='ignore'):
+                        terms = pairs * np.log(pairs / expected)
+                    block = np.where(pairs > 0, terms, 0.0).sum(axis=(2, 3))
+                else:
+                    block = np.sqrt(((pairs - expected)**2).sum(axis=(2, 3)))
+                scores[i:i + block_size, j:j + block_size] = block
+        scores = np.triu(scores, 1)
+        scores += scores.T
+
+        if apc and ncols > 2:
+            means = scores.sum(axis=1) / (ncols - 1)
+            mean = means.mean()
+            if mean > 0:
+                scores -= np.outer(means, means) / mean
+
+        res1_seq, res2_seq = np.triu_indices(ncols, 1)
+        # Gaps and unknown residues of the top sequence become X
+        residues = AMINO_ACID_DECODING[AMINO_ACID_ENCODING[np.frombuffer(self.top.seq_ascii.upper(), dtype=np.uint8)]]
+        contact_map = ArrayContactMap.from_arrays(
+            method,
+            res1_seq + 1,
+            res2_seq + 1,
+            scores[res1_seq, res2_seq],
+            res1=residues[res1_seq],
+            res2=residues[res2_seq])
+        contact_map.sequence = self.top_sequence.deepcopy()
+        return contact_map
+
+    def keep(self, mask):
+        """Keep only the sequences flagged in ``mask``
+
+        See Also
+        --------
+        :meth:`~conkit.core.entity.Entity.keep`
+
+        """
+        removed = [sequence.seq_len for sequence, flag in zip(self.child_list, mask) if not flag]
+        super(SequenceFile, self).keep(mask)
+        self._count_lengths(removed=removed)
+
     def filter(self, min_id=0.3, max_id=0.9, inplace=False):
         """Filter sequences from an alignment according to the minimum and maximum identity
         between the sequences
 
+        The alignment is clustered greedily in its order of sequences. A sequence is kept as
+        representative if its identity to every representative before it lies within the limits,
+        similar to the ``-id`` option of HHfilter.
+
         Parameters
         ----------
         min_id : float, optional
@@ -353,14 +849,18 @@ class SequenceFile(Entity):
             raise ValueError("Maximum sequence identity needs to be between 0 and 1")
 
         if self.is_alignment:
-            from conkit.core.ext.c_sequencefile import c_filter
-            X = np.array(self.ascii_matrix, dtype=np.int64)
-            throwables = np.full(X.shape[0], False, dtype=np.bool)
-            c_filter(X, min_id, max_id, throwables)
+            from conkit.core.ext.c_sequencefile import c_filter, c_num_threads, c_pack
+            X = self._get_ascii_matrix()
+            throwables = np.zeros(X.shape[0], dtype=np.uint8)
+            if X.shape[1] > 0:
+                # The mismatch counts whose identity lies within the limits form a single interval
+                identities = 1.0 - np.arange(X.shape[1] + 1) / X.shape[1]
+                allowed = np.flatnonzero((identities >= min_id) & (identities <= max_id))
+                dlo, dhi = (allowed[0], allowed[-1]) if allowed.size else (X.shape[1] + 1, -1)
+                limit = dlo if dhi >= X.shape[1] else dhi + 1
+                c_filter(c_pack(X), dlo, dhi, limit, throwables, c_num_threads())
             filtered = self._inplace(inplace)
-            for i, sequence in enumerate(self):
-                if throwables[i]:
-                    filtered.remove(sequence.id)
+            filtered.keep(throwables == 0)
             return filtered
         else:
             raise ValueError('This is not an alignment')
@@ -401,18 +901,246 @@ class SequenceFile(Entity):
 
         if self.is_alignment:
             from conkit.core.ext.c_sequencefile import c_filter_symbol
-            X = np.array(self.encoded_matrix, dtype=np.int64)
+            X = self._get_encoded_matrix()
             symbol = getattr(AminoAcidMapping, symbol, AminoAcidMapping["X"]).value
             throwables = np.full(X.shape[0], False, dtype=np.bool)
             c_filter_symbol(X, min_prop, max_prop, symbol, throwables)
             filtered = self._inplace(inplace)
-            for i, sequence in enumerate(self):
-                if throwables[i]:
-                    filtered.remove(sequence.id)
+            filtered.keep(~throwables)
             return filtered
         else:
             raise ValueError('This is not an alignment')
 
+    def filter_columns(self, max_gap_fraction=0.5, inplace=False):
+        """Remove all alignment columns with a gap fraction greater than the limit
+
+        Parameters
+        ----------
+        max_gap_fraction : float, optional
+           Maximum allowed fraction of gaps and unknown residues per column [default: 0.5]
+        inplace : bool, optional
+           Replace the saved order of sequences [default: False]
+
+        Returns
+        -------
+        :obj:`~conkit.core.sequencefile.SequenceFile`
+           The reference to the :obj:`~conkit.core.sequencefile.SequenceFile`, regardless of inplace
+
+        Raises
+        ------
+        :exc:`ValueError`
+           :obj:`~conkit.core.sequencefile.SequenceFile` is not an alignment
+        :exc:`ValueError`
+           Maximum gap fraction needs to be between 0 and 1
+
+        See Also
+        --------
+        remove_columns
+
+        """
+        if max_gap_fraction < 0 or max_gap_fraction > 1:
+            raise ValueError("Maximum gap fraction needs to be between 0 and 1")
+        if not self.is_alignment:
+            raise ValueError('This is not an alignment')
+        gaps = self.get_profile(weighted=False)[AminoAcidMapping["X"].value - 1]
+        with np.errstate(invalid='ignore'):
+            return self.remove_columns(gaps / self._get_multiplicities().sum() > max_gap_fraction, inplace=inplace)
+
+    def remove_columns(self, mask, inplace=False):
+        """Remove the alignment columns flagged in ``mask``
+
+        Parameters
+        ----------
+        mask : list, tuple, :obj:`~numpy.ndarray`
+           A boolean flag for each alignment column to remove
+        inplace : bool, optional
+           Replace the saved order of sequences [default: False]
+
+        Returns
+        -------
+        :obj:`~conkit.core.sequencefile.SequenceFile`
+           The reference to the :obj:`~conkit.core.sequencefile.SequenceFile`, regardless of inplace
+
+        Raises
+        ------
+        :exc:`ValueError`
+           :obj:`~conkit.core.sequencefile.SequenceFile` is not an alignment
+        :exc:`ValueError`
+           The mask does not have one flag per alignment column
+
+        """
+        if not self.is_alignment:
+            raise ValueError('This is not an alignment')
+        mask = np.asarray(mask, dtype=bool)
+        X = self._get_ascii_matrix()
+        if mask.shape != (X.shape[1], ):
+            raise ValueError("Mask length does not match the number of alignment columns")
+        sequence_file = self._inplace(inplace)
+        sequence_file._set_matrix(X[:, ~mask])
+        return sequence_file
+
+    def select_rows(self, rows, inplace=False):
+        """Select sequences by their position in the :obj:`~conkit.core.sequencefile.SequenceFile`
+
+        Parameters
+        ----------
+        rows : list, tuple, :obj:`~numpy.ndarray`
+           The indices of the sequences to select in the new order, or a boolean flag for each sequence
+        inplace : bool, optional
+           Replace the saved order of sequences [default: False]
+
+        Returns
+        -------
+        :obj:`~conkit.core.sequencefile.SequenceFile`
+           The reference to the :obj:`~conkit.core.sequencefile.SequenceFile`, regardless of inplace,
+           which shares the selected sequences with the original unless inplace
+
+        Raises
+        ------
+        :exc:`ValueError`
+           The mask does not have one flag per sequence
+        :exc:`ValueError`
+           The same sequence cannot be selected twice
+
+        """
+        rows = np.asarray(rows)
+        if rows.dtype == bool:
+            if rows.shape != (len(self), ):
+                raise ValueError("Mask length does not match the number of sequences")
+            rows = np.flatnonzero(rows)
+        else:
+            rows = np.arange(len(self))[rows.astype(np.intp)]
+            if np.unique(rows).shape[0] != rows.shape[0]:
+                raise ValueError("The same sequence cannot be selected twice")
+        if not inplace:
+            return self._view([self.child_list[i] for i in rows])
+        X = self._matrix
+        selected = np.zeros(len(self), dtype=bool)
+        selected[rows] = True
+        self.keep(selected)
+        if np.any(np.diff(rows) < 0):
+            # The kept sequences are in their original order
+            self.child_list = [self.child_list[i] for i in np.searchsorted(np.sort(rows), rows)]
+        if X is not None:
+            # The selected rows of the cached matrix still match their sequences
+            self._matrix = X[rows]
+            self._matrix.flags.writeable = False
+        return self
+
+    def subsample(self, target_meff, strategy='weighted', identity=0.8, method='exact', inplace=False, seed=None,
+                  batch_size=256):
+        """Select a subset of sequences reaching a target number of effective sequences
+
+        The sequences are ranked by the ``strategy`` and added in batches until `Meff` of the subset,
+        with weights among the subset only, reaches ``target_meff``. The batch crossing the target is
+        bisected for the shortest prefix to reach it. The first sequence, usually the query, always
+        ranks first. The selected sequences retain their order.
+
+        The strategies rank the sequences
+
+        - ``weighted``: at random with probabilities proportional to their weights in the full alignment,
+        - ``diverse``: by decreasing weight in the full alignment, i.e. most isolated first, or
+        - ``random``: at random.
+
+        Parameters
+        ----------
+        target_meff : float
+           The number of effective sequences to reach
+        strategy : str, optional
+           The ranking of the sequences, either ``weighted``, ``diverse`` or ``random`` [default: weighted]
+        identity : float, optional
+           The sequence identity to use for similarity decision [default: 0.8]
+        method : str, optional
+           The calculation method of the full alignment weights, see
+           :func:`~conkit.core.sequencefile.SequenceFile.get_weights` [default: exact]
+        inplace : bool, optional
+           Replace the saved order of sequences [default: False]
+        seed : int, optional
+           The seed for the random ranking
+        batch_size : int, optional
+           The number of sequences added at once [default: 256]
+
+        Returns
+        -------
+        :obj:`~conkit.core.sequencefile.SequenceFile`
+           The reference to the :obj:`~conkit.core.sequencefile.SequenceFile`, regardless of inplace
+
+        Raises
+        ------
+        :exc:`ValueError`
+           :obj:`~conkit.core.sequencefile.SequenceFile` is not an alignment
+        :exc:`ValueError`
+           Sequence Identity needs to be between 0 and 1
+        :exc:`ValueError`
+           Unknown strategy
+
+        """
+        if identity < 0 or identity > 1:
+            raise ValueError("Sequence Identity needs to be between 0 and 1")
+        if strategy not in ('weighted', 'diverse', 'random'):
+            raise ValueError('Unknown strategy: {}'.format(strategy))
+        if not self.is_alignment:
+            raise ValueError('This is not an alignment')
+
+        from conkit.core.ext.c_sequencefile import c_get_cross_neighbors, c_get_neighbors, c_num_threads, c_pack
+        X = self._get_ascii_matrix()
+        limit = max(int(np.ceil((1.0 - identity) * X.shape[1])), 0)
+        multiplicity = self._get_multiplicities()
+        random_state = np.random.RandomState(seed)
+        if strategy == 'random':
+            order = random_state.permutation(X.shape[0])
+        else:
+            weights = np.asarray(self.get_weights(identity=identity, method=method, seed=seed))
+            if strategy == 'weighted':
+                # Weighted random sampling without replacement by exponential keys
+                with np.errstate(divide='ignore'):
+                    keys = np.log(1.0 - random_state.random_sample(X.shape[0])) / weights
+                order = np.argsort(-keys, kind='mergesort')
+            else:
+                order = np.argsort(-weights, kind='mergesort')
+        order = np.concatenate(([0], order[order != 0]))
+
+        X = c_pack(X)
+        nthreads = c_num_threads()
+
+        def extend(selected, counts, rows):
+            """Add the neighbor counts of ``rows`` among themselves and to the ``selected`` rows"""
+            counts = counts.copy()
+            counts_x = np.zeros((nthreads, rows.shape[0]), dtype=np.int64)
+            c_get_neighbors(X[rows], multiplicity[rows], limit, counts_x)
+            counts_y = np.zeros((nthreads, selected.shape[0]), dtype=np.int64)
+            c_get_cross_neighbors(X[rows], X[selected], multiplicity[rows], multiplicity[selected], limit,
+                                  counts_x, counts_y)
+            counts[rows] = counts_x.sum(axis=0)
+            counts[selected] += counts_y.sum(axis=0)
+            selected = np.concatenate((selected, rows))
+            with np.errstate(divide='ignore'):
+                meff = (multiplicity[selected] / (counts[selected] + multiplicity[selected] * (limit > 0))).sum()
+            return selected, counts, meff
+
+        selected = order[:0]
+        counts = np.zeros(X.shape[0], dtype=np.int64)
+        for start in range(0, X.shape[0], batch_size):
+            batch = order[start:start + batch_size]
+            extended = extend(selected, counts, batch)
+            if extended[2] >= target_meff:
+                lower, upper = 0, batch.shape[0]
+                while upper - lower > 1:
+                    middle = (lower + upper) // 2
+                    if extend(selected, counts, batch[:middle])[2] >= target_meff:
+                        upper = middle
+                    else:
+                        lower = middle
+                selected = np.concatenate((selected, batch[:upper]))
+                break
+            selected, counts = extended[:2]
+
+        keep = np.zeros(X.shape[0], dtype=bool)
+        keep[selected] = True
+        subsampled = self._inplace(inplace)
+        subsampled.keep(keep)
+        return subsampled
+
     def sort(self, kword, reverse=False, inplace=False):
         """Sort the :obj:`~conkit.core.sequencefile.SequenceFile`
 
@@ -463,12 +1191,10 @@ class SequenceFile(Entity):
            The reference to the :obj:`~conkit.core.sequencefile.SequenceFile`, regardless of inplace
 
         """
-        sequence_file = self._inplace(inplace)
         if self.is_alignment:
-            i = start - 1
-            j = end
-            for sequence in sequence_file:
-                sequence.seq = sequence.seq[i:j]
+            X = self._get_ascii_matrix()[:, start - 1:end]
+            sequence_file = self._inplace(inplace)
+            sequence_file._set_matrix(X)
             return sequence_file
         else:
             raise ValueError("This is not an alignment")
@@ -483,8 +1209,8 @@ class SequenceFile(Entity):
         """
         sstream = 'Summary for {id}{nline}'
         sstream += '-------------------------------{nline}'
-        sstream += 'Alignment:{tab}{tab}{is_alignment}'
-        sstream += 'Number of sequences:{tab}{nseq}{nline}' % self.nseq
-        sstream += 'Alignment depth (0.8):{tab}{meff}{nline}' % self.meff
+        sstream += 'Alignment:{tab}{tab}{is_alignment}{nline}'
+        sstream += 'Number of sequences:{tab}{nseq}{nline}'
+        sstream += 'Alignment depth (0.8):{tab}{meff}{nline}'
         return sstream.format(
             id=self.id, is_alignment=self.is_alignment, tab='\t', nline='\n', nseq=self.nseq, meff=self.meff)
@@ -0,0 +1,51 @@
+"""Testing facility for conkit.core.Aligner"""
+
+__author__ = "Felix Simkovic"
+__date__ = "18 Oct 2018"
+
+import unittest
+
+from conkit.core.aligner import Aligner
+
+
+class TestAligner(unittest.TestCase):
+    def test_init_1(self):
+        self.assertEqual('pairwise2', Aligner().backend)
+        self.assertEqual('pairwise', Aligner('pairwise').backend)
+
+    def test_init_2(self):
+        with self.assertRaises(ValueError):
+            Aligner('foo')
+
+    def test_align_1(self):
+        for backend in Aligner.BACKENDS:
+            aligner = Aligner(backend)
+            self.assertEqual(('GSMFTPK', '-SMFT-K'), aligner.align('GSMFTPK', 'SMFTK'))
+            self.assertEqual(('XXACGT--', '-YACGTZZ'), aligner.align('XXACGT', 'YACGTZZ'))
+
+    def test_align_2(self):
+        for backend in Aligner.BACKENDS:
+            aligner = Aligner(backend)
+            self.assertEqual(('GSMFTPK', '-SMFT-K'), aligner.align('GSMFTPK', 'SMFTK', mode='global'))
+            self.assertEqual(('AAAWWW', '---WWW'),
+                             aligner.align('AAAWWW', 'WWW', mode='global', nonid_chars=-1, gap_open_pen=-0.5))
+
+    def test_align_3(self):
+        aligner = Aligner()
+        with self.assertRaises(ValueError):
+            aligner.align('GSMFTPK', 'SMFTK', mode='foo')
+
+    def test_align_4(self):
+        aligner = Aligner(maxsize=2)
+        aligner.align('GSMFTPK', 'SMFTK')
+        aligner.align('GSMFTPK', 'SMFTK', gap_ext_pen=-0.2)
+        aligner.align('GSMFTPK', 'SMFTK')
+        aligner.align('GSMFTPK', 'GSMF')
+        self.assertEqual([('GSMFTPK', 'SMFTK', 'local', 2, 1, -0.5, -0.1), ('GSMFTPK', 'GSMF', 'local', 2, 1, -0.5, -0.1)],
+                         list(aligner._cache))
+        aligner.clear()
+        self.assertEqual(0, len(aligner._cache))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
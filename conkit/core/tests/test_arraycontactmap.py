@@ -0,0 +1,330 @@
+"""Testing facility for conkit.core.ArrayContactMap"""
+
+__author__ = "Felix Simkovic"
+__date__ = "18 Oct 2018"
+
+import pickle
+import unittest
+import warnings
+
+from conkit.core.arraycontactmap import ArrayContactMap
+from conkit.core.contact import Contact
+from conkit.core.contactmap import ContactMap
+from conkit.core.mappings import ContactMatchState
+from conkit.core.sequence import Sequence
+
+TP = ContactMatchState.true_positive.value
+FP = ContactMatchState.false_positive.value
+FN = ContactMatchState.false_negative.value
+
+
+class TestArrayContactMap(unittest.TestCase):
+    def test_add_1(self):
+        contact_map = ArrayContactMap('test')
+        for c in [Contact(1, 5, 1.0), Contact(3, 3, 0.4), Contact(2, 4, 0.1), Contact(5, 1, 0.2)]:
+            contact_map.add(c)
+        self.assertEqual(4, contact_map.ncontacts)
+        self.assertEqual([(1, 5), (3, 3), (2, 4), (5, 1)], [c.id for c in contact_map])
+
+    def test_add_2(self):
+        contact_map = ArrayContactMap('test')
+        contact_map.add(Contact(1, 5, 1.0))
+        with self.assertRaises(ValueError):
+            contact_map.add(Contact(1, 5, 0.5))
+
+    def test_add_3(self):
+        contact_map = ArrayContactMap('test')
+        for i in range(2000):
+            contact_map.add(Contact(i, i + 5, 1.0))
+        self.assertTrue((1999, 2004) in contact_map)
+        self.assertFalse((2000, 2005) in contact_map)
+        self.assertEqual(2000, len(contact_map))
+
+    def test_add_4(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            contact_map = ArrayContactMap('test')
+            for c in [Contact(1, 5, 0.5), Contact(-3, 2**31, 0.4), Contact(2**31, -1, 0.1)]:
+                contact_map.add(c)
+            self.assertTrue((1, 5) in contact_map)
+            self.assertTrue((2**31, -1) in contact_map)
+            self.assertFalse((5, 1) in contact_map)
+            self.assertEqual(0.4, contact_map[(-3, 2**31)].raw_score)
+            self.assertEqual(3, len(contact_map.intersection(contact_map)))
+
+    def test_from_arrays_1(self):
+        contact_map = ArrayContactMap.from_arrays('test', [1, 2, 3], [10, 20, 30], [0.1, 0.5, 0.3])
+        self.assertEqual([[1, 10], [2, 20], [3, 30]], contact_map.as_list())
+        self.assertEqual(0.5, contact_map[(2, 20)].raw_score)
+        self.assertEqual('X', contact_map[(2, 20)].res1)
+
+    def test_from_arrays_2(self):
+        with self.assertRaises(ValueError):
+            ArrayContactMap.from_arrays('test', [1, 1], [10, 10], [0.1, 0.5])
+
+    def test_from_arrays_3(self):
+        with self.assertRaises(ValueError):
+            ArrayContactMap.from_arrays('test', [1], [10], [0.1], foo=[1])
+
+    def test_from_contactmap_1(self):
+        contact_map = ContactMap('test')
+        for c in [Contact(1, 5, 1.0), Contact(2, 4, 0.1)]:
+            contact_map.add(c)
+        contact_map[(2, 4)].status = TP
+        contact_map[(2, 4)].res1_chain = 'A'
+        array_map = ArrayContactMap.from_contactmap(contact_map)
+        self.assertEqual([(1, 5), (2, 4)], [c.id for c in array_map])
+        self.assertTrue(array_map[(2, 4)].true_positive)
+        self.assertEqual('A', array_map[(2, 4)].res1_chain)
+
+    def test_to_contactmap_1(self):
+        array_map = ArrayContactMap.from_arrays('test', [1, 2], [10, 20], [0.1, 0.5])
+        contact_map = array_map.to_contactmap()
+        self.assertEqual(ContactMap, type(contact_map))
+        self.assertEqual([(1, 10), (2, 20)], [c.id for c in contact_map])
+
+    def test_getitem_1(self):
+        contact_map = ArrayContactMap.from_arrays('test', [1, 2, 3], [10, 20, 30], [0.1, 0.5, 0.3])
+        self.assertEqual((1, 10), contact_map[0].id)
+        self.assertEqual((3, 30), contact_map[-1].id)
+        self.assertTrue(contact_map[1] is contact_map[(2, 20)])
+        with self.assertRaises(KeyError):
+            contact_map[(4, 40)]
+        with self.assertRaises(IndexError):
+            contact_map[3]
+
+    def test_getitem_2(self):
+        contact_map = ArrayContactMap.from_arrays('test', [1, 2, 3], [10, 20, 30], [0.1, 0.5, 0.3])
+        sliced = contact_map[1:]
+        self.assertEqual(ArrayContactMap, type(sliced))
+        self.assertEqual([(2, 20), (3, 30)], [c.id for c in sliced])
+
+    def test_getitem_3(self):
+        contact_map = ArrayContactMap.from_arrays('test', [1, 2, 3], [10, 20, 30], [0.1, 0.5, 0.3])
+        sliced = contact_map[::-2]
+        self.assertEqual([(3, 30), (1, 10)], [c.id for c in sliced])
+        sliced[0].raw_score = 0.9
+        sliced.rescale(inplace=True)
+        self.assertEqual([1.0, 0.0], [c.raw_score for c in sliced])
+        self.assertEqual([0.1, 0.5, 0.9], list(contact_map.data['raw_score']))
+
+    def test_getitem_4(self):
+        contact_map = ArrayContactMap.from_arrays('test', [1, 2, 3], [10, 20, 30], [0.1, 0.5, 0.3])
+        sliced = contact_map[1:]
+        contact_map.rescale(inplace=True)
+        contact_map.set_scalar_score()
+        self.assertEqual([0.5, 0.3], list(sliced.data['raw_score']))
+        self.assertEqual([0.0, 0.0], list(sliced.data['scalar_score']))
+        self.assertEqual([0.0, 1.0, 0.5], [round(score, 3) for score in contact_map.data['raw_score']])
+
+    def test_getitem_5(self):
+        contact_map = ArrayContactMap.from_arrays('test', [1, 2, 3], [10, 20, 30], [0.1, 0.5, 0.3])
+        contact = contact_map[0]
+        sliced = contact_map[:1]
+        contact_map.rescale(inplace=True)
+        self.assertTrue(contact_map[0] is contact)
+        self.assertTrue(contact.parent is contact_map)
+        self.assertFalse(sliced[0] is contact)
+        self.assertEqual([0.1], [c.raw_score for c in sliced])
+
+    def test_getitem_6(self):
+        contact_map = ArrayContactMap.from_arrays('test', [1, 2, 3], [10, 20, 30], [0.1, 0.5, 0.3])
+        sliced = contact_map[:2]
+        sliced[0].raw_score = 1.0
+        self.assertEqual([1.0, 0.5, 0.3], [c.raw_score for c in contact_map])
+        sliced.remove((2, 20))
+        sliced[0].raw_score = 0.2
+        self.assertEqual([1.0, 0.5, 0.3], [c.raw_score for c in contact_map])
+        self.assertEqual([0.2], [c.raw_score for c in sliced])
+
+    def test_delitem_1(self):
+        contact_map = ArrayContactMap.from_arrays('test', [1, 2, 3], [10, 20, 30], [0.1, 0.5, 0.3])
+        contact = contact_map[(3, 30)]
+        contact_map.remove((2, 20))
+        self.assertEqual([(1, 10), (3, 30)], [c.id for c in contact_map])
+        self.assertTrue(contact is contact_map[1])
+
+    def test_keep_1(self):
+        contact_map = ArrayContactMap.from_arrays('test', [1, 2, 3], [10, 20, 30], [0.1, 0.5, 0.3])
+        contact_map.keep([True, False, True])
+        self.assertEqual([(1, 10), (3, 30)], [c.id for c in contact_map])
+        with self.assertRaises(ValueError):
+            contact_map.keep([True])
+
+    def test_drop_1(self):
+        contact_map = ArrayContactMap.from_arrays('test', [1, 2, 3], [10, 20, 30], [0.1, 0.5, 0.3])
+        contact_map.drop([(1, 10), (3, 30)])
+        self.assertEqual([(2, 20)], [c.id for c in contact_map])
+        with self.assertRaises(KeyError):
+            contact_map.drop([(1, 10)])
+
+    def test_materialised_1(self):
+        contact_map = ArrayContactMap.from_arrays('test', [1, 2, 3], [10, 20, 30], [0.1, 0.5, 0.3])
+        contact_map[(1, 10)].raw_score = 0.9
+        self.assertEqual([0.9, 0.5, 0.3], contact_map.data['raw_score'].tolist())
+        self.assertEqual([(1, 10), (2, 20), (3, 30)], [c.id for c in contact_map.sort('raw_score', reverse=True)])
+
+    def test_materialised_2(self):
+        contact_map = ArrayContactMap.from_arrays('test', [1, 2, 3], [10, 20, 30], [0.1, 0.5, 0.3])
+        for contact in contact_map:
+            contact.weight = 2.0
+        contact = contact_map[(2, 20)]
+        contact_map[(3, 30)].raw_score = 0.7
+        self.assertEqual(1, len(contact_map._dirty))
+        self.assertEqual([2.0, 2.0, 2.0], contact_map.data['weight'].tolist())
+        self.assertEqual({}, contact_map._dirty)
+        contact_map.data['raw_score'][0] = 0.2
+        contact.raw_score = 0.9
+        self.assertEqual([contact], list(contact_map._dirty.values()))
+        self.assertTrue(contact_map[1] is contact)
+        self.assertEqual([0.2, 0.9, 0.7], contact_map.data['raw_score'].tolist())
+
+    def test_pickle_1(self):
+        contact_map = ArrayContactMap.from_arrays('test', [1, 2, 3], [10, 20, 30], [0.1, 0.5, 0.3])
+        contact_map[0].status = TP
+        unpickled = pickle.loads(pickle.dumps(contact_map))
+        self.assertEqual([[1, 10], [2, 20], [3, 30]], unpickled.as_list())
+        self.assertTrue(unpickled[0].true_positive)
+
+    def test_as_list_1(self):
+        contact_map = ArrayContactMap.from_arrays(
+            'test', [1, 2], [10, 20], [0.1, 0.5], res1_altseq=[3, 4], res2_altseq=[12, 22])
+        self.assertEqual([[1, 10], [2, 20]], contact_map.as_list())
+        self.assertEqual([[3, 12], [4, 22]], contact_map.as_list(altloc=True))
+
+    def test_precision_1(self):
+        contact_map = ArrayContactMap('test')
+        for c in [Contact(1, 5, 1.0), Contact(3, 3, 0.4), Contact(2, 4, 0.1), Contact(5, 1, 0.2), Contact(1, 1, 0)]:
+            contact_map.add(c)
+        for i, contact in enumerate(contact_map):
+            if i % 2 == 0:
+                contact.status = TP
+            else:
+                contact.status = FP
+        contact_map[(1, 1)].status = FN
+        self.assertEqual(0.5, contact_map.precision)
+
+    def test_recall_1(self):
+        contact_map = ArrayContactMap.from_arrays(
+            'test', [1, 3, 2, 5, 2], [5, 3, 4, 1, 5], [1.0, 0.4, 0.1, 0.2, 1.0], status=[TP, FP, TP, FP, FN])
+        self.assertEqual(2 / 3., contact_map.recall)
+
+    def test_precision_curve_1(self):
+        contact_map = ArrayContactMap.from_arrays(
+            'test', [1, 3, 2, 5, 2], [5, 3, 4, 1, 5], [1.0, 0.4, 0.1, 0.2, 1.0], status=[TP, FP, TP, FP, FN])
+        curve = contact_map.precision_curve(counts=[1, 2, 3, 4])
+        self.assertEqual([1.0, 0.5, 2 / 3., 0.5], curve.precision.tolist())
+        self.assertEqual([1 / 3., 1 / 3., 2 / 3., 2 / 3.], curve.recall.tolist())
+        curve = contact_map.precision_curve(counts=[1, 2], key='raw_score')
+        self.assertEqual([1.0, 0.5], curve.precision.tolist())
+
+    def test_remove_neighbors_1(self):
+        contact_map = ArrayContactMap('test')
+        for c in [Contact(1, 5, 1.0), Contact(3, 3, 0.4), Contact(2, 4, 0.1), Contact(5, 1, 0.2)]:
+            contact_map.add(c)
+        contact_map_mod = contact_map.remove_neighbors(min_distance=2)
+        self.assertEqual([(1, 5), (2, 4), (5, 1)], [c.id for c in contact_map_mod])
+        self.assertEqual(4, len(contact_map))
+
+    def test_remove_neighbors_2(self):
+        contact_map = ArrayContactMap('test')
+        for c in [Contact(1, 30, 1.0), Contact(2, 10, 0.4), Contact(3, 20, 0.1), Contact(1, 5, 0.2)]:
+            contact_map.add(c)
+        contact_map_mod = contact_map.remove_neighbors(min_distance=6, max_distance=24, inplace=True)
+        self.assertEqual([(2, 10), (3, 20)], [c.id for c in contact_map_mod])
+        self.assertEqual(contact_map, contact_map_mod)
+
+    def test_long_range_1(self):
+        contact_map = ArrayContactMap.from_arrays('test', [1, 2, 3], [30, 10, 20], [0.1, 0.5, 0.3])
+        self.assertEqual([(1, 30)], [c.id for c in contact_map.long_range])
+        self.assertEqual([(2, 10)], [c.id for c in contact_map.short_range])
+        self.assertEqual([(3, 20)], [c.id for c in contact_map.medium_range])
+
+    def test_rescale_1(self):
+        contact_map = ArrayContactMap('test')
+        for c in [Contact(1, 5, 1.0), Contact(3, 3, 0.4), Contact(2, 4, 0.1), Contact(5, 1, 0.2)]:
+            contact_map.add(c)
+        contact_map_rescaled = contact_map.rescale()
+        self.assertListEqual([1.0, 0.333, 0.0, 0.111], [round(c.raw_score, 3) for c in contact_map_rescaled])
+        self.assertListEqual([1.0, 0.4, 0.1, 0.2], [c.raw_score for c in contact_map])
+
+    def test_rescale_2(self):
+        contact_map = ArrayContactMap('test')
+        for c in [Contact(1, 5, 1.0), Contact(3, 3, 0.4), Contact(2, 4, 0.1), Contact(5, 1, 0.2)]:
+            contact_map.add(c)
+        contact_map.rescale(inplace=True)
+        self.assertListEqual([1.0, 0.333, 0.0, 0.111], [round(c.raw_score, 3) for c in contact_map])
+
+    def test_reindex_1(self):
+        contact_map = ArrayContactMap.from_arrays('test', [5, 6], [10, 20], [0.1, 0.5])
+        contact_map.reindex(1, inplace=True)
+        self.assertEqual([(1, 6), (2, 16)], [c.id for c in contact_map])
+        self.assertTrue((2, 16) in contact_map)
+
+    def test_set_scalar_score_1(self):
+        contact_map = ArrayContactMap.from_arrays('test', [1, 2], [10, 20], [1.0, 3.0])
+        contact_map.set_scalar_score()
+        self.assertEqual([0.5, 1.5], [c.scalar_score for c in contact_map])
+
+    def test_sort_1(self):
+        contact_map = ArrayContactMap('test')
+        for c in [Contact(1, 5, 1.0), Contact(3, 3, 0.4), Contact(2, 4, 0.1), Contact(5, 1, 0.2)]:
+            contact_map.add(c)
+        contact_map_sorted = contact_map.sort('res1_seq', reverse=True, inplace=False)
+        self.assertEqual([(5, 1), (3, 3), (2, 4), (1, 5)], [c.id for c in contact_map_sorted])
+        self.assertNotEqual(contact_map, contact_map_sorted)
+
+    def test_sort_2(self):
+        contact_map = ArrayContactMap.from_arrays('test', [1, 2, 3, 4], [10, 20, 30, 40], [0.1, 0.5, 0.1, 0.5])
+        contact_map.sort('raw_score', reverse=True, inplace=True)
+        self.assertEqual([(2, 20), (4, 40), (1, 10), (3, 30)], [c.id for c in contact_map])
+
+    def test_sort_3(self):
+        contact_map = ArrayContactMap.from_arrays('test', [1, 2], [10, 20], [0.1, 0.5])
+        with self.assertRaises(ValueError):
+            contact_map.sort('foo')
+
+    def test_top_k_1(self):
+        contact_map = ArrayContactMap.from_arrays('test', [1, 2, 3, 4, 5], [10, 20, 30, 40, 9], [0.1, 0.5, 0.1, 0.5, 0.9])
+        top = contact_map.top_k(3, min_separation=5)
+        self.assertEqual(ArrayContactMap, type(top))
+        self.assertEqual([(2, 20), (4, 40), (1, 10)], [c.id for c in top])
+        self.assertEqual([(5, 9), (2, 20)], [c.id for c in contact_map.top_k(2)])
+        with self.assertRaises(ValueError):
+            contact_map.top_k(1, key='foo')
+
+    def test_repr_sequence_1(self):
+        contact_map = ArrayContactMap.from_arrays('test', [1, 2, 5], [5, 4, 1], [1.0, 0.1, 0.2])
+        contact_map.sequence = Sequence('foo', 'ABCDE')
+        self.assertEqual('AB-DE', contact_map.repr_sequence.seq)
+
+    def test_intersection_1(self):
+        contact_map1 = ArrayContactMap.from_arrays('foo', [1, 3, 2, 5], [5, 3, 4, 1], [1.0, 0.4, 0.1, 0.2])
+        contact_map2 = ArrayContactMap.from_arrays('bar', [1, 3, 2, 5], [7, 3, 5, 1], [1.0, 0.5, 0.1, 0.3])
+        intersection = contact_map1.intersection(contact_map2)
+        self.assertEqual(ArrayContactMap, type(intersection))
+        self.assertEqual([(3, 3), (5, 1)], [c.id for c in intersection])
+        self.assertEqual([(1, 5), (2, 4)], [c.id for c in contact_map1.difference(contact_map2)])
+        union = contact_map1.union(contact_map2)
+        self.assertEqual([(1, 5), (3, 3), (2, 4), (5, 1), (1, 7), (2, 5)], [c.id for c in union])
+        self.assertEqual(0.333333, round(contact_map1.get_jaccard_index(contact_map2), 6))
+
+    def test_to_dense_1(self):
+        contact_map = ArrayContactMap.from_arrays('test', [1, 2], [3, 4], [0.5, 0.2], weight=[1.0, 2.0])
+        self.assertEqual([[0.0, 0.0, 0.5, 0.0], [0.0, 0.0, 0.0, 0.2], [0.5, 0.0, 0.0, 0.0], [0.0, 0.2, 0.0, 0.0]],
+                         contact_map.to_dense().tolist())
+        contact_map[(1, 3)].weight = 3.0
+        self.assertEqual([3.0, 2.0], contact_map.to_sparse(field='weight', symmetric=False).data.tolist())
+
+    def test_from_dense_1(self):
+        mat = [[0.0, 0.9, 0.3], [0.9, 0.0, 0.2], [0.3, 0.2, 0.0]]
+        contact_map = ArrayContactMap.from_dense('test', mat, min_separation=1)
+        self.assertEqual(ArrayContactMap, type(contact_map))
+        self.assertEqual([(1, 2), (1, 3), (2, 3)], [c.id for c in contact_map])
+        self.assertEqual(mat, contact_map.to_dense().tolist())
+        contact_map = ArrayContactMap.from_sparse('test', contact_map.to_sparse(), top_k=1)
+        self.assertEqual([(1, 2)], [c.id for c in contact_map])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -254,12 +254,29 @@ class TestContact(unittest.TestCase):
         contact.status_unknown = True
         self.assertEqual(ContactMatchState.unknown.value, contact.status)
 
+    def test_status_6(self):
+        contact = Contact(1, 2000000, 1.0)
+        contact.status = ContactMatchState.false_negative
+        self.assertEqual(4, contact.status)
+        self.assertTrue(contact.false_negative)
+        with self.assertRaises(ValueError):
+            contact.status = 5
+
     def test_weight_1(self):
         contact = Contact(1, 2000000, 1.0)
         self.assertEqual(1.0, contact.weight)
         contact.weight = 2.5
         self.assertEqual(2.5, contact.weight)
 
+    def test_copy_1(self):
+        contact = Contact(1, 2, 1.0)
+        contact.upper_bound = 6.0
+        contact_copy = contact.copy()
+        contact_copy.lower_bound = 4.0
+        self.assertEqual((0.0, 6.0), contact.distance_bound)
+        self.assertEqual((4.0, 6.0), contact_copy.distance_bound)
+        self.assertFalse(hasattr(contact, 'child_list'))
+
     def test__to_dict_1(self):
         contact = Contact(1, 2, 1.0)
         answer_dict = {
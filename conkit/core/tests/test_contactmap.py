@@ -61,6 +61,30 @@ class TestContactMap(unittest.TestCase):
         contact_map.remove((3, 6))
         self.assertEqual(0.375, contact_map.coverage)
 
+    def test_getitem_1(self):
+        contact_map = ContactMap('test')
+        for c in [Contact(1, 10, 0.1), Contact(2, 20, 0.5), Contact(3, 30, 0.3)]:
+            contact_map.add(c)
+        contact = contact_map[0]
+        sliced = contact_map[:1]
+        contact_map.rescale(inplace=True)
+        self.assertTrue(contact_map[0] is contact)
+        self.assertTrue(contact.parent is contact_map)
+        self.assertFalse(sliced[0] is contact)
+        self.assertEqual([0.1], [c.raw_score for c in sliced])
+
+    def test_getitem_2(self):
+        contact_map = ContactMap('test')
+        for c in [Contact(1, 10, 0.1), Contact(2, 20, 0.5), Contact(3, 30, 0.3)]:
+            contact_map.add(c)
+        sliced = contact_map[:2]
+        sliced[0].raw_score = 1.0
+        self.assertEqual([1.0, 0.5, 0.3], [c.raw_score for c in contact_map])
+        sliced.remove((2, 20))
+        sliced[0].raw_score = 0.2
+        self.assertEqual([1.0, 0.5, 0.3], [c.raw_score for c in contact_map])
+        self.assertEqual([0.2], [c.raw_score for c in sliced])
+
     def test_empty_1(self):
         contact_map = ContactMap("test")
         self.assertTrue(contact_map.empty)
@@ -124,6 +148,59 @@ class TestContactMap(unittest.TestCase):
             contact_map.add(c)
         self.assertEqual(0.4, contact_map.recall)
 
+    def test_precision_curve_1(self):
+        contact_map = ContactMap('test')
+        for c in [Contact(1, 5, 1.0), Contact(3, 3, 0.4), Contact(2, 4, 0.1), Contact(5, 1, 0.2)]:
+            contact_map.add(c)
+        for i, contact in enumerate(contact_map):
+            if i % 2 == 0:
+                contact.status = TP
+            else:
+                contact.status = FP
+        for c in [Contact(2, 5, 1.0), Contact(3, 6, 1.0), Contact(1, 7, 1.0)]:
+            c.status = FN
+            contact_map.add(c)
+        curve = contact_map.precision_curve(counts=[0, 1, 2, 3, 4, 10])
+        self.assertEqual([0, 1, 2, 3, 4, 10], curve.ncontacts.tolist())
+        self.assertEqual([0.0, 1.0, 0.5, 0.666667, 0.5, 0.5], [round(x, 6) for x in curve.precision])
+        self.assertEqual([0.0, 0.2, 0.2, 0.4, 0.4, 0.4], [round(x, 6) for x in curve.recall])
+        self.assertEqual([0.0, 0.333333, 0.285714, 0.5, 0.444444, 0.444444], [round(x, 6) for x in curve.f1])
+        self.assertTrue(all(x != x for x in curve.mcc))
+        self.assertEqual(contact_map.recall, curve.recall[-1])
+
+    def test_precision_curve_2(self):
+        contact_map = ContactMap('test')
+        for c, status in zip([Contact(1, 5, 1.0), Contact(3, 3, 0.4), Contact(2, 4, 0.1), Contact(5, 1, 0.2)],
+                             [TP, TP, FP, TP]):
+            c.status = status
+            contact_map.add(c)
+        contact_map.sequence = Sequence('TEST', 'AAAAA')
+        curve = contact_map.precision_curve(factors=[0.4, 0.8])
+        self.assertEqual([2, 4], curve.ncontacts.tolist())
+        self.assertEqual([1.0, 0.75], curve.precision.tolist())
+        self.assertEqual([0.763763, 0.801784], [round(x, 6) for x in curve.mcc])
+        self.assertEqual([contact_map[:2].precision, contact_map[:4].precision], curve.precision.tolist())
+
+    def test_precision_curve_3(self):
+        contact_map = ContactMap('test')
+        for c, status in zip([Contact(1, 5, 0.1), Contact(3, 3, 0.4), Contact(2, 4, 0.4), Contact(5, 1, 0.9)],
+                             [TP, FP, TP, FP]):
+            c.status = status
+            contact_map.add(c)
+        curve = contact_map.precision_curve(counts=[1, 2, 3], key='raw_score')
+        self.assertEqual([0.0, 0.0, 0.333333], [round(x, 6) for x in curve.precision])
+        curve = contact_map.precision_curve(counts=[1, 2, 3])
+        self.assertEqual([1.0, 0.5, 0.666667], [round(x, 6) for x in curve.precision])
+
+    def test_precision_curve_4(self):
+        contact_map = ContactMap('test')
+        with self.assertRaises(ValueError):
+            contact_map.precision_curve()
+        with self.assertRaises(ValueError):
+            contact_map.precision_curve(factors=[1.0], counts=[1])
+        with self.assertRaises(ValueError):
+            contact_map.precision_curve(counts=[-1])
+
     def test_repr_sequence_1(self):
         contact_map = ContactMap('test')
         for contact in [Contact(1, 5, 1.0), Contact(2, 4, 0.1), Contact(5, 1, 0.2)]:
@@ -276,6 +353,66 @@ class TestContactMap(unittest.TestCase):
         jindex = contact_map1.get_jaccard_index(contact_map2)
         self.assertEqual(1.0, jindex)
 
+    def test_get_jaccard_index_5(self):
+        contact_map1 = ContactMap('foo')
+        contact_map2 = ContactMap('bar')
+        contact_map2.add(Contact(1, 5, 1.0))
+        self.assertEqual(0.0, contact_map1.get_jaccard_index(contact_map2))
+        self.assertEqual(0.0, contact_map2.get_jaccard_index(contact_map1))
+
+    def test_get_jaccard_matrix_1(self):
+        contact_maps = []
+        for id, pairs in [('foo', [(1, 5), (3, 3), (2, 4), (5, 1)]), ('bar', [(1, 7), (3, 3), (2, 5), (5, 1)]),
+                          ('cho', []), ('baz', [(1, 5), (3, 3), (2, 4), (5, 1)])]:
+            contact_map = ContactMap(id)
+            for res1_seq, res2_seq in pairs:
+                contact_map.add(Contact(res1_seq, res2_seq, 1.0))
+            contact_maps.append(contact_map)
+        matrix = ContactMap.get_jaccard_matrix(contact_maps)
+        self.assertEqual((4, 4), matrix.shape)
+        for i in range(4):
+            for j in range(4):
+                self.assertEqual(contact_maps[i].get_jaccard_index(contact_maps[j]), matrix[i, j])
+        self.assertEqual(0.333333, round(matrix[0, 1], 6))
+        self.assertEqual([1.0, 0.0, 1.0], [matrix[0, 0], matrix[0, 2], matrix[0, 3]])
+
+    def test_intersection_1(self):
+        contact_map1 = ContactMap('foo')
+        for c in [Contact(1, 5, 1.0), Contact(3, 3, 0.4), Contact(2, 4, 0.1), Contact(5, 1, 0.2)]:
+            contact_map1.add(c)
+        contact_map2 = ContactMap('bar')
+        for c in [Contact(1, 7, 1.0), Contact(3, 3, 0.5), Contact(2, 5, 0.1), Contact(5, 1, 0.3)]:
+            contact_map2.add(c)
+        intersection = contact_map1.intersection(contact_map2)
+        self.assertEqual([[3, 3], [5, 1]], intersection.as_list())
+        self.assertEqual([0.4, 0.2], [c.raw_score for c in intersection])
+        self.assertEqual(4, len(contact_map1))
+
+    def test_difference_1(self):
+        contact_map1 = ContactMap('foo')
+        for c in [Contact(1, 5, 1.0), Contact(3, 3, 0.4), Contact(2, 4, 0.1), Contact(5, 1, 0.2)]:
+            contact_map1.add(c)
+        contact_map2 = ContactMap('bar')
+        for c in [Contact(1, 7, 1.0), Contact(3, 3, 0.5), Contact(2, 5, 0.1), Contact(5, 1, 0.3)]:
+            contact_map2.add(c)
+        self.assertEqual([[1, 5], [2, 4]], contact_map1.difference(contact_map2).as_list())
+        self.assertEqual([[1, 7], [2, 5]], contact_map2.difference(contact_map1).as_list())
+        self.assertEqual([], contact_map1.difference(contact_map1).as_list())
+
+    def test_union_1(self):
+        contact_map1 = ContactMap('foo')
+        for c in [Contact(1, 5, 1.0), Contact(3, 3, 0.4), Contact(2, 4, 0.1), Contact(5, 1, 0.2)]:
+            contact_map1.add(c)
+        contact_map2 = ContactMap('bar')
+        for c in [Contact(1, 7, 1.0), Contact(3, 3, 0.5), Contact(2, 5, 0.1), Contact(5, 1, 0.3)]:
+            contact_map2.add(c)
+        union = contact_map1.union(contact_map2)
+        self.assertEqual('foo', union.id)
+        self.assertEqual([[1, 5], [3, 3], [2, 4], [5, 1], [1, 7], [2, 5]], union.as_list())
+        self.assertEqual([1.0, 0.4, 0.1, 0.2, 1.0, 0.1], [c.raw_score for c in union])
+        self.assertEqual(4, len(contact_map1))
+        self.assertEqual(4, len(contact_map2))
+
     @skipUnless(SKLEARN)
     def test_get_contact_density_1(self):
         contact_map1 = ContactMap('foo')
@@ -793,6 +930,28 @@ class TestContactMap(unittest.TestCase):
         self.assertEqual([TP, FP, TP, FP, UNK, FN, FN], [c.status for c in contact_map1])
         self.assertListEqual([[1, 5], [1, 6], [2, 7], [3, 5], [2, 8], [1, 7], [3, 4]], contact_map1.as_list())
 
+    def test_match_13(self):
+        # Equally scoring alignments exist for these sequences, the classification must not depend on the tie-break
+        contact_map1 = ContactMap('foo')
+        for params in [(1, 16), (1, 18), (3, 11), (3, 13), (3, 18), (4, 16), (5, 8), (7, 8), (8, 11), (10, 18),
+                       (11, 17), (15, 18)]:
+            contact_map1.add(Contact(params[0], params[1], 1.0))
+        contact_map1.sequence = Sequence('foo', 'QCKTSPLSNWHTFLFEYK')
+
+        contact_map2 = ContactMap('bar')
+        for params in [(2, 8), (2, 12), (4, 13), (5, 10), (6, 9), (9, 10), (9, 14), (10, 13)]:
+            contact = Contact(params[0] + 3, params[1] + 3, 1.0)
+            contact.res1_altseq = params[0]
+            contact.res2_altseq = params[1]
+            contact_map2.add(contact)
+        contact_map2.sequence = Sequence('bar', 'QCKTSNWHTFLFEY')
+
+        matched = contact_map1.match(contact_map2)
+        self.assertEqual([FP, UNK, FP, FP, UNK, TP, UNK, UNK, UNK, UNK, FP, UNK], [c.status for c in matched])
+        matched = contact_map1.match(contact_map2, add_false_negatives=True)
+        self.assertEqual([FP, UNK, FP, FP, UNK, TP, UNK, UNK, UNK, UNK, FP, UNK] + [FN] * 8,
+                         [c.status for c in matched])
+
     def test_remove_neighbors_1(self):
         contact_map = ContactMap('test')
         for c in [Contact(1, 5, 1.0), Contact(3, 3, 0.4), Contact(2, 4, 0.1), Contact(5, 1, 0.2)]:
@@ -842,6 +1001,58 @@ class TestContactMap(unittest.TestCase):
         self.assertEqual([(2, 10), (3, 20)], [c.id for c in contact_map_mod])
         self.assertEqual([(2, 10), (3, 20)], sorted(contact_map_mod.child_dict.keys()))
 
+    def test_remove_neighbors_7(self):
+        contact_map = ContactMap('test')
+        for c in [Contact(1, 30, 1.0), Contact(2, 10, 0.4), Contact(3, 20, 0.1), Contact(1, 5, 0.2)]:
+            contact_map.add(c)
+        self.assertEqual([(1, 30)], [c.id for c in contact_map.remove_neighbors(min_distance=24)])
+        contact_map[(2, 10)].res2_seq = 40
+        self.assertEqual([(1, 30), (2, 10)], [c.id for c in contact_map.remove_neighbors(min_distance=24)])
+        contact_map.add(Contact(4, 50, 0.3))
+        self.assertEqual([(1, 30), (2, 10), (4, 50)], [c.id for c in contact_map.remove_neighbors(min_distance=24)])
+
+    def test_short_range_1(self):
+        contact_map = ContactMap('test')
+        for c in [Contact(1, 30, 1.0), Contact(2, 10, 0.4), Contact(3, 20, 0.1), Contact(1, 5, 0.2)]:
+            contact_map.add(c)
+        short_range = contact_map.short_range
+        self.assertEqual([(2, 10)], [c.id for c in short_range])
+        self.assertTrue(short_range[0] is contact_map[(2, 10)])
+        self.assertEqual(4, len(contact_map))
+
+    def test_short_range_2(self):
+        contact_map = ContactMap('test')
+        for c in [Contact(1, 30, 1.0), Contact(2, 10, 0.4), Contact(3, 20, 0.1), Contact(1, 5, 0.2)]:
+            contact_map.add(c)
+        short_range = contact_map.short_range
+        top = contact_map[:2]
+        contact_map.rescale(inplace=True)
+        contact_map.reindex(5, inplace=True)
+        self.assertEqual([0.4], [c.raw_score for c in short_range])
+        self.assertEqual([(2, 10)], [c.id for c in short_range])
+        self.assertEqual([(1, 30), (2, 10)], [c.id for c in top])
+        self.assertEqual([1.0, 0.4], [c.raw_score for c in top])
+        self.assertEqual([(5, 34), (6, 14), (7, 24), (5, 9)], [c.id for c in contact_map])
+
+    def test_medium_range_1(self):
+        contact_map = ContactMap('test')
+        for c in [Contact(1, 30, 1.0), Contact(2, 10, 0.4), Contact(3, 20, 0.1), Contact(1, 5, 0.2)]:
+            contact_map.add(c)
+        self.assertEqual([(3, 20)], [c.id for c in contact_map.medium_range])
+        contact_map.sort('raw_score', inplace=True)
+        self.assertEqual([(3, 20)], [c.id for c in contact_map.medium_range])
+
+    def test_long_range_1(self):
+        contact_map = ContactMap('test')
+        for c in [Contact(1, 30, 1.0), Contact(2, 10, 0.4), Contact(3, 20, 0.1), Contact(1, 5, 0.2)]:
+            contact_map.add(c)
+        long_range = contact_map.long_range
+        self.assertEqual([(1, 30)], [c.id for c in long_range])
+        long_range.reindex(5, inplace=True)
+        self.assertEqual([(5, 34)], [c.id for c in long_range])
+        self.assertEqual((1, 30), contact_map[0].id)
+        self.assertEqual([(1, 30)], [c.id for c in contact_map.long_range])
+
     def test_rescale_1(self):
         contact_map = ContactMap('test')
         for c in [Contact(1, 5, 1.0), Contact(3, 3, 0.4), Contact(2, 4, 0.1), Contact(5, 1, 0.2)]:
@@ -1077,6 +1288,15 @@ class TestContactMap(unittest.TestCase):
         reindexed = contact_map.reindex(1)
         self.assertListEqual([[1, 26], [2, 6], [3, 16], [1, 6]], contact_map.reindex(1).as_list())
 
+    def test_reindex_view_1(self):
+        contact_map = ContactMap("test")
+        for c in [Contact(5, 30, 1.0), Contact(6, 10, 0.4), Contact(7, 20, 0.1), Contact(5, 10, 0.2)]:
+            contact_map.add(c)
+        view = contact_map[:2]
+        view.reindex(1, inplace=True)
+        self.assertListEqual([[1, 26], [2, 6]], view.as_list())
+        self.assertListEqual([[5, 30], [6, 10], [7, 20], [5, 10]], contact_map.as_list())
+
     def test_reindex_2(self):
         contact_map = ContactMap("test")
         for c in [Contact(5, 30, 1.0), Contact(6, 10, 0.4), Contact(7, 20, 0.1), Contact(5, 10, 0.2)]:
@@ -1169,6 +1389,90 @@ class TestContactMap(unittest.TestCase):
         contact_map.remove_false_negatives(inplace=True)
         self.assertListEqual([[1, 5], [1, 6], [2, 7], [3, 5], [2, 8]], contact_map.as_list())
 
+    def test_top_k_1(self):
+        contact_map = ContactMap('test')
+        for c in [Contact(1, 10, 0.1), Contact(2, 20, 0.5), Contact(3, 30, 0.1), Contact(4, 40, 0.5), Contact(5, 9, 0.1)]:
+            contact_map.add(c)
+        top = contact_map.top_k(3)
+        self.assertEqual([(2, 20), (4, 40), (1, 10)], [c.id for c in top])
+        self.assertEqual(5, len(contact_map))
+        self.assertTrue(top[0] is contact_map[(2, 20)])
+
+    def test_top_k_2(self):
+        contact_map = ContactMap('test')
+        for c in [Contact(1, 10, 0.1), Contact(2, 20, 0.5), Contact(3, 30, 0.1), Contact(4, 40, 0.5), Contact(5, 9, 0.9)]:
+            contact_map.add(c)
+        top = contact_map.top_k(3, min_separation=5)
+        self.assertEqual([(2, 20), (4, 40), (1, 10)], [c.id for c in top])
+        self.assertEqual([(5, 9), (2, 20)], [c.id for c in contact_map.top_k(2)])
+        self.assertEqual([], [c.id for c in contact_map.top_k(0)])
+        self.assertEqual(5, len(contact_map.top_k(10)))
+
+    def test_top_k_3(self):
+        contact_map = ContactMap('test')
+        for c in [Contact(1, 10, 0.1), Contact(2, 20, 0.5), Contact(3, 30, 0.1)]:
+            contact_map.add(c)
+        with self.assertRaises(ValueError):
+            contact_map.top_k(-1)
+        with self.assertRaises(ValueError):
+            contact_map.top_k(1, key='foo')
+
+    def test_top_k_4(self):
+        import random
+        random.seed(1)
+        contact_map = ContactMap('test')
+        for i in range(1, 200):
+            contact_map.add(Contact(i, i + random.randint(1, 40), random.randint(0, 20) / 20.))
+        for k in [1, 17, 50, 199]:
+            expected = contact_map.remove_neighbors(min_distance=6).sort('raw_score', reverse=True)[:k]
+            self.assertEqual([c.id for c in expected], [c.id for c in contact_map.top_k(k, min_separation=6)])
+
+    def test_to_dense_1(self):
+        contact_map = ContactMap('test')
+        for c in [Contact(1, 3, 0.5), Contact(2, 4, 0.2), Contact(4, 4, 0.1)]:
+            contact_map.add(c)
+        contact_map[(2, 4)].weight = 2.0
+        self.assertEqual([[0.0, 0.0, 0.5, 0.0], [0.0, 0.0, 0.0, 0.2], [0.5, 0.0, 0.0, 0.0], [0.0, 0.2, 0.0, 0.1]],
+                         contact_map.to_dense().tolist())
+        self.assertEqual([[0.0, 0.0, 1.0, 0.0, 0.0], [0.0, 0.0, 0.0, 2.0, 0.0], [0.0, 0.0, 0.0, 0.0, 0.0],
+                          [0.0, 0.0, 0.0, 1.0, 0.0], [0.0, 0.0, 0.0, 0.0, 0.0]],
+                         contact_map.to_dense(field='weight', length=5, symmetric=False).tolist())
+        self.assertEqual((0, 0), ContactMap('empty').to_dense().shape)
+        with self.assertRaises(ValueError):
+            contact_map.to_dense(field='foo')
+
+    def test_to_sparse_1(self):
+        contact_map = ContactMap('test')
+        for c in [Contact(1, 3, 0.5), Contact(2, 4, 0.2), Contact(4, 4, 0.1)]:
+            contact_map.add(c)
+        self.assertEqual(contact_map.to_dense().tolist(), contact_map.to_sparse().toarray().tolist())
+        csr = contact_map.to_sparse(symmetric=False, format='csr')
+        self.assertEqual('csr', csr.format)
+        self.assertEqual(3, csr.nnz)
+        self.assertEqual(contact_map.to_dense(symmetric=False).tolist(), csr.toarray().tolist())
+
+    def test_from_dense_1(self):
+        mat = [[0.0, 0.9, 0.3, 0.4], [0.9, 0.0, 0.2, 0.7], [0.3, 0.2, 0.0, 0.1], [0.4, 0.7, 0.1, 0.0]]
+        contact_map = ContactMap.from_dense('test', mat)
+        self.assertEqual(ContactMap, type(contact_map))
+        self.assertEqual(10, contact_map.ncontacts)
+        self.assertEqual([(1, 2), (2, 4), (1, 4), (1, 3), (2, 3)], [c.id for c in contact_map][:5])
+        contact_map = ContactMap.from_dense('test', mat, min_separation=2, top_k=2)
+        self.assertEqual([(2, 4), (1, 4)], [c.id for c in contact_map])
+        self.assertEqual([0.7, 0.4], [c.raw_score for c in contact_map])
+        with self.assertRaises(ValueError):
+            ContactMap.from_dense('test', [[0.0, 1.0]])
+
+    def test_from_sparse_1(self):
+        from scipy import sparse
+        mat = sparse.coo_matrix(([0.5, 0.5, 0.2, 0.1], ([0, 2, 1, 3], [2, 0, 3, 3])), shape=(4, 4))
+        contact_map = ContactMap.from_sparse('test', mat)
+        self.assertEqual([(1, 3), (2, 4), (4, 4)], [c.id for c in contact_map])
+        contact_map = ContactMap.from_sparse('test', mat.tocsr(), min_separation=1, top_k=1)
+        self.assertEqual([(1, 3)], [c.id for c in contact_map])
+        with self.assertRaises(ValueError):
+            ContactMap.from_sparse('test', sparse.coo_matrix((2, 3)))
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
@@ -104,6 +104,82 @@ class TestEntity(unittest.TestCase):
         self.assertEqual(5, len(new_entity))
         self.assertEqual(['foo_1', 'foo_3', 'foo_5', 'foo_7', 'foo_9'], [e.id for e in new_entity])
 
+    def test_getitem_8(self):
+        entity = Entity('test')
+        for i in range(5):
+            entity.add(Entity('foo_{0}'.format(i)))
+        view = entity[1:3]
+        self.assertTrue(view[0] is entity[1])
+        self.assertTrue(view['foo_2'] is entity['foo_2'])
+        self.assertTrue(view[0].parent is entity)
+        view.remove('foo_1')
+        self.assertEqual(['foo_2'], [e.id for e in view])
+        self.assertEqual(5, len(entity))
+        self.assertTrue(entity[1].parent is entity)
+
+    def test_getitem_9(self):
+        entity = Entity('test')
+        for i in range(5):
+            entity.add(Entity('foo_{0}'.format(i)))
+        view = entity[:2]
+        owned = view._inplace(True)
+        self.assertTrue(owned is view)
+        self.assertFalse(view[0] is entity[0])
+        self.assertTrue(view[0].parent is view)
+        self.assertEqual(['foo_0', 'foo_1'], [e.id for e in view])
+
+    def test_getitem_10(self):
+        entity = Entity('test')
+        for i in range(5):
+            entity.add(Entity('foo_{0}'.format(i)))
+        view = entity[:2]
+        shared = view[0]
+        self.assertTrue(entity._inplace(True) is entity)
+        self.assertTrue(entity[0] is shared)
+        self.assertFalse(view[0] is shared)
+        self.assertTrue(shared.parent is entity)
+        self.assertTrue(view[0].parent is view)
+        self.assertEqual(['foo_0', 'foo_1'], [e.id for e in view])
+        self.assertEqual(['foo_0', 'foo_1', 'foo_2', 'foo_3', 'foo_4'], [e.id for e in entity])
+
+    def test_keep_1(self):
+        entity = Entity('test')
+        for i in range(5):
+            entity.add(Entity('foo_{0}'.format(i)))
+        removed = entity[1]
+        entity.keep([True, False, True, True, False])
+        self.assertEqual(['foo_0', 'foo_2', 'foo_3'], [e.id for e in entity])
+        self.assertEqual(['foo_0', 'foo_2', 'foo_3'], sorted(entity.child_dict.keys()))
+        self.assertIsNone(removed.parent)
+
+    def test_keep_2(self):
+        entity = Entity('test')
+        entity.add(Entity('foo'))
+        with self.assertRaises(ValueError):
+            entity.keep([True, False])
+
+    def test_drop_1(self):
+        entity = Entity('test')
+        for i in range(5):
+            entity.add(Entity('foo_{0}'.format(i)))
+        entity.drop(['foo_1', 'foo_4'])
+        self.assertEqual(['foo_0', 'foo_2', 'foo_3'], [e.id for e in entity])
+        self.assertFalse('foo_1' in entity)
+
+    def test_drop_2(self):
+        entity = Entity('test')
+        entity.add(Entity((1, 2)))
+        entity.add(Entity((2, 3)))
+        entity.drop([[1, 2]])
+        self.assertEqual([(2, 3)], [e.id for e in entity])
+
+    def test_drop_3(self):
+        entity = Entity('test')
+        entity.add(Entity('foo'))
+        with self.assertRaises(KeyError):
+            entity.drop(['bar'])
+        self.assertEqual(['foo'], [e.id for e in entity])
+
     def test_iter_1(self):
         entity = Entity('test')
         for i in range(10):
@@ -0,0 +1,91 @@
+"""Testing facility for conkit.core.Matcher"""
+
+__author__ = "Felix Simkovic"
+__date__ = "18 Oct 2018"
+
+import unittest
+
+from conkit.core.aligner import Aligner
+from conkit.core.contact import Contact
+from conkit.core.contactmap import ContactMap
+from conkit.core.mappings import ContactMatchState
+from conkit.core.matcher import Matcher
+from conkit.core.sequence import Sequence
+
+TP = ContactMatchState.true_positive.value
+FP = ContactMatchState.false_positive.value
+UNK = ContactMatchState.unknown.value
+FN = ContactMatchState.false_negative.value
+
+
+class TestMatcher(unittest.TestCase):
+    def _reference(self):
+        contact_map = ContactMap('bar')
+        for params in [(1, 5, 1.0), (1, 7, 1.0), (2, 7, 1.0), (3, 4, 1.0)]:
+            contact = Contact(*params)
+            contact.res1_altseq = params[0]
+            contact.res2_altseq = params[1]
+            contact.status = TP
+            contact_map.add(contact)
+        contact_map.sequence = Sequence('bar', 'AICDEFG')
+        contact_map.set_sequence_register(altloc=True)
+        return contact_map
+
+    def _prediction(self, pairs):
+        contact_map = ContactMap('foo')
+        for params in pairs:
+            contact_map.add(Contact(*params))
+        contact_map.sequence = Sequence('foo', 'AICDEFGH')
+        contact_map.set_sequence_register()
+        return contact_map
+
+    def test_match_1(self):
+        matcher = Matcher(self._reference())
+        prediction = self._prediction([(1, 5, 1.0), (1, 6, 1.0), (2, 7, 1.0), (3, 5, 1.0), (2, 8, 1.0)])
+        matched = matcher.match(prediction)
+        self.assertEqual([TP, FP, TP, FP, UNK], [c.status for c in matched])
+        self.assertEqual([UNK, UNK, UNK, UNK, UNK], [c.status for c in prediction])
+        self.assertEqual([[1, 5], [1, 6], [2, 7], [3, 5], [2, 8]], matched.as_list())
+
+    def test_match_2(self):
+        reference = self._reference()
+        matcher = Matcher(reference)
+        for pairs in ([(1, 5, 1.0), (1, 6, 1.0), (2, 7, 1.0), (3, 5, 1.0), (2, 8, 1.0)],
+                      [(1, 7, 0.9), (3, 4, 0.8), (2, 6, 0.7)],
+                      [(1, 5, 1.0), (1, 6, 1.0), (2, 7, 1.0), (3, 5, 1.0), (2, 8, 1.0)]):
+            for kwargs in (dict(), dict(add_false_negatives=True), dict(remove_unmatched=True), dict(renumber=True)):
+                matched = matcher.match(self._prediction(pairs), **kwargs)
+                expected = self._prediction(pairs).match(self._reference(), **kwargs)
+                self.assertEqual([c.status for c in expected], [c.status for c in matched])
+                self.assertEqual(expected.as_list(), matched.as_list())
+                self.assertEqual([c.res1_seq for c in expected], [c.res1_seq for c in matched])
+                self.assertEqual([c.res2_seq for c in expected], [c.res2_seq for c in matched])
+        self.assertEqual([[1, 5], [1, 7], [2, 7], [3, 4]], reference.as_list())
+        self.assertEqual([1, 1, 2, 3], [c.res1_altseq for c in reference])
+
+    def test_match_3(self):
+        matcher = Matcher(self._reference())
+        matched = matcher.match(self._prediction([(1, 5, 1.0), (1, 6, 1.0)]), add_false_negatives=True)
+        self.assertEqual([TP, FP, FN, FN, FN], [c.status for c in matched])
+        self.assertEqual([[1, 5], [1, 6], [1, 7], [2, 7], [3, 4]], matched.as_list())
+
+    def test_match_4(self):
+        aligner = Aligner()
+        matcher = Matcher(self._reference(), aligner=aligner)
+        matcher.match(self._prediction([(1, 5, 1.0), (1, 6, 1.0)]))
+        self.assertEqual(4, len(aligner._cache))
+        matcher.match(self._prediction([(1, 6, 0.3), (1, 5, 0.2)]))
+        self.assertEqual(4, len(aligner._cache))
+        matcher.match(self._prediction([(1, 6, 1.0), (2, 5, 1.0)]))
+        self.assertEqual(6, len(aligner._cache))
+
+    def test_match_5(self):
+        matcher = Matcher(self._reference())
+        prediction = self._prediction([(1, 5, 1.0), (1, 6, 1.0), (2, 7, 1.0)])
+        matched = matcher.match(prediction, inplace=True)
+        self.assertIs(prediction, matched)
+        self.assertEqual([TP, FP, TP], [c.status for c in prediction])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
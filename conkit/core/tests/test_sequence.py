@@ -19,6 +19,35 @@ class TestSequence(unittest.TestCase):
         sequence.remark = 'baz'
         self.assertEqual(['bar', 'baz'], sequence.remark)
 
+    def test_remark_3(self):
+        sequence = Sequence('foo', 'GSMFTPK')
+        self.assertEqual([], sequence.remark)
+        sequence.remark.append('bar')
+        self.assertEqual(['bar'], sequence.remark)
+
+    def test_multiplicity_1(self):
+        sequence = Sequence('foo', 'GSMFTPK')
+        self.assertEqual(1, sequence.multiplicity)
+        sequence.multiplicity = 3
+        self.assertEqual(3, sequence.multiplicity)
+        self.assertEqual(3, sequence.copy().multiplicity)
+
+    def test_multiplicity_2(self):
+        sequence = Sequence('foo', 'GSMFTPK')
+        with self.assertRaises(ValueError):
+            sequence.multiplicity = 0
+        with self.assertRaises(ValueError):
+            sequence.multiplicity = 1.5
+
+    def test_copy_1(self):
+        sequence = Sequence('foo', 'GSMFTPK')
+        sequence.remark = 'bar'
+        sequence_copy = sequence.deepcopy()
+        sequence_copy.remark = 'baz'
+        self.assertEqual(['bar'], sequence.remark)
+        self.assertEqual(['bar', 'baz'], sequence_copy.remark)
+        self.assertFalse(hasattr(sequence, 'child_list'))
+
     def test_seq_1(self):
         sequence = Sequence('foo', 'GSMFTPK')
         self.assertEqual('foo', sequence.id)
@@ -39,6 +68,15 @@ class TestSequence(unittest.TestCase):
         sequence = Sequence('foo', 'GSMFTPK')
         sequence.seq = '-------'
 
+    def test_seq_5(self):
+        sequence = Sequence('foo', 'GSMFTPK')
+        sequence.seq = 'gsm-ftpk'
+        self.assertEqual('gsm-ftpk', sequence.seq)
+        for seq in ['A.A', 'A A', u'A\xe9A']:
+            with self.assertRaises(KeyError):
+                sequence.seq = seq
+        self.assertEqual('gsm-ftpk', sequence.seq)
+
     def test_seq_ascii_1(self):
         sequence = Sequence('foo', 'GSMFTPK')
         self.assertEqual([71, 83, 77, 70, 84, 80, 75], list(sequence.seq_ascii))
@@ -54,6 +92,10 @@ class TestSequence(unittest.TestCase):
             [1, 21, 2, 3, 4, 5, 6, 7, 8, 21, 9, 10, 11, 12, 21, 13, 14, 15, 16, 17, 21, 18, 19, 21, 20, 21],
             list(sequence.seq_encoded))
 
+    def test_seq_encoded_2(self):
+        sequence = Sequence('foo', 'AC-ac')
+        self.assertEqual([1, 2, 21, 21, 21], sequence.seq_encoded)
+
     def test_seq_len_1(self):
         sequence = Sequence('foo', 'GSMFTPK')
         self.assertEqual('foo', sequence.id)
@@ -70,6 +112,15 @@ class TestSequence(unittest.TestCase):
         self.assertEqual('AAAAAAAAAA', sequence.seq)
         self.assertEqual(10, sequence.seq_len)
 
+    def test_align_global_1(self):
+        sequence1 = Sequence('foo', 'GSMFTPK')
+        sequence2 = Sequence('bar', 'SMFTK')
+        aligned1, aligned2 = sequence1.align_global(sequence2)
+        self.assertEqual('GSMFTPK', aligned1.seq)
+        self.assertEqual('-SMFT-K', aligned2.seq)
+        self.assertEqual('GSMFTPK', sequence1.seq)
+        self.assertEqual('SMFTK', sequence2.seq)
+
     def test_align_local_1(self):
         sequence1 = Sequence('foo', 'GSMFTPKPPQDSAVIKAGYCVKQGAVMKNWKRRYFQLDENTI'
                              'GYFKSELEKEPLRVIPLKEVHKVQECKQSDIMMRDNLFEIVT'
@@ -3,6 +3,10 @@
 __author__ = "Felix Simkovic"
 __date__ = "12 Aug 2016"
 
+import numpy as np
+import os
+import shutil
+import tempfile
 import unittest
 
 from conkit.core.sequence import Sequence
@@ -19,6 +23,31 @@ class TestSequenceFile(unittest.TestCase):
         self.assertEqual([45, 67, 67, 45, 67, 45], list(matrix)[1])
         self.assertEqual([68, 68, 68, 68, 68, 68], list(matrix)[2])
 
+    def test_ascii_matrix_2(self):
+        sequence_file = SequenceFile('test')
+        for seq in [Sequence('foo', 'AAAAAA'), Sequence('bar', '-CC-C-')]:
+            sequence_file.add(seq)
+        self.assertEqual([65, 65, 65, 65, 65, 65], sequence_file.ascii_matrix[0])
+        sequence_file['foo'].seq = 'DDDDDD'
+        self.assertEqual([68, 68, 68, 68, 68, 68], sequence_file.ascii_matrix[0])
+        sequence_file.add(Sequence('doe', 'EEEEEE'))
+        self.assertEqual(3, len(sequence_file.ascii_matrix))
+        sequence_file.remove('bar')
+        self.assertEqual([[68, 68, 68, 68, 68, 68], [69, 69, 69, 69, 69, 69]], sequence_file.ascii_matrix)
+
+    def test_ascii_matrix_3(self):
+        sequence_file = SequenceFile('test')
+        for seq in [Sequence('foo', 'AAAAAA'), Sequence('bar', 'CC')]:
+            sequence_file.add(seq)
+        self.assertEqual([[65, 65, 65, 65, 65, 65], [67, 67]], sequence_file.ascii_matrix)
+        self.assertEqual([], SequenceFile('test').ascii_matrix)
+
+    def test_encoded_matrix_1(self):
+        sequence_file = SequenceFile('test')
+        for seq in [Sequence('foo', 'ACDEFG'), Sequence('bar', '-CC-c-')]:
+            sequence_file.add(seq)
+        self.assertEqual([[1, 2, 3, 4, 5, 6], [21, 2, 2, 21, 21, 21]], sequence_file.encoded_matrix)
+
     def test_is_alignment_1(self):
         sequence_file = SequenceFile('test')
         sequence_file.add(Sequence('foo', 'AAAAA'))
@@ -31,6 +60,55 @@ class TestSequenceFile(unittest.TestCase):
         sequence_file.add(Sequence('bar', 'CCCC'))
         self.assertFalse(sequence_file.is_alignment)
 
+    def test_is_alignment_3(self):
+        sequence_file = SequenceFile('test')
+        sequence_file.add(Sequence('foo', 'AAAAA'))
+        sequence_file.add(Sequence('bar', 'CCCC'))
+        self.assertFalse(sequence_file.is_alignment)
+        sequence_file['bar'].seq = 'CCCCC'
+        self.assertTrue(sequence_file.is_alignment)
+        sequence_file.add(Sequence('doe', 'DDD'))
+        self.assertFalse(sequence_file.is_alignment)
+        sequence_file.remove('doe')
+        self.assertTrue(sequence_file.is_alignment)
+        sequence_file.trim(1, 3, inplace=True)
+        self.assertTrue(sequence_file.is_alignment)
+        sequence_file.keep([False, True])
+        sequence_file['bar'].seq = 'C'
+        self.assertTrue(sequence_file.is_alignment)
+
+    def test_is_alignment_4(self):
+        sequence_file = SequenceFile('test')
+        sequence_file.add(Sequence('foo', 'AAAAA'))
+        sequence_file.add(Sequence('bar', 'CCCC'))
+        view = sequence_file[1:]
+        self.assertTrue(view.is_alignment)
+        view.add(Sequence('doe', 'DDDDD'))
+        self.assertFalse(view.is_alignment)
+        self.assertFalse(sequence_file.is_alignment)
+        sequence_copy = sequence_file.copy()
+        sequence_copy['bar'].seq = 'CCCCC'
+        self.assertTrue(sequence_copy.is_alignment)
+        self.assertFalse(sequence_file.is_alignment)
+
+    def test_is_alignment_5(self):
+        sequence_file = SequenceFile('test')
+        for s in [Sequence('foo', 'AAAAA'), Sequence('bar', 'CCCC'), Sequence('doe', 'DDD')]:
+            sequence_file.add(s)
+        self.assertEqual({5: 1, 4: 1, 3: 1}, sequence_file._lengths)
+        sequence_file['bar'].seq = 'CCCCC'
+        self.assertEqual({5: 2, 3: 1}, sequence_file._lengths)
+        sequence_file['bar'].multiplicity = 2
+        self.assertEqual({5: 2, 3: 1}, sequence_file._lengths)
+        sequence_file.drop(['doe'])
+        self.assertEqual({5: 2}, sequence_file._lengths)
+        self.assertTrue(sequence_file.is_alignment)
+        sequence_file.keep([False, True])
+        self.assertEqual({5: 1}, sequence_file._lengths)
+        with self.assertRaises(ValueError):
+            sequence_file.keep([True, True])
+        self.assertEqual({5: 1}, sequence_file._lengths)
+
     def test_empty_1(self):
         sequence_file = SequenceFile("test")
         self.assertTrue(sequence_file.empty)
@@ -192,6 +270,187 @@ class TestSequenceFile(unittest.TestCase):
             sequence_file.add(s)
         self.assertEqual(5, sequence_file.meff)
 
+    def test_get_weights_7(self):
+        np.random.seed(0)
+        X = np.frombuffer(b'ACDEFGHIKLMNPQRSTVWY-', dtype=np.uint8)[np.random.randint(0, 3, (150, 37))]
+        sequence_file = SequenceFile('test')
+        for i, row in enumerate(X):
+            sequence_file.add(Sequence(str(i), row.tobytes().decode('ascii')))
+        for identity in (0.0, 0.5, 0.8):
+            counts = ((X[:, None] != X[None, :]).sum(axis=2) < (1.0 - identity) * X.shape[1]).sum(axis=1)
+            self.assertEqual((1.0 / counts).tolist(), sequence_file.get_weights(identity=identity))
+
+    def test_get_weights_8(self):
+        sequence_file = SequenceFile('test')
+        for s in [
+                Sequence('foo', 'AAAAAAA'),
+                Sequence('bar', 'AA-ACA-'),
+                Sequence('cho', 'AAADCAA'),
+                Sequence('doo', 'C-CAA--'),
+                Sequence('miu', 'CCCCCCC'),
+                Sequence('nop', 'AAAAAAB')
+        ]:
+            sequence_file.add(s)
+        weights = sequence_file.get_weights(identity=0.6, method='sampled', seed=0)
+        self.assertEqual(weights, [0.3333333333333333, 1.0, 0.5, 1.0, 1.0, 0.5])
+
+    def test_get_weights_9(self):
+        np.random.seed(0)
+        X = np.frombuffer(b'ACDEFGHIKLMNPQRSTVWY-', dtype=np.uint8)[np.random.randint(0, 2, (1000, 12))]
+        sequence_file = SequenceFile('test')
+        for i, row in enumerate(X):
+            sequence_file.add(Sequence(str(i), row.tobytes().decode('ascii')))
+        weights = sequence_file.get_weights(method='sampled', rel_error=0.05, seed=1)
+        self.assertEqual(1000, len(weights))
+        self.assertEqual(weights, sequence_file.get_weights(method='sampled', rel_error=0.05, seed=1))
+        self.assertAlmostEqual(1.0, sum(weights) / sum(sequence_file.get_weights()), delta=0.05)
+
+    def test_get_weights_10(self):
+        sequence_file = SequenceFile('test')
+        sequence_file.add(Sequence('foo', 'AAAAAAA'))
+        with self.assertRaises(ValueError):
+            sequence_file.get_weights(method='unknown')
+
+    def test_get_weights_11(self):
+        sequence_file = SequenceFile('test')
+        for s in [Sequence('foo', 'AAAAAAA'), Sequence('bar', 'AAAAAAA'), Sequence('cho', 'CCCCCCC')]:
+            sequence_file.add(s)
+        self.assertEqual([0.5, 0.5, 1.0], sequence_file.get_weights())
+        self.assertEqual([0.5, 0.5, 1.0], sequence_file.get_weights())
+        sequence_file['cho'].seq = 'AAAAAAA'
+        self.assertEqual([1 / 3., 1 / 3., 1 / 3.], sequence_file.get_weights())
+        sequence_file['foo'].multiplicity = 2
+        self.assertEqual([0.5, 0.25, 0.25], sequence_file.get_weights())
+
+    def test_get_weights_12(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        sequence_file = SequenceFile('test')
+        sequence_file.cache_dir = cache_dir
+        for s in [Sequence('foo', 'AAAAAAA'), Sequence('bar', 'AAAAAAA'), Sequence('cho', 'CCCCCCC')]:
+            sequence_file.add(s)
+        self.assertEqual([0.5, 0.5, 1.0], sequence_file.get_weights())
+        f_cache = os.path.join(cache_dir, sequence_file.fingerprint + '_weights_0.8.npy')
+        self.assertTrue(os.path.isfile(f_cache))
+        np.save(f_cache, np.array([1.0, 2.0, 3.0]))
+        sequence_file = sequence_file.deepcopy()
+        sequence_file._invalidate()
+        self.assertEqual([1.0, 2.0, 3.0], sequence_file.get_weights())
+        self.assertEqual([0.5, 0.5, 1.0], sequence_file.get_weights(identity=0.9))
+
+    def test_get_weights_13(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        self.addCleanup(os.environ.pop, 'CONKIT_CACHE_DIR', None)
+        os.environ['CONKIT_CACHE_DIR'] = cache_dir
+        sequence_file = SequenceFile('test')
+        for s in [Sequence('foo', 'AAAAAAA'), Sequence('bar', 'CCCCCCC')]:
+            sequence_file.add(s)
+        other = sequence_file.deepcopy()
+        other.cache_dir = os.path.join(cache_dir, 'other')
+        self.assertIsNone(sequence_file.cache_dir)
+        self.assertEqual([1.0, 1.0], sequence_file.get_weights())
+        self.assertEqual([1.0, 1.0], other.get_weights())
+        f_cache = sequence_file.fingerprint + '_weights_0.8.npy'
+        self.assertTrue(os.path.isfile(os.path.join(cache_dir, f_cache)))
+        self.assertTrue(os.path.isfile(os.path.join(cache_dir, 'other', f_cache)))
+
+    def test_fingerprint_1(self):
+        sequence_file = SequenceFile('test')
+        for s in [Sequence('foo', 'AAAAAAA'), Sequence('bar', 'CCCCCCC')]:
+            sequence_file.add(s)
+        fingerprint = sequence_file.fingerprint
+        self.assertEqual(fingerprint, sequence_file.fingerprint)
+        self.assertEqual(fingerprint, sequence_file.deepcopy().fingerprint)
+        sequence_file['bar'].multiplicity = 2
+        self.assertNotEqual(fingerprint, sequence_file.fingerprint)
+        sequence_file['bar'].multiplicity = 1
+        self.assertEqual(fingerprint, sequence_file.fingerprint)
+        sequence_file['bar'].seq = 'CCCCCCA'
+        self.assertNotEqual(fingerprint, sequence_file.fingerprint)
+
+    def test_fingerprint_2(self):
+        sequence_file = SequenceFile('test')
+        for s in [Sequence('foo', 'AAAAAAAC'), Sequence('bar', 'CCCCCCC')]:
+            sequence_file.add(s)
+        other = SequenceFile('test')
+        for s in [Sequence('foo', 'AAAAAAA'), Sequence('bar', 'CCCCCCCC')]:
+            other.add(s)
+        self.assertNotEqual(sequence_file.fingerprint, other.fingerprint)
+
+    def test_estimate_meff_1(self):
+        np.random.seed(0)
+        X = np.frombuffer(b'ACDEFGHIKLMNPQRSTVWY-', dtype=np.uint8)[np.random.randint(0, 2, (1000, 12))]
+        sequence_file = SequenceFile('test')
+        for i, row in enumerate(X):
+            sequence_file.add(Sequence(str(i), row.tobytes().decode('ascii')))
+        meff, lower, upper = sequence_file.estimate_meff(rel_error=0.05, seed=1)
+        self.assertTrue(lower <= meff <= upper)
+        self.assertLessEqual(upper - meff, 0.05 * meff)
+        self.assertTrue(lower <= sum(sequence_file.get_weights()) <= upper)
+
+    def test_estimate_meff_2(self):
+        sequence_file = SequenceFile('test')
+        for s in [Sequence('foo', 'AAAAAAA'), Sequence('bar', 'AAAAAAC'), Sequence('cho', 'CCCCCCC')]:
+            sequence_file.add(s)
+        self.assertEqual((2.0, 2.0, 2.0), sequence_file.estimate_meff(seed=0))
+
+    def test_deduplicate_1(self):
+        sequence_file = SequenceFile('test')
+        for s in [
+                Sequence('foo', 'AAAAAA'),
+                Sequence('bar', 'AAAAAC'),
+                Sequence('cho', 'AAAAAA'),
+                Sequence('doo', 'AAAAAC'),
+                Sequence('miu', 'AAAAAA')
+        ]:
+            sequence_file.add(s)
+        deduplicated = sequence_file.deduplicate()
+        self.assertEqual(['foo', 'bar'], [s.id for s in deduplicated])
+        self.assertEqual([3, 2], [s.multiplicity for s in deduplicated])
+        self.assertEqual([1] * 5, [s.multiplicity for s in sequence_file])
+        self.assertEqual(sum(sequence_file.get_weights()), sum(deduplicated.get_weights()))
+        self.assertEqual([5, 5, 5, 5, 5, 3], deduplicated.get_frequency('A'))
+
+    def test_deduplicate_2(self):
+        np.random.seed(0)
+        X = np.frombuffer(b'ACDEFGHIKLMNPQRSTVWY-', dtype=np.uint8)[np.random.randint(0, 2, (300, 8))]
+        sequence_file = SequenceFile('test')
+        for i, row in enumerate(X):
+            sequence_file.add(Sequence(str(i), row.tobytes().decode('ascii')))
+        weights = sequence_file.get_weights(identity=0.7)
+        deduplicated = sequence_file.deduplicate()
+        self.assertEqual(len(set(s.seq for s in sequence_file)), deduplicated.nseq)
+        self.assertEqual(300, sum(s.multiplicity for s in deduplicated))
+        self.assertAlmostEqual(sum(weights), sum(deduplicated.get_weights(identity=0.7)))
+        deduplicated.deduplicate(inplace=True)
+        self.assertAlmostEqual(sum(weights), sum(deduplicated.get_weights(identity=0.7)))
+
+    def test_deduplicate_3(self):
+        sequence_file = SequenceFile('test')
+        for s in [
+                Sequence('foo', 'AAAAAAAAAA'),
+                Sequence('bar', 'CCCCCCCCCC'),
+                Sequence('cho', 'AAAAAAAAAC'),
+                Sequence('doo', 'CCCCCCCCAA'),
+                Sequence('miu', 'AAAAAAAAAC'),
+                Sequence('nop', 'AAAAAAAACC')
+        ]:
+            sequence_file.add(s)
+        deduplicated = sequence_file.deduplicate(identity=0.8, seed=0, inplace=True)
+        self.assertIs(sequence_file, deduplicated)
+        self.assertEqual(['foo', 'bar'], [s.id for s in deduplicated])
+        self.assertEqual([4, 2], [s.multiplicity for s in deduplicated])
+
+    def test_deduplicate_4(self):
+        sequence_file = SequenceFile('test')
+        for s in [Sequence('foo', 'AAAAAA'), Sequence('bar', 'AAAAA')]:
+            sequence_file.add(s)
+        with self.assertRaises(ValueError):
+            sequence_file.deduplicate()
+        with self.assertRaises(ValueError):
+            sequence_file.deduplicate(identity=1.5)
+
     def test_get_frequency_1(self):
         sequence_file = SequenceFile('test')
         for s in [Sequence('foo', 'AAAAAAA'), Sequence('bar', 'A-AAAA-'), Sequence('cho', '--AAA--')]:
@@ -210,6 +469,98 @@ class TestSequenceFile(unittest.TestCase):
             sequence_file.add(s)
         self.assertEqual([0, 0, 0, 0, 0, 0, 0], sequence_file.get_frequency("X"))
 
+    def test_get_frequency_4(self):
+        sequence_file = SequenceFile('test')
+        for s in [Sequence('foo', 'AAAAAAA'), Sequence('bar', 'A-AAAA-'), Sequence('cho', '--AAA--')]:
+            sequence_file.add(s)
+        view = sequence_file[1:]
+        self.assertEqual([1, 2, 0, 0, 0, 1, 2], view.get_frequency("X"))
+        view['bar'].seq = 'AAAAAAA'
+        self.assertEqual([1, 1, 0, 0, 0, 1, 1], view.get_frequency("X"))
+        self.assertEqual([1, 1, 0, 0, 0, 1, 1], sequence_file.get_frequency("X"))
+
+    def test_get_profile_1(self):
+        sequence_file = SequenceFile('test')
+        for s in [Sequence('foo', 'AAC-'), Sequence('bar', 'ACC-'), Sequence('cho', 'AYCB')]:
+            sequence_file.add(s)
+        profile = sequence_file.get_profile(weighted=False)
+        self.assertEqual((21, 4), profile.shape)
+        self.assertEqual([3, 1, 0, 0], profile[0].tolist())
+        self.assertEqual([0, 1, 3, 0], profile[1].tolist())
+        self.assertEqual([0, 1, 0, 0], profile[19].tolist())
+        self.assertEqual([0, 0, 0, 3], profile[20].tolist())
+        self.assertEqual([3, 3, 3, 3], profile.sum(axis=0).tolist())
+
+    def test_get_profile_2(self):
+        sequence_file = SequenceFile('test')
+        for s in [Sequence('foo', 'AAAAAA'), Sequence('bar', 'AAAAAC'), Sequence('cho', 'CCCCCC')]:
+            sequence_file.add(s)
+        profile = sequence_file.get_profile(weighted=True, identity=0.8)
+        self.assertEqual([1.0, 1.0, 1.0, 1.0, 1.0, 0.5], profile[0].tolist())
+        self.assertEqual([1.0, 1.0, 1.0, 1.0, 1.0, 1.5], profile[1].tolist())
+        self.assertEqual([2.0] * 6, profile.sum(axis=0).tolist())
+
+    def test_get_profile_3(self):
+        sequence_file = SequenceFile('test')
+        for s in [Sequence('foo', 'AAAAAA'), Sequence('bar', 'AAAAA')]:
+            sequence_file.add(s)
+        with self.assertRaises(ValueError):
+            sequence_file.get_profile()
+
+    def test_predict_contacts_1(self):
+        np.random.seed(0)
+        X = np.frombuffer(b'ACDEFGHIKLMNPQRSTVWY-', dtype=np.uint8)[np.random.randint(0, 21, (300, 10))]
+        X[:, 7] = X[:, 2]
+        sequence_file = SequenceFile('test')
+        for i, row in enumerate(X):
+            sequence_file.add(Sequence(str(i), row.tobytes().decode('ascii')))
+        for method in ('mi', 'cov'):
+            contact_map = sequence_file.predict_contacts(method=method)
+            self.assertEqual(45, contact_map.ncontacts)
+            self.assertEqual((1, 2), contact_map[0].id)
+            self.assertEqual((3, 8), contact_map.top_k(1)[0].id)
+
+    def test_predict_contacts_2(self):
+        np.random.seed(1)
+        X = np.frombuffer(b'ACDEFGHIKLMNPQRSTVWY-', dtype=np.uint8)[np.random.randint(0, 4, (50, 11))]
+        sequence_file = SequenceFile('test')
+        for i, row in enumerate(X):
+            sequence_file.add(Sequence(str(i), row.tobytes().decode('ascii')))
+        scores = [c.raw_score for c in sequence_file.predict_contacts(apc=False)]
+        blocked = [c.raw_score for c in sequence_file.predict_contacts(apc=False, block_size=3)]
+        self.assertTrue(np.allclose(scores, blocked))
+        self.assertTrue(all(score > 0 for score in scores))
+
+    def test_predict_contacts_3(self):
+        sequence_file = SequenceFile('test')
+        for s in [Sequence('foo', 'AAAAAA'), Sequence('bar', 'AAAAAC')]:
+            sequence_file.add(s)
+        with self.assertRaises(ValueError):
+            sequence_file.predict_contacts(method='unknown')
+
+    def test_predict_contacts_4(self):
+        sequence_file = SequenceFile('test')
+        for s in [Sequence('foo', 'ACDEF'), Sequence('bar', 'ACDEY'), Sequence('doe', 'ACDFF')]:
+            sequence_file.add(s)
+        contact_map = sequence_file.predict_contacts()
+        self.assertEqual('foo', contact_map.sequence.id)
+        self.assertEqual('ACDEF', contact_map.sequence.seq)
+        self.assertIsNot(sequence_file.top_sequence, contact_map.sequence)
+        self.assertEqual('ACDEF', contact_map.repr_sequence.seq)
+
+    def test_predict_contacts_5(self):
+        for query in ['AC-EF', 'acdeB']:
+            sequence_file = SequenceFile('test')
+            sequence_file.add(Sequence('foo', query))
+            for s in [Sequence('bar', 'ACDEY'), Sequence('cho', 'ACDFF'), Sequence('doe', 'CCDEF')]:
+                sequence_file.add(s)
+            contact_map = sequence_file.predict_contacts()
+            residues = dict((c.res1_seq, c.res1) for c in contact_map)
+            residues.update((c.res2_seq, c.res2) for c in contact_map)
+            expected = query.upper().replace('-', 'X').replace('B', 'X')
+            self.assertEqual(expected, ''.join(residues[i] for i in range(1, 6)))
+            self.assertEqual(query, contact_map.sequence.seq)
+
     def test_sort_1(self):
         sequence_file = SequenceFile('test')
         for seq in [Sequence('foo', 'AAAAA'), Sequence('bar', 'CCCCC'), Sequence('doe', 'DDDDD')]:
@@ -282,6 +633,121 @@ class TestSequenceFile(unittest.TestCase):
         self.assertEqual(['CD', 'DE', 'EF'], [s.seq for s in sequence_file_trimmed])
         self.assertNotEqual(sequence_file, sequence_file_trimmed)
 
+    def test_trim_5(self):
+        sequence_file = SequenceFile('test')
+        for seq in [Sequence('foo', 'ACDEF'), Sequence('bar', 'CDEFG'), Sequence('doe', 'DEFGH')]:
+            sequence_file.add(seq)
+        view = sequence_file[1:]
+        view.trim(2, 3, inplace=True)
+        self.assertEqual(['DE', 'EF'], [s.seq for s in view])
+        self.assertEqual(['ACDEF', 'CDEFG', 'DEFGH'], [s.seq for s in sequence_file])
+        self.assertEqual([[68, 69], [69, 70]], view.ascii_matrix)
+        view['bar'].seq = 'AA'
+        self.assertEqual([[65, 65], [69, 70]], view.ascii_matrix)
+
+    def test_remove_columns_1(self):
+        sequence_file = SequenceFile('test')
+        for seq in [Sequence('foo', 'ACDEF'), Sequence('bar', 'CDEFG'), Sequence('doe', 'DEFGH')]:
+            sequence_file.add(seq)
+        removed = sequence_file.remove_columns([True, False, True, False, False])
+        self.assertEqual(['CEF', 'DFG', 'EGH'], [s.seq for s in removed])
+        self.assertEqual(['ACDEF', 'CDEFG', 'DEFGH'], [s.seq for s in sequence_file])
+        sequence_file.remove_columns([True] * 5, inplace=True)
+        self.assertEqual(['', '', ''], [s.seq for s in sequence_file])
+        self.assertTrue(sequence_file.is_alignment)
+
+    def test_remove_columns_2(self):
+        sequence_file = SequenceFile('test')
+        for seq in [Sequence('foo', 'ACDEF'), Sequence('bar', 'CDEFG')]:
+            sequence_file.add(seq)
+        with self.assertRaises(ValueError):
+            sequence_file.remove_columns([True, False])
+        sequence_file.add(Sequence('doe', 'DEF'))
+        with self.assertRaises(ValueError):
+            sequence_file.remove_columns([True, False, True, False, False])
+
+    def test_filter_columns_1(self):
+        sequence_file = SequenceFile('test')
+        for seq in [Sequence('foo', 'A-C-E'), Sequence('bar', 'C-E-G'), Sequence('doe', 'D-FGH')]:
+            sequence_file.add(seq)
+        self.assertEqual(['ACE', 'CEG', 'DFH'], [s.seq for s in sequence_file.filter_columns(max_gap_fraction=0.5)])
+        self.assertEqual(['AC-E', 'CE-G', 'DFGH'], [s.seq for s in sequence_file.filter_columns(max_gap_fraction=0.7)])
+        sequence_file['doe'].multiplicity = 2
+        self.assertEqual(['AC-E', 'CE-G', 'DFGH'], [s.seq for s in sequence_file.filter_columns(max_gap_fraction=0.5)])
+        with self.assertRaises(ValueError):
+            sequence_file.filter_columns(max_gap_fraction=1.5)
+
+    def test_select_rows_1(self):
+        sequence_file = SequenceFile('test')
+        for seq in [Sequence('foo', 'ACDEF'), Sequence('bar', 'CDEFG'), Sequence('doe', 'DEFGH')]:
+            sequence_file.add(seq)
+        selected = sequence_file.select_rows([2, 0])
+        self.assertEqual(['doe', 'foo'], [s.id for s in selected])
+        self.assertEqual(['foo', 'bar', 'doe'], [s.id for s in sequence_file])
+        selected = sequence_file.select_rows([False, True, True])
+        self.assertEqual(['bar', 'doe'], [s.id for s in selected])
+        foo = sequence_file['foo']
+        sequence_file.ascii_matrix
+        sequence_file.select_rows([-1, 1], inplace=True)
+        self.assertEqual(['doe', 'bar'], [s.id for s in sequence_file])
+        self.assertEqual(['DEFGH', 'CDEFG'], [s.seq for s in sequence_file])
+        self.assertEqual([[68, 69, 70, 71, 72], [67, 68, 69, 70, 71]], sequence_file.ascii_matrix)
+        self.assertNotIn('foo', sequence_file.child_dict)
+        self.assertIsNone(foo.parent)
+
+    def test_select_rows_2(self):
+        sequence_file = SequenceFile('test')
+        for seq in [Sequence('foo', 'ACDEF'), Sequence('bar', 'CDEFG'), Sequence('doe', 'DEFGH')]:
+            sequence_file.add(seq)
+        with self.assertRaises(ValueError):
+            sequence_file.select_rows([True, False])
+        with self.assertRaises(ValueError):
+            sequence_file.select_rows([0, 0])
+        with self.assertRaises(IndexError):
+            sequence_file.select_rows([3])
+
+    def test_select_rows_3(self):
+        sequence_file = SequenceFile('test')
+        for seq in [Sequence('foo', 'ACDEF'), Sequence('bar', 'CDEFG'), Sequence('doe', 'DEFGH')]:
+            sequence_file.add(seq)
+        view = sequence_file[1:]
+        view.ascii_matrix
+        view.select_rows([1, 0], inplace=True)
+        self.assertEqual(['doe', 'bar'], [s.id for s in view])
+        self.assertFalse(view['bar'] is sequence_file['bar'])
+        self.assertTrue(view['bar'].parent is view)
+        self.assertTrue(sequence_file['bar'].parent is sequence_file)
+        self.assertEqual(['foo', 'bar', 'doe'], [s.id for s in sequence_file])
+        self.assertEqual([[68, 69, 70, 71, 72], [67, 68, 69, 70, 71]], view.ascii_matrix)
+
+    def test_subsample_1(self):
+        np.random.seed(0)
+        X = np.frombuffer(b'ACDEFGHIKLMNPQRSTVWY-', dtype=np.uint8)[np.random.randint(0, 3, (600, 10))]
+        sequence_file = SequenceFile('test')
+        for i, row in enumerate(X):
+            sequence_file.add(Sequence(str(i), row.tobytes().decode('ascii')))
+        meff = sum(sequence_file.get_weights())
+        for strategy in ('weighted', 'diverse', 'random'):
+            subsampled = sequence_file.subsample(meff / 2, strategy=strategy, seed=1, batch_size=64)
+            self.assertEqual('0', subsampled.top.id)
+            self.assertLess(subsampled.nseq, sequence_file.nseq)
+            self.assertGreaterEqual(sum(subsampled.get_weights()), meff / 2)
+            ids = [int(s.id) for s in subsampled]
+            self.assertEqual(sorted(ids), ids)
+        self.assertEqual(600, sequence_file.nseq)
+
+    def test_subsample_2(self):
+        sequence_file = SequenceFile('test')
+        for seq in [Sequence('foo', 'AAAAA'), Sequence('bar', 'AAAAA'), Sequence('doe', 'CCCCC')]:
+            sequence_file.add(seq)
+        self.assertEqual(['foo', 'doe'], [s.id for s in sequence_file.subsample(2, strategy='diverse')])
+        sequence_file.subsample(10, inplace=True)
+        self.assertEqual(3, sequence_file.nseq)
+        with self.assertRaises(ValueError):
+            sequence_file.subsample(2, strategy='unknown')
+        with self.assertRaises(ValueError):
+            sequence_file.subsample(2, identity=1.5)
+
     def test_filter_1(self):
         sequence_file = SequenceFile('test')
         for seq in [Sequence('foo', 'AAAAAA'), Sequence('bar', 'AAAAAA'), Sequence('doe', 'AAAAAA')]:
@@ -324,6 +790,27 @@ class TestSequenceFile(unittest.TestCase):
         filtered = sequence_file.filter(min_id=0.1, max_id=0.9)
         self.assertEqual(['foo', 'bar'], [s.id for s in filtered])
 
+    def test_filter_7(self):
+        sequence_file = SequenceFile('test')
+        for seq in [Sequence('foo', 'AAAAAA'), Sequence('bar', 'CCCAAA'), Sequence('doe', 'AAAACC')]:
+            sequence_file.add(seq)
+        filtered = sequence_file.filter(min_id=0.6, max_id=0.9)
+        self.assertEqual(['foo', 'doe'], [s.id for s in filtered])
+
+    def test_filter_8(self):
+        np.random.seed(0)
+        X = np.frombuffer(b'ACDEFGHIKLMNPQRSTVWY-', dtype=np.uint8)[np.random.randint(0, 4, (700, 30))]
+        sequence_file = SequenceFile('test')
+        for i, row in enumerate(X):
+            sequence_file.add(Sequence(str(i), row.tobytes().decode('ascii')))
+        representatives = []
+        for i, row in enumerate(X):
+            identities = 1.0 - (X[representatives] != row).sum(axis=1) / X.shape[1]
+            if np.all((identities >= 0.2) & (identities <= 0.5)):
+                representatives.append(i)
+        filtered = sequence_file.filter(min_id=0.2, max_id=0.5)
+        self.assertEqual([str(i) for i in representatives], [s.id for s in filtered])
+
     def test_filter_gapped_1(self):
         sequence_file = SequenceFile('test')
         sequence_file.add(Sequence('foo', '-----'))
@@ -377,6 +864,15 @@ class TestSequenceFile(unittest.TestCase):
         with self.assertRaises(ValueError):
             sequence_file.diversity
 
+    def test_summary_1(self):
+        sequence_file = SequenceFile('test')
+        for s in [Sequence('foo', 'AAAAAAA'), Sequence('bar', 'AAAAAAA'), Sequence('cho', 'CCCCCCC')]:
+            sequence_file.add(s)
+        summary = sequence_file.summary()
+        self.assertIn('Alignment:\t\tTrue\n', summary)
+        self.assertIn('Number of sequences:\t3\n', summary)
+        self.assertIn('Alignment depth (0.8):\t2\n', summary)
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
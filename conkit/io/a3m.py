@@ -45,6 +45,7 @@ import numpy as np
 import re
 
 from conkit.io._parser import SequenceFileParser
+from conkit.core.mappings import INSERT_CHARACTERS
 from conkit.core.sequence import Sequence
 from conkit.core.sequencefile import SequenceFile
 
@@ -144,7 +145,7 @@ class A3mParser(SequenceFileParser):
 
     def _remove_inserts(self, seq):
         """Remove insert states"""
-        return "".join([char for char in seq if not char.islower()])
+        return bytearray(seq, 'ascii').translate(None, INSERT_CHARACTERS).decode('ascii')
 
     def write(self, f_handle, hierarchy):
         """Write a sequence file instance to to file
@@ -79,7 +79,7 @@ class BbcontactsParser(ContactFileParser):
             if line and not line.startswith('#'):
                 _, _, _, raw_score, _, current, res2_seq, res1_seq = line.split()
                 if del_one_two and previous == 'first' and current == 'last':
-                    contact_map.child_list.pop()
+                    contact_map.remove(contact_map[-1].id)
                 elif any(value == "NA" for value in [raw_score, res2_seq, res1_seq]):
                     pass
                 else:
@@ -88,7 +88,7 @@ class BbcontactsParser(ContactFileParser):
                 previous = current
 
         if del_one_two and previous == 'first' and len(contact_map) > 0:
-            contact_map.child_list.pop()
+            contact_map.remove(contact_map[-1].id)
 
         contact_file.method = 'Contact map predicted using Bbcontacts'
 
@@ -41,8 +41,7 @@ import numpy as np
 import sys
 
 from conkit.io._parser import ContactFileParser
-from conkit.core.contact import Contact
-from conkit.core.contactmap import ContactMap
+from conkit.core.arraycontactmap import ArrayContactMap
 from conkit.core.contactfile import ContactFile
 
 
@@ -72,39 +71,13 @@ class CCMpredParser(ContactFileParser):
         """
         contact_file = ContactFile(f_id)
         contact_file.method = 'Contact map predicted using CCMpred'
-        contact_map = ContactMap("map_1")
-        contact_file.add(contact_map)
-
-        # Bits ripped from Stefan Seemayer's script shipped with CCMpred
-        mat = np.loadtxt(f_handle)
-        if mat.size > 0:
-            raw_contacts = self._get_contact_pairs(mat)
-            for res1_seq, res2_seq, raw_score in zip(raw_contacts[0], raw_contacts[1], mat[raw_contacts]):
-                if res1_seq > res2_seq:
-                    continue
-                # Matrix starts count at 0 so increment numbers by one straight away
-                contact = Contact(int(res1_seq + 1), int(res2_seq + 1), float(raw_score))
-                contact_map.add(contact)
 
-        return contact_file
-
-    def _get_contact_pairs(self, mat):
-        """Get all contact pairs in the matrix
-
-        Parameters
-        ----------
-        mat : :obj:`~numpy.ndarray`
-           A :mod:`numpy` matrix
-
-        Returns
-        -------
-        list
-           A list of contact pairs
+        mat = np.loadtxt(f_handle, ndmin=2)
+        if mat.size == 0:
+            mat = mat.reshape(0, 0)
+        contact_file.add(ArrayContactMap.from_dense("map_1", mat))
 
-        """
-        contacts = mat.argsort(axis=None)[::-1]
-        contacts = (contacts % mat.shape[0]).astype(np.uint16), np.floor(contacts / mat.shape[0]).astype(np.uint16)
-        return contacts
+        return contact_file
 
     def write(self, f_handle, hierarchy):
         """Write a contact file instance to to file
@@ -135,13 +108,6 @@ class CCMpredParser(ContactFileParser):
             raise RuntimeError('More than one contact map provided')
 
         for contact_map in contact_file:
-            len_mat = max([c.res1_seq for c in contact_map] + [c.res2_seq for c in contact_map])
-            mat = np.zeros((len_mat, len_mat), np.float64)
-
-            for contact in contact_map:
-                mat[contact.res1_seq - 1][contact.res2_seq - 1] = contact.raw_score
-                mat[contact.res2_seq - 1][contact.res1_seq - 1] = contact.raw_score
-
-            np.savetxt(f_handle, mat, delimiter="\t")
+            np.savetxt(f_handle, contact_map.to_dense(), delimiter="\t")
 
         return
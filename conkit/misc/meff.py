@@ -0,0 +1,241 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2016-18, University of Liverpool
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Out-of-core sequence weights for alignments too large to hold in memory"""
+
+from __future__ import division
+
+__author__ = "Felix Simkovic"
+__date__ = "18 Oct 2026"
+__version__ = "1.0"
+
+import numpy as np
+import os
+import tempfile
+
+from conkit.core.mappings import INSERT_CHARACTERS
+
+
+class StreamingMeff(object):
+    """Sequence weights and number of effective sequences computed in row blocks
+
+    The alignment is read once, block by block, without creating any :obj:`~conkit.core.sequence.Sequence`
+    instances. Each block is packed eight columns per 64-bit word and appended to a scratch file, which is
+    memory-mapped once reading is complete. Neighbor counts are then accumulated block pair by block pair,
+    so at most two blocks of the alignment are in memory at any time. The weights are identical to
+    :func:`~conkit.core.sequencefile.SequenceFile.get_weights`.
+
+    Examples
+    --------
+    >>> from conkit.misc.meff import StreamingMeff
+    >>> with StreamingMeff('toxd/toxd.a3m', 'a3m') as streamer:
+    ...     print(streamer.meff)
+
+    Attributes
+    ----------
+    ncols : int
+       The number of alignment columns
+    nseq : int
+       The number of sequences
+
+    """
+
+    FORMATS = ('a2m', 'a3m', 'fasta', 'jones')
+
+    def __init__(self, f_name, f_format, block_size=4096, tmpdir=None):
+        """Read and pack an alignment file
+
+        Parameters
+        ----------
+        f_name : str
+           The path to the alignment file
+        f_format : str
+           The alignment format, one of ``a2m``, ``a3m``, ``fasta`` or ``jones``
+        block_size : int, optional
+           The number of sequences per block [default: 4096]
+        tmpdir : str, optional
+           The directory for the scratch file [default: system default]
+
+        Raises
+        ------
+        :exc:`ValueError`
+           Unsupported alignment format
+        :exc:`ValueError`
+           Sequences are not all of the same length
+
+        """
+        if f_format not in StreamingMeff.FORMATS:
+            raise ValueError('Unsupported format for streaming: {}'.format(f_format))
+        if block_size < 1:
+            raise ValueError('Block size needs to be a positive integer')
+        self.block_size = block_size
+        self.ncols = 0
+        self.nseq = 0
+        self._f_scratch = None
+        self._packed = None
+        try:
+            self._read(f_name, f_format, tmpdir)
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self):
+        return '{}(nseq={} ncols={} block_size={})'.format(self.__class__.__name__, self.nseq, self.ncols,
+                                                           self.block_size)
+
+    @property
+    def meff(self):
+        """The number of effective sequences"""
+        return int(sum(self.get_weights()))
+
+    def get_meff_with_id(self, identity):
+        """Calculate the number of effective sequences with specified sequence identity
+
+        See Also
+        --------
+        meff, get_weights
+
+        """
+        return int(sum(self.get_weights(identity=identity)))
+
+    def close(self):
+        """Release the memory map and delete the scratch file"""
+        self._packed = None
+        if self._f_scratch is not None:
+            os.remove(self._f_scratch)
+            self._f_scratch = None
+
+    def get_weights(self, identity=0.8):
+        """Calculate the sequence weights
+
+        Parameters
+        ----------
+        identity : float, optional
+           The sequence identity to use for similarity decision [default: 0.8]
+
+        Returns
+        -------
+        :obj:`numpy.ndarray`
+           The sequence weights in the alignment
+
+        Raises
+        ------
+        :exc:`ValueError`
+           Sequence Identity needs to be between 0 and 1
+
+        """
+        if identity < 0 or identity > 1:
+            raise ValueError("Sequence Identity needs to be between 0 and 1")
+
+        from conkit.core.ext.c_sequencefile import c_get_cross_neighbors, c_get_neighbors, c_num_threads
+        limit = max(int(np.ceil((1.0 - identity) * self.ncols)), 0)
+        nthreads = c_num_threads()
+        counts = np.zeros(self.nseq, dtype=np.int64)
+        ones = np.ones(self.block_size, dtype=np.int64)
+        for i in range(0, self.nseq, self.block_size):
+            X = np.ascontiguousarray(self._packed[i:i + self.block_size])
+            counts_x = np.zeros((nthreads, X.shape[0]), dtype=np.int64)
+            c_get_neighbors(X, ones[:X.shape[0]], limit, counts_x)
+            for j in range(i + self.block_size, self.nseq, self.block_size):
+                Y = np.ascontiguousarray(self._packed[j:j + self.block_size])
+                counts_y = np.zeros((nthreads, Y.shape[0]), dtype=np.int64)
+                c_get_cross_neighbors(X, Y, ones[:X.shape[0]], ones[:Y.shape[0]], limit, counts_x, counts_y)
+                counts[j:j + self.block_size] += counts_y.sum(axis=0)
+            counts[i:i + self.block_size] += counts_x.sum(axis=0)
+        with np.errstate(divide='ignore'):
+            return 1.0 / (counts + (limit > 0))
+
+    def _read(self, f_name, f_format, tmpdir):
+        """Pack the alignment block by block into a memory-mapped scratch file"""
+        f_scratch = tempfile.NamedTemporaryFile(mode='wb', suffix='.packed', dir=tmpdir, delete=False)
+        self._f_scratch = f_scratch.name
+        with f_scratch, open(f_name, 'r') as f_handle:
+            block = []
+            for seq in StreamingMeff._iter_sequences(f_handle, f_format):
+                if self.nseq == 0:
+                    self.ncols = len(seq)
+                elif len(seq) != self.ncols:
+                    raise ValueError('This is not an alignment')
+                block.append(seq)
+                self.nseq += 1
+                if len(block) == self.block_size:
+                    f_scratch.write(StreamingMeff._pack_block(block, self.ncols))
+                    block = []
+            if block:
+                f_scratch.write(StreamingMeff._pack_block(block, self.ncols))
+        nwords = max(-(-self.ncols // 8), 1)
+        if self.nseq > 0:
+            self._packed = np.memmap(self._f_scratch, dtype=np.uint64, mode='r', shape=(self.nseq, nwords))
+        else:
+            self._packed = np.zeros((0, nwords), dtype=np.uint64)
+
+    @staticmethod
+    def _iter_sequences(f_handle, f_format):
+        """Yield the sequence strings of an alignment file one at a time"""
+        if f_format in ('a2m', 'jones'):
+            for line in f_handle:
+                line = line.strip()
+                if line:
+                    yield line
+            return
+        chunks = None
+        for line in f_handle:
+            line = line.rstrip()
+            if line.startswith('>'):
+                if chunks is not None:
+                    yield StreamingMeff._join(chunks, f_format)
+                chunks = []
+            elif chunks is not None:
+                if line:
+                    chunks.append(line)
+            elif line and not line.startswith('#'):
+                raise ValueError("Fasta record needs to start with '>'")
+        if chunks is not None:
+            yield StreamingMeff._join(chunks, f_format)
+
+    @staticmethod
+    def _join(chunks, f_format):
+        """Join the sequence lines of a record, removing the insert states of A3M records"""
+        seq = ''.join(chunks)
+        if f_format == 'a3m':
+            seq = bytearray(seq, 'ascii').translate(None, INSERT_CHARACTERS).decode('ascii')
+        return seq
+
+    @staticmethod
+    def _pack_block(block, ncols):
+        """Pack a block of sequence strings into the bytes of its 64-bit words"""
+        from conkit.core.ext.c_sequencefile import c_pack
+        X = np.frombuffer(bytearray(''.join(block), 'ascii'), dtype=np.uint8).reshape(len(block), ncols)
+        return c_pack(X).tobytes()
@@ -0,0 +1,75 @@
+"""Testing facility for conkit.misc.meff"""
+
+__author__ = "Felix Simkovic"
+__date__ = "18 Oct 2026"
+
+import numpy as np
+import os
+import unittest
+
+from conkit.core.sequence import Sequence
+from conkit.core.sequencefile import SequenceFile
+from conkit.io._iotools import create_tmp_f
+from conkit.misc.meff import StreamingMeff
+
+
+class TestStreamingMeff(unittest.TestCase):
+    def test_get_weights_1(self):
+        msa = ">foo\nAAAAAAA\n>bar\nAA-ACA-\n>cho\nAAADCAA\n>doo\nC-CAA--\n>miu\nCCCCCCC\n>nop\nAAAAAAB\n"
+        f_name = create_tmp_f(content=msa)
+        with StreamingMeff(f_name, 'fasta', block_size=2) as streamer:
+            self.assertEqual(6, streamer.nseq)
+            self.assertEqual(7, streamer.ncols)
+            self.assertEqual([0.3333333333333333, 1.0, 0.5, 1.0, 1.0, 0.5], streamer.get_weights(0.6).tolist())
+            self.assertEqual(5, streamer.meff)
+        os.unlink(f_name)
+
+    def test_get_weights_2(self):
+        np.random.seed(0)
+        X = np.frombuffer(b'ACDEFGHIKLMNPQRSTVWY-', dtype=np.uint8)[np.random.randint(0, 3, (150, 37))]
+        sequence_file = SequenceFile('test')
+        for i, row in enumerate(X):
+            sequence_file.add(Sequence(str(i), row.tobytes().decode('ascii')))
+        f_name = create_tmp_f(content='\n'.join(s.seq for s in sequence_file) + '\n')
+        for block_size in (1, 50, 64, 65, 1000):
+            with StreamingMeff(f_name, 'jones', block_size=block_size) as streamer:
+                for identity in (0.0, 0.5, 0.8):
+                    self.assertEqual(sequence_file.get_weights(identity), streamer.get_weights(identity).tolist())
+        os.unlink(f_name)
+
+    def test_get_weights_3(self):
+        msa = "#remark\n>foo\nAAaaAAAAA-\n>bar\nA-AaAA-AA\n>cho\nAAACA\nAAA\n"
+        f_name = create_tmp_f(content=msa)
+        with StreamingMeff(f_name, 'a3m') as streamer:
+            self.assertEqual(8, streamer.ncols)
+            self.assertEqual([1.0, 1.0, 1.0], streamer.get_weights(1.0 - 2 / 8.).tolist())
+            self.assertEqual([0.5, 1.0, 0.5], streamer.get_weights(1.0 - 3 / 8.).tolist())
+        os.unlink(f_name)
+
+    def test_get_weights_4(self):
+        f_name = create_tmp_f(content="")
+        with StreamingMeff(f_name, 'fasta') as streamer:
+            self.assertEqual(0, streamer.nseq)
+            self.assertEqual(0, streamer.meff)
+        os.unlink(f_name)
+
+    def test_init_1(self):
+        f_name = create_tmp_f(content=">foo\nAAAA\n>bar\nAAA\n")
+        with self.assertRaises(ValueError):
+            StreamingMeff(f_name, 'fasta')
+        with self.assertRaises(ValueError):
+            StreamingMeff(f_name, 'pdb')
+        os.unlink(f_name)
+
+    def test_close_1(self):
+        f_name = create_tmp_f(content="AAAA\nAAAC\n")
+        streamer = StreamingMeff(f_name, 'a2m')
+        f_scratch = streamer._f_scratch
+        self.assertTrue(os.path.isfile(f_scratch))
+        streamer.close()
+        self.assertFalse(os.path.isfile(f_scratch))
+        os.unlink(f_name)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -185,11 +185,7 @@ class PrecisionEvaluationFigure(Figure):
 
     def draw(self):
         factors = np.arange(self.min_cutoff, self.max_cutoff + 0.1, self.cutoff_step)
-        precisions = np.zeros(factors.shape[0])
-        for i, factor in enumerate(factors):
-            ncontacts = int(self._hierarchy.sequence.seq_len * factor)
-            m = self._hierarchy[:ncontacts]
-            precisions[i] = m.precision
+        precisions = self._hierarchy.precision_curve(factors=factors).precision
 
         self.ax.plot(
             factors,